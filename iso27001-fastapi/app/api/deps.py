@@ -1,36 +1,110 @@
+import asyncio
 from typing import Annotated, Any, Callable
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.config.security import decode_token, ACCESS_TOKEN_TYP
+from app.core.async_database import get_async_db
+from app.core.database import get_db, queued_async_writer, queued_writer
+from app.core.db_routing import act_as, recent_writers, replica_lookup
+from app.config.security import hash_password, ACCESS_TOKEN_TYP, TokenPayload
+from app.config.settings import settings
 from app.core.exceptions import AuthenticationError
-from app.domain.users.repository import UserRepository
-from app.domain.users.service import UserService
+from app.core.metrics import STATELESS_AUTH_CHECKS
+from app.core.token_cache import token_cache
+from app.domain.users.repository import AsyncUserRepository, UserRepository
+from app.domain.users.service import AsyncUserService, UserService
 from app.domain.users.models import User
+from app.domain.users.principal import Principal
+from app.infrastructure.aws_telemetry import xray
+from app.infrastructure.principal_cache import principal_cache
+from app.infrastructure.quality_monitor import quality_signals
+from app.infrastructure.token_revocation import token_revocations
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
 def get_repository(db: Session = Depends(get_db)) -> UserRepository:
-    return UserRepository(db)
+    return UserRepository(db, write=queued_writer(db))
+
+def _traced_hash_password(password: str) -> str:
+    with xray.subsegment("bcrypt.hash"):
+        return hash_password(password)
 
 def get_user_service(repo: UserRepository = Depends(get_repository)) -> UserService:
-    return UserService(repo)
+    return UserService(repo, password_hasher=_traced_hash_password)
 
-def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    repo: Annotated[UserRepository, Depends(get_repository)],
-) -> User:
-    """A.9: Authenticate user via JWT."""
+def _claims(token: str) -> TokenPayload:
     try:
-        payload = decode_token(token, expected_typ=ACCESS_TOKEN_TYP)
+        return token_cache.decode(token, expected_typ=ACCESS_TOKEN_TYP)   # revocation still checked below
     except Exception:
+        quality_signals.auth_check(passed=False)
         raise AuthenticationError("Invalid token")
-    
-    user = repo.get_by_id(payload.sub)
-    if not user or not user.is_active:
+
+def _stateless(claims: TokenPayload) -> bool:
+    """Claims mode applies to tokens that carry the role and issue time it relies on."""
+    if not settings.AUTH_STATELESS_CLAIMS:
+        return False
+    if claims.role and claims.iat:
+        return True
+    STATELESS_AUTH_CHECKS.labels(result="fallback").inc()   # older token — look the user up
+    return False
+
+def _from_claims(claims: TokenPayload, revoked: bool | None) -> Principal | None:
+    """
+    A.9: Principal straight from a verified access token — no session, no query.
+
+    ``revoked`` is None when the shared revocation list could not be read;
+    the claims are then not trusted and None sends the caller to the user
+    lookup (fail closed).
+    """
+    if revoked is None:
+        STATELESS_AUTH_CHECKS.labels(result="fallback").inc()
+        return None
+    if revoked:
+        STATELESS_AUTH_CHECKS.labels(result="revoked").inc()
+        quality_signals.auth_check(passed=False)
+        raise AuthenticationError("Token revoked")
+    STATELESS_AUTH_CHECKS.labels(result="accepted").inc()
+    quality_signals.auth_check(passed=True)
+    return Principal(id=claims.sub, role=claims.role, jti=claims.jti)
+
+def _authenticated(principal: Principal | None) -> Principal:
+    if principal is None or not principal.is_active:
+        quality_signals.auth_check(passed=False)
         raise AuthenticationError("User not found or inactive")
-    return user
+    quality_signals.auth_check(passed=True)
+    return principal
+
+def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    repo: Annotated[UserRepository, Depends(get_repository)],
+) -> Principal:
+    """
+    A.9: Authenticate user via JWT.
+
+    Returns the caller's Principal from the principal cache; only a miss
+    reads the users table. Routes that need the full profile load it
+    themselves (the session identity map makes a repeat lookup free).
+    With AUTH_STATELESS_CLAIMS the token's claims are trusted instead,
+    subject to the revocation list — unless it cannot be read.
+    """
+    claims = _claims(token)
+    user_id = claims.sub
+    # A.17: the token-to-user lookup reads a replica unless the user just wrote
+    act_as(repo.db, user_id)
+    if _stateless(claims):
+        stateless = _from_claims(claims, token_revocations.is_revoked(user_id, claims.iat))
+        if stateless is not None:
+            return stateless
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        stamp = principal_cache.stamp()
+        with replica_lookup(repo.db):
+            user = repo.get_by_id(user_id)
+        if user is not None:
+            principal = Principal.from_user(user)
+            principal_cache.put(principal, stamp)
+    return _authenticated(principal)
 
 def resolve_user(
     user_id: str,
@@ -42,10 +116,62 @@ def resolve_user(
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
 
-def require_role(role: str) -> Callable[..., User]:
+def require_role(role: str) -> Callable[..., Principal]:
     """Return a FastAPI dependency that enforces a minimum role."""
-    def _check(current_user: User = Depends(get_current_user)) -> User:
+    def _check(current_user: Principal = Depends(get_current_user)) -> Principal:
         if current_user.role != role:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
         return current_user
-    return _check
\ No newline at end of file
+    return _check
+
+
+# ── Async stack (DB_ASYNC=true) ──────────────────────────────────────────────
+
+def get_async_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncUserRepository:
+    return AsyncUserRepository(db, write=queued_async_writer(db))
+
+def get_async_user_service(repo: AsyncUserRepository = Depends(get_async_repository)) -> AsyncUserService:
+    return AsyncUserService(repo, password_hasher=_traced_hash_password)
+
+async def get_current_user_async(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    repo: Annotated[AsyncUserRepository, Depends(get_async_repository)],
+) -> Principal:
+    """A.9: Authenticate user via JWT (async repository, same principal cache)."""
+    claims = _claims(token)
+    user_id = claims.sub
+    if recent_writers.shared:
+        await asyncio.to_thread(act_as, repo.db, user_id)   # the shared window is a Redis GET
+    else:
+        act_as(repo.db, user_id)
+    if _stateless(claims):
+        if token_revocations.shared:
+            revoked = await asyncio.to_thread(token_revocations.is_revoked, user_id, claims.iat)
+        else:
+            revoked = token_revocations.is_revoked(user_id, claims.iat)
+        stateless = _from_claims(claims, revoked)
+        if stateless is not None:
+            return stateless
+    principal = principal_cache.get(user_id, shared=False)
+    if principal is None and principal_cache.shared:
+        principal = await asyncio.to_thread(principal_cache.get, user_id)   # Redis tier blocks
+    if principal is None:
+        stamp = principal_cache.stamp()
+        with replica_lookup(repo.db):
+            user = await repo.get_by_id(user_id)
+        if user is not None:
+            principal = Principal.from_user(user)
+            if principal_cache.shared:
+                await asyncio.to_thread(principal_cache.put, principal, stamp)
+            else:
+                principal_cache.put(principal, stamp)
+    return _authenticated(principal)
+
+async def resolve_user_async(
+    user_id: str,
+    repo: AsyncUserRepository = Depends(get_async_repository)
+) -> User:
+    """Route Model Binding (async): Resolve user by ID or raise 404."""
+    if user := await repo.get_by_id(user_id):
+        return user
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -16,6 +16,8 @@ from app.config.security import (
 from app.core.exceptions import AuthenticationError
 from app.core.telemetry import logger
 from app.core.brute_force import brute_force_guard
+from app.infrastructure.aws_telemetry import xray
+from app.infrastructure.quality_monitor import quality_signals
 
 router = APIRouter()
 
@@ -36,15 +38,20 @@ def login(
     repo = UserRepository(db)
     user = repo.get_by_email(email)
 
-    if not user or not verify_password(form_data.password, str(user.hashed_password)):
+    with xray.subsegment("bcrypt.verify"):
+        password_ok = user is not None and verify_password(form_data.password, str(user.hashed_password))
+    if not user or not password_ok:
         brute_force_guard.record_failure(email)
+        quality_signals.auth_check(passed=False)
         logger.warning("auth.failed", email=email)
         raise AuthenticationError("Invalid credentials")
 
     if not user.is_active:
+        quality_signals.auth_check(passed=False)
         raise AuthenticationError("User inactive")
 
     brute_force_guard.clear(email)
+    quality_signals.auth_check(passed=True)
     logger.audit("auth.login", user_id=str(user.id))
     return create_token_pair(
         user_id=str(user.id),
@@ -0,0 +1,88 @@
+"""
+Async variants of the auth routes — mounted instead of auth.py when DB_ASYNC=true.
+
+Database access is awaited on the event loop. bcrypt and the brute-force
+guard (blocking Redis client) run on worker threads.
+"""
+import asyncio
+import uuid
+import jwt
+from fastapi import APIRouter, Depends
+from fastapi.security import OAuth2PasswordRequestForm
+from app.api.deps import get_async_repository
+from app.api.v1.auth import RefreshRequest
+from app.domain.users.repository import AsyncUserRepository
+from app.config.security import (
+    verify_password,
+    create_token_pair,
+    decode_token,
+    TokenPair,
+    REFRESH_TOKEN_TYP,
+)
+from app.core.exceptions import AuthenticationError
+from app.core.telemetry import logger
+from app.core.brute_force import brute_force_guard
+from app.infrastructure.aws_telemetry import xray
+from app.infrastructure.quality_monitor import quality_signals
+
+router = APIRouter()
+
+
+@router.post("/token", response_model=TokenPair)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    repo: AsyncUserRepository = Depends(get_async_repository),
+) -> TokenPair:
+    """A.9: Authenticate user and issue JWTs. Brute-force protected."""
+    email = form_data.username
+    await asyncio.to_thread(brute_force_guard.check, email)  # raises HTTP 429 if account is locked
+
+    user = await repo.get_by_email(email)
+
+    with xray.subsegment("bcrypt.verify"):
+        password_ok = user is not None and await asyncio.to_thread(
+            verify_password, form_data.password, str(user.hashed_password)
+        )
+    if not user or not password_ok:
+        await asyncio.to_thread(brute_force_guard.record_failure, email)
+        quality_signals.auth_check(passed=False)
+        logger.warning("auth.failed", email=email)
+        raise AuthenticationError("Invalid credentials")
+
+    if not user.is_active:
+        quality_signals.auth_check(passed=False)
+        raise AuthenticationError("User inactive")
+
+    await asyncio.to_thread(brute_force_guard.clear, email)
+    quality_signals.auth_check(passed=True)
+    logger.audit("auth.login", user_id=str(user.id))
+    return create_token_pair(
+        user_id=str(user.id),
+        role=str(user.role),
+        access_jti=str(uuid.uuid4()),
+        refresh_jti=str(uuid.uuid4()),
+    )
+
+
+@router.post("/refresh", response_model=TokenPair)
+async def refresh(
+    body: RefreshRequest,
+    repo: AsyncUserRepository = Depends(get_async_repository),
+) -> TokenPair:
+    """A.9: Exchange a valid refresh token for a new token pair."""
+    try:
+        payload = decode_token(body.refresh_token, expected_typ=REFRESH_TOKEN_TYP)
+    except jwt.PyJWTError:
+        raise AuthenticationError("Invalid or expired refresh token")
+
+    user = await repo.get_by_id(payload.sub)
+    if user is None or not user.is_active:
+        raise AuthenticationError("User not found or inactive")
+
+    logger.audit("auth.refresh", user_id=str(user.id))
+    return create_token_pair(
+        user_id=str(user.id),
+        role=str(user.role),
+        access_jti=str(uuid.uuid4()),
+        refresh_jti=str(uuid.uuid4()),
+    )
@@ -1,15 +1,16 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from fastapi.responses import JSONResponse
 from datetime import datetime, timezone
-import time
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+import asyncio
+import threading
 from app.api.deps import require_role
-from app.core.database import get_db
-from app.domain.users.models import User
+from app.domain.users.principal import Principal
 from app.core.metrics import SLO_P95_LATENCY_MS, SLO_P99_LATENCY_MS
-from app.infrastructure.error_budget import error_budget
-from app.infrastructure.quality_score import QualityScoreCalculator
+from app.infrastructure.latency_sketch import latency_tracker
+from app.infrastructure.quality_monitor import quality_monitor
+from app.infrastructure.readiness import ReadinessChecker, get_readiness_checker
+from app.infrastructure.runtime_monitor import runtime_monitor
+from app.infrastructure.profiler import MAX_DURATION_S, ProfilerBusyError, profiler
 from app.core.telemetry import logger
 
 router = APIRouter()
@@ -22,76 +23,57 @@ async def liveness() -> dict[str, str]:
 
 
 @router.get("/health/ready", tags=["health"])
-def readiness(db: Session = Depends(get_db)) -> JSONResponse:
-    """A.17: Readiness — can it serve traffic?"""
-    checks: dict[str, object] = {}
-    overall = True
-
-    # A.17: Real DB liveness ping
-    try:
-        t0 = time.monotonic()
-        db.execute(text("SELECT 1"))
-        latency_ms = round((time.monotonic() - t0) * 1000, 2)
-        checks["database"] = {"status": "ok", "latency_ms": latency_ms}
-    except Exception as exc:
-        # A.12: never surface raw exception text to callers of an unauthenticated
-        # endpoint — log the detail server-side and return a generic status only.
-        logger.error("health.database_check_failed", error=str(exc))
-        checks["database"] = {"status": "error"}
-        overall = False
+async def readiness(checker: ReadinessChecker = Depends(get_readiness_checker)) -> JSONResponse:
+    """
+    A.17: Readiness — can it serve traffic?
 
-    status_code = status.HTTP_200_OK if overall else status.HTTP_503_SERVICE_UNAVAILABLE
+    Database and Redis are checked concurrently with per-dependency timeouts;
+    results are cached for READINESS_CACHE_TTL_S. A Redis failure reports
+    "degraded" (in-process fallback active) and stays 200; a database
+    failure reports "down" and returns 503.
+    """
+    report = await checker.report()
+    status_code = status.HTTP_200_OK if report.ready else status.HTTP_503_SERVICE_UNAVAILABLE
     return JSONResponse(
         status_code=status_code,
-        content={
-            "status": "ok" if overall else "degraded",
-            "checks": checks,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        },
+        content={**report.to_dict(), "timestamp": datetime.now(timezone.utc).isoformat()},
     )
 
 
 @router.get("/health/detailed", tags=["health"])
-async def detailed(_: User = Depends(require_role("admin"))) -> JSONResponse:
+async def detailed(_: Principal = Depends(require_role("admin"))) -> JSONResponse:
     """
     A.17: Detailed health — error budget, SLO alerts, and quality score.
     Requires admin role.
 
-    The slo_alerts block exposes four independent breach signals:
-      - p95/p99 latency vs. defined thresholds (wire real Prometheus quantiles here)
+    The slo_alerts block exposes independent breach signals:
+      - p95/p99 latency vs. defined thresholds (rolling-window sketch quantiles)
       - 5xx error rate vs. SLA target (budget-consuming failures)
       - 4xx spike rate (client abuse / anomaly signal)
-    """
-    snapshot = error_budget.snapshot()
+      - fast / slow multi-window error-budget burn (1h+5m > 14.4, 6h+30m > 6)
 
-    # NOTE: wire real Prometheus histogram quantiles (p95/p99) once the
-    # process-level histogram is queryable (e.g. via prometheus_client).
-    # The SLO_P95/P99 constants from metrics.py are the alert thresholds.
-    calculator = QualityScoreCalculator(
-        sla_latency_p95_ms=SLO_P95_LATENCY_MS,   # replace with live quantile
-        target_latency_ms=500.0,
-        sla_latency_p99_ms=SLO_P99_LATENCY_MS,   # replace with live quantile
-    )
-    score = calculator.calculate(
-        auth_checks_passed=snapshot.total_requests - snapshot.failed_requests,
-        auth_checks_total=snapshot.total_requests,
-        audit_events_recorded=snapshot.total_requests,
-        audit_events_expected=snapshot.total_requests,
-        availability=snapshot.observed_availability,
-        logs_with_correlation_id=snapshot.total_requests,
-        total_logs=snapshot.total_requests,
-    )
-    alert = calculator.slo_alert(
-        failed_requests=snapshot.failed_requests,
-        client_errors=snapshot.client_errors,
-        total_requests=snapshot.total_requests,
-    )
+    The fleet block merges every task's counters from Redis (source "fleet");
+    it falls back to this host's view (source "local") when Redis is down or
+    fleet aggregation is disabled. The runtime block reports event-loop lag
+    and threadpool token usage.
+
+    Scores and alerts come from the quality monitor's latest background
+    computation (computed_at); quality_history is its bounded time series.
+    """
+    # Precomputed by the quality monitor; computed here only when the monitor
+    # is not running (e.g. no lifespan) or has fallen two intervals behind —
+    # compute-only, so reads add no points to the history or exported series.
+    quality = quality_monitor.latest()
+    if quality is None:
+        quality = await asyncio.to_thread(quality_monitor.compute)
+    snapshot = quality.budget
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "status": "ok",
             "timestamp": datetime.now(timezone.utc).isoformat(),
+            "computed_at": quality.timestamp,
             "error_budget": {
                 "sla_target": snapshot.sla_target,
                 "total_requests": snapshot.total_requests,
@@ -100,8 +82,52 @@ async def detailed(_: User = Depends(require_role("admin"))) -> JSONResponse:
                 "observed_availability": snapshot.observed_availability,
                 "budget_consumed_pct": snapshot.budget_consumed_pct,
                 "budget_exhausted": snapshot.budget_exhausted,
+                "window_s": snapshot.window_s,
+                "windows": {name: w.to_dict() for name, w in snapshot.windows.items()},
+                "routes": {route: w.to_dict() for route, w in snapshot.routes.items()},
+            },
+            "latency": {
+                "window_s": latency_tracker.window_s,
+                "slo_p95_ms": SLO_P95_LATENCY_MS,
+                "slo_p99_ms": SLO_P99_LATENCY_MS,
+                "overall": quality.latency.to_dict(),
+                "routes": {route: s.to_dict() for route, s in quality.route_latency.items()},
             },
-            "slo_alerts": alert.to_dict(),
-            "quality_score": score.to_dict(),
+            "fleet": quality.fleet.to_dict(),
+            "slo_alerts": quality.alert.to_dict(),
+            "quality_score": {
+                **quality.score.to_dict(),
+                "window_s": quality.window_s,
+                "signals": quality.signals.to_dict(),
+            },
+            "quality_history": [q.history_entry() for q in quality_monitor.history()],
+            "runtime": runtime_monitor.snapshot().to_dict(),
         },
     )
+
+
+@router.get("/health/profile", tags=["health"])
+async def profile(
+    seconds: float = Query(5.0, gt=0, le=MAX_DURATION_S),
+    top: int = Query(20, ge=1, le=100),
+    admin: Principal = Depends(require_role("admin")),
+) -> JSONResponse:
+    """
+    A.17: On-demand CPU profile of this replica. Requires admin role.
+
+    Samples every thread's stack (the event loop included) for ``seconds`` and
+    returns flamegraph-ready collapsed stacks plus the top functions by self
+    samples. One profile runs at a time per process; overhead is capped by the
+    profiler's CPU budget.
+    """
+    logger.audit("health.profile", user_id=str(admin.id), seconds=seconds)
+    loop_thread_id = threading.get_ident()
+    try:
+        # Dedicated executor thread — keeps AnyIO's route threadpool tokens free
+        result = await asyncio.to_thread(profiler.run, seconds, top_n=top, loop_thread_id=loop_thread_id)
+    except ProfilerBusyError:
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={"error": {"code": "PROFILE_IN_PROGRESS", "message": "A profile is already running"}},
+        )
+    return JSONResponse(status_code=status.HTTP_200_OK, content=result.to_dict())
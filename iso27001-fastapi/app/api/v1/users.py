@@ -1,9 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Literal, Union
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from app.domain.users.schemas import CreateUserRequest, UserResponse, UpdateUserRequest
 from app.domain.users.service import UserService
-from app.api.deps import get_current_user, get_user_service, resolve_user
+from app.api.deps import get_current_user, get_user_service
 from app.domain.users.models import User
+from app.domain.users.principal import Principal
+from app.core.pagination import cursor_bounds, cursor_meta
+from app.core.responses import PaginatedResponse
 
 router = APIRouter()
 
@@ -15,52 +18,96 @@ def register_user(
     """Register a new user."""
     return service.create_user(request)
 
-@router.get("/", response_model=List[UserResponse])
+@router.get("/", response_model=Union[List[UserResponse], PaginatedResponse[UserResponse]])
 def list_users(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Opaque cursor from meta.next_cursor / meta.prev_cursor"),
+    pagination: Literal["offset", "cursor"] = Query("offset"),
     service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_user),
-) -> list[User]:
-    """List users (Admin only)."""
-    if current_user.role != "admin":
+    current_user: Principal = Depends(get_current_user),
+) -> Union[list[User], PaginatedResponse[UserResponse]]:
+    """List users (Admin only).
+
+    Offset mode (default) returns a bare list for compatibility. Passing
+    ``pagination=cursor`` or a ``cursor`` switches to keyset pagination over
+    (created_at, id): a PaginatedResponse envelope with signed cursors and
+    next/prev links, constant cost at any depth.
+    """
+    if not current_user.is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    return service.list_users(skip, limit)
+    if cursor is None and pagination == "offset":
+        return service.list_users(skip, limit)
+    after, before = cursor_bounds(cursor)
+    page = service.list_users_page(limit, after, before)
+    meta, links = cursor_meta(request, page, limit)
+    return PaginatedResponse[UserResponse](
+        data=[UserResponse.model_validate(user) for user in page.items], meta=meta, links=links
+    )
 
 @router.get("/me", response_model=UserResponse)
-def read_users_me(current_user: User = Depends(get_current_user)) -> User:
+def read_users_me(
+    service: UserService = Depends(get_user_service),
+    current_user: Principal = Depends(get_current_user),
+) -> User:
     """Get current authenticated user profile."""
-    return current_user
+    # Authentication yields a cached Principal; the profile is loaded here
+    if user := service.get_user(current_user.id):
+        return user
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(
-    user: User = Depends(resolve_user),
-    current_user: User = Depends(get_current_user),
+    user_id: str,
+    service: UserService = Depends(get_user_service),
+    current_user: Principal = Depends(get_current_user),
 ) -> User:
     """Get a specific user (Owner or Admin)."""
-    if current_user.role != "admin" and current_user.id != user.id:
+    # Authorised from the path id and the principal before any lookup
+    if not current_user.may_access(user_id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    return user
+    if user := service.get_user(user_id):
+        return user
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
 @router.patch("/{user_id}", response_model=UserResponse)
 def update_user(
+    user_id: str,
     request: UpdateUserRequest,
-    user: User = Depends(resolve_user),
     service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> User:
     """Update user profile (Owner or Admin)."""
-    if current_user.role != "admin" and current_user.id != user.id:
+    # Authorised from the path id alone; the UPDATE ... RETURNING both
+    # applies the change and tells us whether the user exists
+    if not current_user.may_access(user_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    if user := service.update_user(user_id, request):
+        return user
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+@router.post("/{user_id}/deactivate", response_model=UserResponse)
+def deactivate_user(
+    user_id: str,
+    service: UserService = Depends(get_user_service),
+    current_user: Principal = Depends(get_current_user),
+) -> User:
+    """A.9: Deactivate a user (Admin only) — their tokens stop authenticating."""
+    if not current_user.is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    return service.update_user(user, request)
+    if user := service.deactivate_user(user_id):
+        return user
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
 @router.delete("/{user_id}", status_code=204)
 def delete_user(
-    user: User = Depends(resolve_user),
+    user_id: str,
     service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> None:
     """Delete a user (Admin only)."""
-    if current_user.role != "admin":
+    if not current_user.is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    service.delete_user(user)
\ No newline at end of file
+    if not service.delete_user(user_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -0,0 +1,114 @@
+"""Async variants of the users routes — mounted instead of users.py when DB_ASYNC=true."""
+from typing import List, Literal, Union
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from app.domain.users.schemas import CreateUserRequest, UserResponse, UpdateUserRequest
+from app.domain.users.service import AsyncUserService
+from app.api.deps import get_current_user_async, get_async_user_service
+from app.domain.users.models import User
+from app.domain.users.principal import Principal
+from app.core.pagination import cursor_bounds, cursor_meta
+from app.core.responses import PaginatedResponse
+
+router = APIRouter()
+
+@router.post("/", response_model=UserResponse, status_code=201)
+async def register_user(
+    request: CreateUserRequest,
+    service: AsyncUserService = Depends(get_async_user_service)
+) -> User:
+    """Register a new user."""
+    return await service.create_user(request)
+
+@router.get("/", response_model=Union[List[UserResponse], PaginatedResponse[UserResponse]])
+async def list_users(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Opaque cursor from meta.next_cursor / meta.prev_cursor"),
+    pagination: Literal["offset", "cursor"] = Query("offset"),
+    service: AsyncUserService = Depends(get_async_user_service),
+    current_user: Principal = Depends(get_current_user_async),
+) -> Union[list[User], PaginatedResponse[UserResponse]]:
+    """List users (Admin only).
+
+    Offset mode (default) returns a bare list for compatibility. Passing
+    ``pagination=cursor`` or a ``cursor`` switches to keyset pagination over
+    (created_at, id): a PaginatedResponse envelope with signed cursors and
+    next/prev links, constant cost at any depth.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    if cursor is None and pagination == "offset":
+        return await service.list_users(skip, limit)
+    after, before = cursor_bounds(cursor)
+    page = await service.list_users_page(limit, after, before)
+    meta, links = cursor_meta(request, page, limit)
+    return PaginatedResponse[UserResponse](
+        data=[UserResponse.model_validate(user) for user in page.items], meta=meta, links=links
+    )
+
+@router.get("/me", response_model=UserResponse)
+async def read_users_me(
+    service: AsyncUserService = Depends(get_async_user_service),
+    current_user: Principal = Depends(get_current_user_async),
+) -> User:
+    """Get current authenticated user profile."""
+    # Authentication yields a cached Principal; the profile is loaded here
+    if user := await service.get_user(current_user.id):
+        return user
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+@router.get("/{user_id}", response_model=UserResponse)
+async def get_user(
+    user_id: str,
+    service: AsyncUserService = Depends(get_async_user_service),
+    current_user: Principal = Depends(get_current_user_async),
+) -> User:
+    """Get a specific user (Owner or Admin)."""
+    # Authorised from the path id and the principal before any lookup
+    if not current_user.may_access(user_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    if user := await service.get_user(user_id):
+        return user
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+@router.patch("/{user_id}", response_model=UserResponse)
+async def update_user(
+    user_id: str,
+    request: UpdateUserRequest,
+    service: AsyncUserService = Depends(get_async_user_service),
+    current_user: Principal = Depends(get_current_user_async),
+) -> User:
+    """Update user profile (Owner or Admin)."""
+    # Authorised from the path id alone; the UPDATE ... RETURNING both
+    # applies the change and tells us whether the user exists
+    if not current_user.may_access(user_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    if user := await service.update_user(user_id, request):
+        return user
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+@router.post("/{user_id}/deactivate", response_model=UserResponse)
+async def deactivate_user(
+    user_id: str,
+    service: AsyncUserService = Depends(get_async_user_service),
+    current_user: Principal = Depends(get_current_user_async),
+) -> User:
+    """A.9: Deactivate a user (Admin only) — their tokens stop authenticating."""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    if user := await service.deactivate_user(user_id):
+        return user
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+@router.delete("/{user_id}", status_code=204)
+async def delete_user(
+    user_id: str,
+    service: AsyncUserService = Depends(get_async_user_service),
+    current_user: Principal = Depends(get_current_user_async),
+) -> None:
+    """Delete a user (Admin only)."""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    if not await service.delete_user(user_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -2,7 +2,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Any
 import jwt
 from passlib.context import CryptContext
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from app.config.settings import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -16,8 +16,11 @@ ACCESS_TOKEN_TYP = "access"
 REFRESH_TOKEN_TYP = "refresh"
 
 class TokenPayload(BaseModel):
+    model_config = ConfigDict(frozen=True)   # cached payloads are shared between requests
+
     sub: str
     exp: int
+    iat: int = 0
     role: str = ""
     jti: str = ""
     typ: str = ""
@@ -35,14 +38,16 @@ def create_access_token(
     expires_delta: timedelta | None = None,
     typ: str = ACCESS_TOKEN_TYP,
 ) -> str:
+    now = datetime.now(timezone.utc)
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
 
     # A.9: typ separates access vs refresh tokens so an access token cannot be
     # presented at /refresh to extend a session beyond its short TTL.
-    to_encode: dict[str, Any] = {"sub": str(subject), "exp": expire, "typ": typ}
+    # iat lets a user-wide revocation reject every token issued before it
+    to_encode: dict[str, Any] = {"sub": str(subject), "exp": expire, "iat": now, "typ": typ}
     if role:
         to_encode["role"] = role   # A.9: embed RBAC claim so no DB lookup needed
     if jti:
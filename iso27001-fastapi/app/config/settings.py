@@ -1,3 +1,4 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -12,6 +13,9 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # A.9 / A.17: Verified access-token payloads cached per worker (LRU,
+    # keyed by token hash, valid until exp); 0 decodes every request
+    JWT_DECODE_CACHE_SIZE: int = 10000
     ENCRYPTION_KEY: str = "dev-only-32-byte-key-change-me!!"
 
     # A.9: CORS — comma-separated list of allowed origins (no wildcard in production)
@@ -19,11 +23,158 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./dev.db"
+    # A.17: Connection pool (ignored for in-memory SQLite) — pre-ping drops
+    # connections the server closed; recycle stays under server idle timeouts.
+    # Sync requests holding a session are capped at DB_POOL_SIZE + DB_MAX_OVERFLOW
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_S: float = 30.0
+    DB_POOL_RECYCLE_S: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # A.17: Async stack — DB_ASYNC=true serves users/auth from async routes on
+    # an asyncio engine (needs the "async" extra). ASYNC_DATABASE_URL defaults
+    # to DATABASE_URL with its driver swapped (aiosqlite / asyncpg)
+    DB_ASYNC: bool = False
+    ASYNC_DATABASE_URL: str = ""
+    # A.17: Read replicas — comma-separated URLs. SELECTs from GET routes and
+    # auth lookups round-robin across healthy replicas; one that fails to
+    # connect is skipped for DB_REPLICA_RETRY_S. A user's reads stay on the
+    # primary for DB_READ_YOUR_WRITES_S after they write; DB_READ_YOUR_WRITES_REDIS
+    # shares that window between workers (one Redis GET per authenticated
+    # request) and is required when WEB_CONCURRENCY > 1
+    DATABASE_REPLICA_URLS: str = ""
+    DB_REPLICA_RETRY_S: float = 30.0
+    DB_READ_YOUR_WRITES_S: float = 5.0
+    DB_READ_YOUR_WRITES_REDIS: bool = False
+    # A.17: High-concurrency SQLite (single-node / edge) — file databases get
+    # WAL, synchronous=NORMAL, busy timeout, page cache and mmap pragmas on
+    # connect, and audit rows plus user registration, update and delete commit
+    # through one batching writer thread; callers wait for their commit up to
+    # twice SQLITE_BUSY_TIMEOUT_MS
+    SQLITE_TUNED: bool = False
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KIB: int = 65536
+    SQLITE_MMAP_SIZE_BYTES: int = 268435456
+    DB_WRITE_QUEUE_MAXSIZE: int = 10000
+    DB_WRITE_BATCH_SIZE: int = 64
     REDIS_URL: str = "redis://localhost:6379/0"
+    # A.9 / A.17: Principal cache — get_current_user keeps id/role/email/
+    # is_active per user in an in-process LRU (PRINCIPAL_CACHE_TTL_S bounds
+    # how long another worker may still accept a just-deactivated user) and,
+    # with PRINCIPAL_CACHE_REDIS, a shared Redis tier. User update, delete and
+    # deactivation events evict both tiers
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_TTL_S: float = 10.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_REDIS: bool = False
+    PRINCIPAL_CACHE_SHARED_TTL_S: float = 300.0
+    # A.9: Stateless claims mode — access tokens carrying a role claim are
+    # trusted as-is (no user lookup) for their short lifetime; only the
+    # revocation list is consulted. Deactivation and deletion revoke every
+    # token issued before them; AUTH_REVOCATION_REDIS shares revocations
+    # between workers (one Redis GET per request) and is required when
+    # WEB_CONCURRENCY > 1. While Redis is unreachable, requests fall back to
+    # the user lookup rather than trusting the claims
+    AUTH_STATELESS_CLAIMS: bool = False
+    AUTH_REVOCATION_REDIS: bool = False
+    # Worker processes per host (read by uvicorn / gunicorn as well)
+    WEB_CONCURRENCY: int = 1
+    # Query instrumentation — statements slower than DB_SLOW_QUERY_MS are
+    # logged (parameters redacted); a statement repeated DB_N_PLUS_ONE_THRESHOLD
+    # times within one request is flagged as an N+1 suspect
+    DB_SLOW_QUERY_MS: float = 100.0
+    DB_N_PLUS_ONE_THRESHOLD: int = 3
+
+    # Telemetry — CloudWatch transport: "api" (PutMetricData) or "emf"
+    # (Embedded Metric Format JSON lines extracted by CloudWatch Logs)
+    CLOUDWATCH_TRANSPORT: str = "api"
+    CLOUDWATCH_EMF_FLUSH_INTERVAL_S: float = 10.0
+    CLOUDWATCH_EMF_LOG_PATH: str = ""  # empty = stdout (awslogs driver on Fargate)
+
+    # Telemetry — X-Ray tracing: head sampling (reservoir per second + fixed
+    # rate, upstream Sampled= flag honoured), UDP batches to the local daemon
+    XRAY_TRACING_ENABLED: bool = False
+    XRAY_SAMPLING_RESERVOIR: int = 1
+    XRAY_SAMPLING_RATE: float = 0.05
+    XRAY_FLUSH_INTERVAL_S: float = 1.0
+    AWS_XRAY_DAEMON_ADDRESS: str = "127.0.0.1:2000"
+
+    # A.17: Readiness — dependency checks run concurrently with per-check
+    # timeouts; the combined result is cached so probe floods cost one round
+    READINESS_CACHE_TTL_S: float = 2.0
+    READINESS_DB_TIMEOUT_S: float = 2.0
+    READINESS_REDIS_TIMEOUT_S: float = 0.5
+
+    # A.17: Runtime monitor — event-loop lag and threadpool saturation sampling
+    RUNTIME_MONITOR_INTERVAL_S: float = 0.5
+    # A.17: Rolling window for live p50/p95/p99 latency sketches
+    LATENCY_WINDOW_S: float = 300.0
+
+    # A.17: Prometheus multiprocess mode — set to a per-deployment directory
+    # (emptied before the server starts) when running several workers, so a
+    # scrape of any worker aggregates every worker's counters
+    PROMETHEUS_MULTIPROC_DIR: str = ""
+    # A.17: /metrics exposition cache TTL (0 = render on every scrape, still off-loop)
+    METRICS_CACHE_TTL_S: float = 5.0
+
+    # A.17: Error budget storage — ERROR_BUDGET_SHARED_PATH (e.g. under /dev/shm)
+    # shares one counter block between all workers on the host; the block is
+    # saved to ERROR_BUDGET_SNAPSHOT_PATH periodically and restored on start
+    ERROR_BUDGET_SHARED_PATH: str = ""
+    ERROR_BUDGET_SNAPSHOT_PATH: str = ""
+    ERROR_BUDGET_SNAPSHOT_INTERVAL_S: float = 60.0
+    # A.17: Fleet-wide SLO — flush per-minute deltas (counts + latency sketch)
+    # to Redis so /health/detailed can report the whole service
+    FLEET_SLO_ENABLED: bool = False
+    FLEET_SLO_FLUSH_INTERVAL_S: float = 5.0
+    # A.17: Quality monitor — recompute QualityScore / SloAlert from live
+    # counters every interval; pillar ratios cover the trailing window and
+    # QUALITY_HISTORY_SIZE snapshots are kept for /health/detailed
+    QUALITY_MONITOR_INTERVAL_S: float = 15.0
+    QUALITY_WINDOW_S: float = 300.0
+    QUALITY_HISTORY_SIZE: int = 240
+
+    # A.12: Structured logging — LOG_ASYNC moves encoding and stream I/O to a
+    # background writer thread fed by a bounded queue
+    LOG_ASYNC: bool = False
+    LOG_QUEUE_MAXSIZE: int = 10000
+    LOG_BATCH_SIZE: int = 256
+    LOG_OVERFLOW_POLICY: str = "drop-debug-first"  # or "block"
+    # Tail-based sampling: healthy, fast requests collapse into one summary
+    # line; errors, warnings, slow requests (> SLO_P95_LATENCY_MS) and a random
+    # LOG_SAMPLING_RATE share keep every line. Audit entries are never sampled.
+    LOG_SAMPLING_ENABLED: bool = False
+    LOG_SAMPLING_RATE: float = 0.01
+    LOG_SAMPLING_MAX_BUFFERED: int = 100
 
     class Config:
         env_file = ".env"
 
+    @model_validator(mode="after")
+    def _stateless_claims_need_shared_revocation(self) -> "Settings":
+        # A.9: a worker-local revocation list would let every other worker
+        # accept a deactivated user's token until it expires
+        if self.AUTH_STATELESS_CLAIMS and not self.AUTH_REVOCATION_REDIS and self.WEB_CONCURRENCY > 1:
+            raise ValueError(
+                "AUTH_STATELESS_CLAIMS with WEB_CONCURRENCY > 1 requires AUTH_REVOCATION_REDIS=true"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def _replicas_need_shared_read_your_writes(self) -> "Settings":
+        # A.17: a worker that never saw a user's write would read their data
+        # from a lagging replica, whatever the window
+        if (
+            self.DATABASE_REPLICA_URLS.strip()
+            and self.DB_READ_YOUR_WRITES_S > 0
+            and not self.DB_READ_YOUR_WRITES_REDIS
+            and self.WEB_CONCURRENCY > 1
+        ):
+            raise ValueError(
+                "DATABASE_REPLICA_URLS with WEB_CONCURRENCY > 1 requires DB_READ_YOUR_WRITES_REDIS=true"
+            )
+        return self
+
 @lru_cache()
 def get_settings() -> Settings:
     return Settings()
@@ -0,0 +1,90 @@
+"""
+A.17: Async SQLAlchemy engine and session dependency (``pip install .[async]``).
+
+DATABASE_URL's driver is swapped for its asyncio counterpart (aiosqlite for
+SQLite, asyncpg for PostgreSQL) unless ASYNC_DATABASE_URL is set. The engine
+is built on first use, so sync-only deployments never import either driver.
+
+Sessions use expire_on_commit=False: reading an expired attribute after
+commit would need implicit I/O, which an AsyncSession cannot do. They route
+reads to DATABASE_REPLICA_URLS (driver swapped the same way) exactly like
+the sync sessions — see db_routing.
+"""
+from typing import AsyncIterator, Optional
+
+from fastapi import Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config.settings import settings
+from app.core.db_pool import engine_options
+from app.core.db_routing import DatabaseRouter, ReplicaSet, RoutingSession, enable_replica_reads, recent_writers, replica_urls
+from app.core.sqlite_tuning import configured_pragmas, is_file_sqlite, tune_sqlite
+
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+_engine: Optional[AsyncEngine] = None
+_replicas: list[AsyncEngine] = []
+_sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def async_url(url: str) -> str:
+    """``url`` with its driver replaced by the asyncio driver for the same backend."""
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()!r}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    global _engine, _sessionmaker
+    if _engine is None:
+        url = settings.ASYNC_DATABASE_URL or async_url(settings.DATABASE_URL)
+        _engine = create_async_engine(url, **engine_options(url, asyncio=True))
+        if settings.SQLITE_TUNED and is_file_sqlite(url):
+            tune_sqlite(_engine.sync_engine, configured_pragmas())
+        for i, replica_url in enumerate(replica_urls(settings.DATABASE_REPLICA_URLS)):
+            replica_url = async_url(replica_url)
+            _replicas.append(create_async_engine(
+                replica_url, **engine_options(replica_url, target=f"replica-{i}", asyncio=True)
+            ))
+        # Routing runs on the sync facades — AsyncSession delegates to a sync Session
+        replicas = ReplicaSet(
+            [(f"replica-{i}", replica.sync_engine) for i, replica in enumerate(_replicas)],
+            retry_s=settings.DB_REPLICA_RETRY_S,
+        )
+        _sessionmaker = async_sessionmaker(
+            _engine,
+            autoflush=False,
+            expire_on_commit=False,
+            sync_session_class=RoutingSession,
+            router=DatabaseRouter(_engine.sync_engine, replicas, recent_writers),
+        )
+    return _engine
+
+
+def get_async_replica_engines() -> list[AsyncEngine]:
+    get_async_engine()
+    return list(_replicas)
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled connections on shutdown (no-op if the engine was never built)."""
+    if _engine is not None:
+        await _engine.dispose()
+    for replica in _replicas:
+        await replica.dispose()
+
+
+async def get_async_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Async counterpart of get_db — the connection is checked out on first use."""
+    get_async_engine()
+    assert _sessionmaker is not None
+    async with _sessionmaker() as session:
+        if request.method in ("GET", "HEAD"):
+            enable_replica_reads(session)
+        yield session
@@ -17,6 +17,7 @@ Install Redis for production accuracy:
 import time
 from typing import Any
 from fastapi import HTTPException, status
+from app.infrastructure.aws_telemetry import xray
 
 _MAX_ATTEMPTS: int = 5
 _LOCKOUT_TTL: int = 900  # seconds (15 minutes)
@@ -54,7 +55,8 @@ class BruteForceGuard:
         key_locked = f"{_KEY_PREFIX}{identifier}:locked_until"
 
         if r is not None:
-            locked_until = r.get(key_locked)
+            with xray.subsegment("redis", namespace="remote"):
+                locked_until = r.get(key_locked)
             if locked_until and float(locked_until) > time.time():
                 raise HTTPException(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -81,12 +83,13 @@ class BruteForceGuard:
         key_locked = f"{_KEY_PREFIX}{identifier}:locked_until"
 
         if r is not None:
-            count = r.incr(key_count)
-            r.expire(key_count, _LOCKOUT_TTL)
-            if int(count) >= _MAX_ATTEMPTS:
-                locked_until = time.time() + _LOCKOUT_TTL
-                r.set(key_locked, locked_until, ex=_LOCKOUT_TTL)
-                r.delete(key_count)
+            with xray.subsegment("redis", namespace="remote"):
+                count = r.incr(key_count)
+                r.expire(key_count, _LOCKOUT_TTL)
+                if int(count) >= _MAX_ATTEMPTS:
+                    locked_until = time.time() + _LOCKOUT_TTL
+                    r.set(key_locked, locked_until, ex=_LOCKOUT_TTL)
+                    r.delete(key_count)
         else:
             entry = _local.setdefault(identifier, {"count": 0, "locked_until": 0.0})
             entry["count"] = int(entry["count"]) + 1
@@ -98,10 +101,11 @@ class BruteForceGuard:
         """Clear failure counters after a successful login."""
         r = _redis_client()
         if r is not None:
-            r.delete(
-                f"{_KEY_PREFIX}{identifier}:count",
-                f"{_KEY_PREFIX}{identifier}:locked_until",
-            )
+            with xray.subsegment("redis", namespace="remote"):
+                r.delete(
+                    f"{_KEY_PREFIX}{identifier}:count",
+                    f"{_KEY_PREFIX}{identifier}:locked_until",
+                )
         else:
             _local.pop(identifier, None)
 
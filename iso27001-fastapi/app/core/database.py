@@ -1,23 +1,148 @@
-from typing import Generator
+import asyncio
+import atexit
+from typing import Any, AsyncIterator, Callable, Generator, Optional, TypeVar
+from anyio import CapacityLimiter
+from anyio.lowlevel import RunVar
+from fastapi import Depends, Request
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 from app.config.settings import settings
+from app.core.db_pool import engine_options
+from app.core.db_routing import (
+    DatabaseRouter,
+    ReplicaSet,
+    RoutingSession,
+    enable_replica_reads,
+    recent_writers,
+    replica_urls,
+    wrote_elsewhere,
+)
+from app.core.sqlite_tuning import configured_pragmas, is_file_sqlite, tune_sqlite
+from app.core.write_queue import WriteQueue
 from app.domain.persistence import Base  # re-exported for infrastructure consumers
+from app.domain.users.repository import AsyncWriter, Writer
+
+# A.12: Database connection configuration; A.17: pool sized by DB_POOL_* settings
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+SQLITE_TUNED = settings.SQLITE_TUNED and is_file_sqlite(settings.DATABASE_URL)
+if SQLITE_TUNED:
+    tune_sqlite(engine, configured_pragmas())
 
-# A.12: Database connection configuration
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+# A.17: Read replicas — each with its own pool, labelled replica-N in pool metrics
+replicas = ReplicaSet(
+    [
+        (f"replica-{i}", create_engine(url, **engine_options(url, target=f"replica-{i}")))
+        for i, url in enumerate(replica_urls(settings.DATABASE_REPLICA_URLS))
+    ],
+    retry_s=settings.DB_REPLICA_RETRY_S,
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    # Committed objects keep their loaded state — returning them needs no refresh SELECT
+    expire_on_commit=False,
+    bind=engine,
+    class_=RoutingSession,
+    router=DatabaseRouter(engine, replicas, recent_writers),
+)
+
+def _build_write_queue() -> Optional[WriteQueue]:
+    if not SQLITE_TUNED:
+        return None
+    writer = WriteQueue(
+        SessionLocal,
+        maxsize=settings.DB_WRITE_QUEUE_MAXSIZE,
+        batch_size=settings.DB_WRITE_BATCH_SIZE,
+    )
+    atexit.register(writer.close)
+    return writer
+
+# A.17: How long a caller waits on the writer — the batch ahead of its job
+# and its own batch may each wait out the busy timeout for the write lock
+WRITE_TIMEOUT_S = 2 * settings.SQLITE_BUSY_TIMEOUT_MS / 1000
+
+# A.17: Single SQLite writer for audit rows and, through queued_writer(),
+# user registration, update and delete
+write_queue = _build_write_queue()
+
+T = TypeVar("T")
+
+def queued_writer(session: Session) -> Optional[Writer]:
+    """Repository writer for a request session: jobs commit on write_queue (None when it is off)."""
+    queue = write_queue
+    if queue is None:
+        return None
+
+    def write(job: Callable[[Session], T]) -> T:
+        result: T = queue.call(job, timeout=WRITE_TIMEOUT_S)
+        wrote_elsewhere(session)   # read-your-writes still sees the request's write
+        return result
+    return write
+
+def queued_async_writer(session: Any) -> Optional[AsyncWriter]:
+    """queued_writer for AsyncSession requests; waits without holding a worker thread."""
+    queue = write_queue
+    if queue is None:
+        return None
+
+    async def write(job: Callable[[Session], T]) -> T:
+        result: T = await asyncio.wait_for(asyncio.wrap_future(queue.submit(job)), WRITE_TIMEOUT_S)
+        wrote_elsewhere(session)
+        return result
+    return write
+
+__all__ = [
+    "Base", "engine", "replicas", "SessionLocal", "write_queue", "WRITE_TIMEOUT_S",
+    "queued_writer", "queued_async_writer", "DB_SESSION_SLOTS", "get_db",
+]
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+# A.17: Sync requests holding a session, capped at what the pool can hand out
+# (less one connection for the SQLite writer). A request that holds a
+# connection needs a worker thread again for its next sync step; without the
+# cap, requests blocked in pool checkout could take every AnyIO thread token
+# and stall it until DB_POOL_TIMEOUT_S. Slots are waited for on the event loop.
+DB_SESSION_SLOTS: Optional[int] = (
+    settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW - (1 if write_queue is not None else 0)
+    if isinstance(engine.pool, QueuePool) and settings.DB_MAX_OVERFLOW >= 0
+    else None
+)
+_session_slots: RunVar[CapacityLimiter] = RunVar("db_session_slots")   # one limiter per event loop
+
+async def db_session_slot() -> AsyncIterator[None]:
+    """Hold one of DB_SESSION_SLOTS for the request; released after get_db closes its session."""
+    if DB_SESSION_SLOTS is None:
+        yield
+        return
+    try:
+        slots = _session_slots.get()
+    except LookupError:
+        slots = CapacityLimiter(DB_SESSION_SLOTS)
+        _session_slots.set(slots)
+    borrower = object()   # setup and teardown may run in different tasks
+    await slots.acquire_on_behalf_of(borrower)
+    try:
+        yield
+    finally:
+        slots.release_on_behalf_of(borrower)
 
-__all__ = ["Base", "engine", "SessionLocal", "get_db"]
+def get_db(request: Request, _slot: None = Depends(db_session_slot)) -> Generator[Session, None, None]:
+    """
+    Dependency for database session management.
 
-def get_db() -> Generator[Session, None, None]:
-    """Dependency for database session management."""
+    Creating a Session does not touch the pool: a connection is checked out
+    on the first statement and returned on close(). Requests rejected before
+    any query (bad token, validation, rate limit) never take a connection,
+    though under load they may wait for a session slot first.
+    Sessions for GET/HEAD requests read from a replica when any are configured.
+    """
     db = SessionLocal()
+    if request.method in READ_METHODS:
+        enable_replica_reads(db)
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
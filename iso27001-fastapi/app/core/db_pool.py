@@ -0,0 +1,87 @@
+"""
+A.17: Settings-driven connection pools with Prometheus instrumentation.
+
+``engine_options()`` turns the DB_POOL_* settings into create_engine()
+arguments. Server databases (and file-backed SQLite) get an
+InstrumentedQueuePool that reports, per ``target`` label:
+
+  db_pool_size / db_pool_checked_out / db_pool_overflow   current state
+  db_pool_checkout_seconds                                 time to obtain a connection
+                                                           (queue wait + any new connect)
+  db_pool_exhausted_total                                  checkouts that hit pool_timeout
+
+In-memory SQLite uses a single shared connection and keeps SQLAlchemy's
+default pool; the pool-size settings do not apply to it.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
+
+from app.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_SECONDS,
+    DB_POOL_EXHAUSTED,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times checkouts and exports its occupancy."""
+
+    target = "primary"
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_EXHAUSTED.labels(target=self.target).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.labels(target=self.target).observe(time.perf_counter() - started)
+        self._export()
+        return record
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        self._export()
+
+    def _export(self) -> None:
+        DB_POOL_SIZE.labels(target=self.target).set(self.size())
+        DB_POOL_CHECKED_OUT.labels(target=self.target).set(self.checkedout())
+        DB_POOL_OVERFLOW.labels(target=self.target).set(max(0, self.overflow()))
+
+
+def instrumented_pool(target: str, *, asyncio: bool = False) -> type[InstrumentedQueuePool]:
+    """Pool class labelled ``target`` (a class, so Pool.recreate() keeps the label)."""
+    bases: tuple[type, ...] = (InstrumentedQueuePool,)
+    if asyncio:
+        bases += (AsyncAdaptedQueuePool,)   # asyncio-aware queue for create_async_engine()
+    return type(f"InstrumentedQueuePool[{target}]", bases, {"target": target})
+
+
+def engine_options(url: str, target: str = "primary", *, asyncio: bool = False) -> dict[str, Any]:
+    """create_engine() / create_async_engine() keyword arguments for ``url`` from the DB_POOL_* settings."""
+    from app.config.settings import settings
+
+    parsed = make_url(url)
+    options: dict[str, Any] = {}
+    if parsed.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if parsed.database in (None, "", ":memory:"):
+            return options
+    options.update(
+        poolclass=instrumented_pool(target, asyncio=asyncio),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_S,
+        pool_recycle=settings.DB_POOL_RECYCLE_S,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
@@ -0,0 +1,335 @@
+"""
+A.17: Read-replica routing for request sessions.
+
+Sessions built on RoutingSession pick an engine per statement:
+
+  primary   writes (flushes, INSERT/UPDATE/DELETE) and every statement after
+            the session's first write; all reads unless replica reads are on
+  replica   SELECTs in a session with replica reads enabled — GET/HEAD
+            requests (get_db) and the token-to-user lookup of any request
+
+Replicas are chosen round-robin among the healthy ones. A replica whose
+connection fails (refused connect or a disconnect mid-query) is skipped for
+DB_REPLICA_RETRY_S and then tried again; with none healthy, reads fall back
+to the primary. The request that hit the failure still errors — only later
+requests are rerouted.
+
+Read-your-writes: after a session that acted for a principal commits a
+write, that principal's sessions stay on the primary for
+DB_READ_YOUR_WRITES_S, covering the replication lag a user would otherwise
+see on their next page load. The window is kept in process and, with
+DB_READ_YOUR_WRITES_REDIS, in Redis (SET with EX) so the follow-up request
+is pinned on whichever worker it lands; settings refuse replicas on several
+workers without it. While Redis is unreachable principals are treated as
+inside the window — reads go to the primary rather than risk stale data.
+
+Per-target pool metrics come from the instrumented pools (one ``target``
+label per engine, see db_pool); routing adds:
+
+  db_routed_statements_total{target}   statements bound to each engine
+  db_replica_healthy{target}           1 while a replica is in rotation
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, ExceptionContext
+from sqlalchemy.orm import Session
+
+from app.core.metrics import DB_REPLICA_HEALTHY, DB_ROUTED_STATEMENTS
+from app.core.telemetry import logger
+
+PRIMARY = "primary"
+
+# session.info keys
+REPLICA_READS = "replica_reads"   # SELECTs may go to a replica
+WROTE = "wrote"                   # the session has written; stay on the primary
+PRINCIPAL = "principal"           # user id the session acts for (read-your-writes)
+PINNED = "pinned"                 # principal is inside its read-your-writes window
+
+_KEY_PREFIX = "ryw:"
+RECONNECT_INTERVAL_S = 30.0
+_UNAVAILABLE = object()   # Redis could not be reached (distinct from a missing key)
+
+
+def _redis_client() -> Any:
+    """Return a redis.Redis client or None if unavailable."""
+    try:
+        import redis as _redis
+        from app.config.settings import settings
+
+        client = _redis.Redis.from_url(
+            settings.REDIS_URL, encoding="utf-8", decode_responses=True, socket_connect_timeout=0.5
+        )
+        client.ping()
+        return client
+    except Exception:
+        return None
+
+
+def replica_urls(value: str) -> list[str]:
+    """Parse the comma-separated DATABASE_REPLICA_URLS setting."""
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+class ReplicaSet:
+    """Round-robin over replica engines, skipping those that recently failed."""
+
+    def __init__(
+        self,
+        engines: Sequence[tuple[str, Engine]],
+        *,
+        retry_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._engines = list(engines)
+        self._retry = retry_s
+        self._clock = clock
+        self._next = 0
+        self._down_until: dict[str, float] = {}
+        self._lock = threading.Lock()
+        for name, engine in self._engines:
+            DB_REPLICA_HEALTHY.labels(target=name).set(1)
+            event.listen(engine, "handle_error", self._on_error(name))
+
+    def __bool__(self) -> bool:
+        return bool(self._engines)
+
+    @property
+    def engines(self) -> list[Engine]:
+        return [engine for _, engine in self._engines]
+
+    @property
+    def named_engines(self) -> list[tuple[str, Engine]]:
+        return list(self._engines)
+
+    def choose(self) -> Optional[tuple[str, Engine]]:
+        """Next healthy replica, or None when every replica is out of rotation."""
+        now = self._clock()
+        with self._lock:
+            for _ in range(len(self._engines)):
+                name, engine = self._engines[self._next]
+                self._next = (self._next + 1) % len(self._engines)
+                until = self._down_until.get(name)
+                if until is not None:
+                    if now < until:
+                        continue
+                    del self._down_until[name]   # retry period over — back in rotation
+                    DB_REPLICA_HEALTHY.labels(target=name).set(1)
+                return name, engine
+        return None
+
+    def mark_down(self, name: str) -> None:
+        with self._lock:
+            self._down_until[name] = self._clock() + self._retry
+        DB_REPLICA_HEALTHY.labels(target=name).set(0)
+
+    def _on_error(self, name: str) -> Callable[[ExceptionContext], None]:
+        def on_error(ctx: ExceptionContext) -> None:
+            # connection is None: the pool could not connect at all
+            if ctx.is_disconnect or ctx.connection is None:
+                self.mark_down(name)
+        return on_error
+
+
+class RecentWriters:
+    """
+    Principals that wrote within the last ``window_s`` seconds (bounded, LRU-evicted).
+
+    With a ``redis_factory`` each write is also recorded in Redis and a
+    principal not found locally is looked up there (one GET).
+    """
+
+    def __init__(
+        self,
+        window_s: float,
+        *,
+        max_entries: int = 10_000,
+        redis_factory: Optional[Callable[[], Any]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._window = window_s
+        self._max = max_entries
+        self._redis_factory = redis_factory
+        self._client: Any = None
+        self._retry_at = 0.0
+        self._clock = clock
+        self._until: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self) -> bool:
+        """True when checks read Redis — they block on the network."""
+        return self._redis_factory is not None
+
+    def record(self, principal: str) -> None:
+        with self._lock:
+            self._until[principal] = self._clock() + self._window
+            self._until.move_to_end(principal)
+            while len(self._until) > self._max:
+                self._until.popitem(last=False)
+        if self._redis_factory is not None:
+            ttl = max(1, math.ceil(self._window))
+
+            def share() -> None:
+                self._call_redis(lambda r: r.set(_KEY_PREFIX + principal, "1", ex=ttl))
+
+            try:
+                # async session commits run on the event loop: write off it
+                asyncio.get_running_loop().run_in_executor(None, share)
+            except RuntimeError:
+                share()
+
+    def active(self, principal: str) -> bool:
+        if self._local(principal):
+            return True
+        if self._redis_factory is None:
+            return False
+        found = self._call_redis(lambda r: r.get(_KEY_PREFIX + principal))
+        return found is _UNAVAILABLE or found is not None
+
+    def _local(self, principal: str) -> bool:
+        with self._lock:
+            until = self._until.get(principal)
+            if until is None:
+                return False
+            if self._clock() >= until:
+                del self._until[principal]
+                return False
+            return True
+
+    def _call_redis(self, op: Callable[[Any], Any]) -> Any:
+        client = self._redis()
+        if client is None:
+            return _UNAVAILABLE
+        try:
+            return op(client)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("db_routing.redis_unavailable", error=str(exc))
+            self._client = None
+            self._retry_at = time.monotonic() + RECONNECT_INTERVAL_S
+            return _UNAVAILABLE
+
+    def _redis(self) -> Any:
+        if self._client is None and self._redis_factory is not None and time.monotonic() >= self._retry_at:
+            self._client = self._redis_factory()
+            if self._client is None:
+                self._retry_at = time.monotonic() + RECONNECT_INTERVAL_S
+        return self._client
+
+
+class DatabaseRouter:
+    """Chooses the engine for each statement of a RoutingSession."""
+
+    def __init__(self, primary: Engine, replicas: ReplicaSet, recent_writers: RecentWriters) -> None:
+        self.primary = primary
+        self.replicas = replicas
+        self.recent_writers = recent_writers
+
+    def bind_for(self, session: Session, clause: Any) -> Engine:
+        info = session.info
+        if getattr(clause, "is_dml", False):
+            info[WROTE] = True
+        if (
+            self.replicas
+            and info.get(REPLICA_READS)
+            and not info.get(WROTE)
+            and not info.get(PINNED)
+            and getattr(clause, "is_select", False)
+        ):
+            chosen = self.replicas.choose()
+            if chosen is not None:
+                name, engine = chosen
+                DB_ROUTED_STATEMENTS.labels(target=name).inc()
+                return engine
+        DB_ROUTED_STATEMENTS.labels(target=PRIMARY).inc()
+        return self.primary
+
+
+class RoutingSession(Session):
+    """Session that binds each statement through a DatabaseRouter."""
+
+    def __init__(self, *args: Any, router: DatabaseRouter, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.router = router
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Engine:
+        if self._flushing:
+            self.info[WROTE] = True
+        return self.router.bind_for(self, clause)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session: Session, flush_context: Any) -> None:
+    session.info[WROTE] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _after_commit(session: Session) -> None:
+    principal = session.info.get(PRINCIPAL)
+    if principal and session.info.get(WROTE) and isinstance(session, RoutingSession):
+        session.router.recent_writers.record(principal)
+
+
+# ── Request helpers ──────────────────────────────────────────────────────────
+
+def _sync_session(session: Any) -> Session:
+    sync: Session = getattr(session, "sync_session", session)   # AsyncSession → its sync Session
+    return sync
+
+
+def enable_replica_reads(session: Any) -> None:
+    """Let this session's SELECTs go to a replica (read-only requests)."""
+    _sync_session(session).info[REPLICA_READS] = True
+
+
+def act_as(session: Any, principal: str) -> None:
+    """
+    Record who the session acts for. If they wrote within the
+    read-your-writes window, pin the session to the primary.
+    """
+    sync = _sync_session(session)
+    sync.info[PRINCIPAL] = principal
+    if isinstance(sync, RoutingSession) and sync.router.replicas and sync.router.recent_writers.active(principal):
+        sync.info[PINNED] = True
+
+
+def wrote_elsewhere(session: Any) -> None:
+    """Count a write committed on another session (the SQLite writer) as this session's."""
+    sync = _sync_session(session)
+    sync.info[WROTE] = True
+    principal = sync.info.get(PRINCIPAL)
+    if principal and isinstance(sync, RoutingSession):
+        sync.router.recent_writers.record(principal)
+
+
+@contextmanager
+def replica_lookup(session: Any) -> Iterator[None]:
+    """Allow replica reads for the block only — auth lookups on write requests."""
+    sync = _sync_session(session)
+    before = sync.info.get(REPLICA_READS, False)
+    sync.info[REPLICA_READS] = True
+    try:
+        yield
+    finally:
+        sync.info[REPLICA_READS] = before
+
+
+# ── Recent writers (shared by the sync and async stacks) ─────────────────────
+
+def _build_recent_writers() -> RecentWriters:
+    from app.config.settings import settings
+    return RecentWriters(
+        settings.DB_READ_YOUR_WRITES_S,
+        redis_factory=_redis_client if settings.DB_READ_YOUR_WRITES_REDIS else None,
+    )
+
+
+recent_writers = _build_recent_writers()
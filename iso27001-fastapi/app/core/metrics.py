@@ -1,5 +1,42 @@
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
-from fastapi import Response
+import asyncio
+import gzip
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from app.config.settings import settings
+
+
+def _configure_multiprocess() -> Optional[str]:
+    """
+    A.17: Enable prometheus_client multiprocess mode when configured.
+
+    Must run before prometheus_client is first imported: the library picks
+    its value backend (in-process vs. per-process mmap files) at import time.
+    """
+    path = settings.PROMETHEUS_MULTIPROC_DIR or os.environ.get("PROMETHEUS_MULTIPROC_DIR", "")
+    if not path:
+        return None
+    os.makedirs(path, exist_ok=True)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+    return path
+
+
+MULTIPROC_DIR = _configure_multiprocess()
+
+from prometheus_client import (  # noqa: E402 — must follow _configure_multiprocess()
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from fastapi import Response  # noqa: E402
 
 REQUEST_COUNT = Counter(
     "http_requests_total",
@@ -23,6 +60,200 @@ ERROR_CLASS_COUNT = Counter(
     ["error_class"],  # "4xx" or "5xx"
 )
 
+# A.12: Per-request database work, labelled by route template (bounded cardinality)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed per HTTP request",
+    ["endpoint"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55),
+)
+
+DB_TIME_PER_REQUEST = Histogram(
+    "db_query_time_per_request_seconds",
+    "Total SQL execution time per HTTP request",
+    ["endpoint"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+DB_SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "SQL statements slower than DB_SLOW_QUERY_MS",
+)
+
+DB_N_PLUS_ONE_SUSPECTS = Counter(
+    "db_n_plus_one_suspects_total",
+    "Requests that repeated an identical SQL statement DB_N_PLUS_ONE_THRESHOLD+ times",
+    ["endpoint"],
+)
+
+# A.17: Connection pool occupancy and checkout latency, per target database
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured persistent connections in the pool",
+    ["target"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["target"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size",
+    ["target"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time to obtain a pooled connection (queue wait plus any new connect)",
+    ["target"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+DB_POOL_EXHAUSTED = Counter(
+    "db_pool_exhausted_total",
+    "Checkouts that timed out waiting for a connection (pool_size + max_overflow in use)",
+    ["target"],
+)
+
+# A.17: Read-replica routing — statements per target engine and replica health
+DB_ROUTED_STATEMENTS = Counter(
+    "db_routed_statements_total",
+    "Statements bound to each database target by the session router",
+    ["target"],
+)
+
+DB_REPLICA_HEALTHY = Gauge(
+    "db_replica_healthy",
+    "1 while a read replica is in rotation, 0 while it is skipped after a connection failure",
+    ["target"],
+    multiprocess_mode="livemin",
+)
+
+# A.17: Single-writer queue (SQLITE_TUNED) — backlog and jobs per commit
+DB_WRITE_QUEUE_DEPTH = Gauge(
+    "db_write_queue_depth",
+    "Write jobs waiting for the single writer thread",
+    multiprocess_mode="livesum",
+)
+
+DB_WRITE_BATCH_SIZE = Histogram(
+    "db_write_batch_size",
+    "Write jobs committed in one transaction by the single writer",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+
+# A.9 / A.17: Principal cache in front of the per-request user lookup
+PRINCIPAL_CACHE_LOOKUPS = Counter(
+    "principal_cache_lookups_total",
+    "Principal cache lookups by tier (l1 in-process, l2 Redis) and result",
+    ["tier", "result"],
+)
+
+# A.9 / A.17: Verified-JWT decode cache — hit rate = hit / (hit + miss)
+JWT_DECODE_CACHE_LOOKUPS = Counter(
+    "jwt_decode_cache_lookups_total",
+    "Access-token decodes served from the verified-payload cache (hit) or verified (miss)",
+    ["result"],
+)
+
+# A.9: Requests authenticated from token claims alone (stateless mode)
+STATELESS_AUTH_CHECKS = Counter(
+    "stateless_auth_checks_total",
+    "Claims-only authentications by outcome (accepted, revoked, fallback)",
+    ["result"],
+)
+
+# A.17: Runtime saturation — event-loop scheduling lag and AnyIO threadpool
+# tokens (sync `def` routes each hold one token while they run)
+EVENT_LOOP_LAG = Gauge(
+    "event_loop_lag_seconds",
+    "Most recent event-loop scheduling lag",
+    multiprocess_mode="livemax",   # worst live worker
+)
+
+EVENT_LOOP_LAG_HISTOGRAM = Histogram(
+    "event_loop_lag_distribution_seconds",
+    "Event-loop scheduling lag per monitor tick",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+THREADPOOL_TOKENS = Gauge(
+    "threadpool_tokens",
+    "Capacity of the default AnyIO worker-thread limiter",
+    multiprocess_mode="livesum",   # fleet-wide across live workers
+)
+
+THREADPOOL_TOKENS_IN_USE = Gauge(
+    "threadpool_tokens_in_use",
+    "Worker-thread tokens currently borrowed",
+    multiprocess_mode="livesum",
+)
+
+THREADPOOL_TASKS_WAITING = Gauge(
+    "threadpool_tasks_waiting",
+    "Tasks queued for a worker-thread token",
+    multiprocess_mode="livesum",
+)
+
+THREADPOOL_WAITING_HISTOGRAM = Histogram(
+    "threadpool_tasks_waiting_distribution",
+    "Tasks queued for a worker-thread token per monitor tick",
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+
+# A.12: Log entries the async writer discarded under back-pressure (drop-debug-first)
+LOG_ENTRIES_DROPPED = Counter(
+    "log_entries_dropped_total",
+    "Log entries dropped because the async writer queue was backed up",
+    ["level"],  # "DEBUG" or "INFO" — WARNING and above are never dropped
+)
+
+# A.17: /metrics self-observability — exposition render cost and cache efficiency
+METRICS_RENDER_SECONDS = Histogram(
+    "metrics_render_duration_seconds",
+    "Time to serialize (and gzip) the Prometheus exposition",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+METRICS_CACHE_REQUESTS = Counter(
+    "metrics_cache_requests_total",
+    "Scrapes served from the exposition cache",
+    ["result"],  # "hit", "miss" (rendered), or "coalesced" (joined an in-flight render)
+)
+
+# A.17: Quality score pillars and SLO alert state, set by the quality monitor
+QUALITY_SCORE = Gauge(
+    "quality_score",
+    "Composite risk-weighted quality score (0-1)",
+    multiprocess_mode="livemostrecent",   # latest computation of any live worker
+)
+
+QUALITY_PILLAR_SCORE = Gauge(
+    "quality_score_pillar",
+    "Quality score per pillar (0-1)",
+    ["pillar"],
+    multiprocess_mode="livemostrecent",
+)
+
+ERROR_BUDGET_CONSUMED = Gauge(
+    "error_budget_consumed_percent",
+    "Share of the 30-day error budget consumed",
+    multiprocess_mode="livemostrecent",
+)
+
+SLO_ALERT_ACTIVE = Gauge(
+    "slo_alert_active",
+    "1 while the SLO breach signal is raised",
+    ["signal"],
+    multiprocess_mode="livemax",
+)
+
 # A.17: SLO alert thresholds — defined once, referenced everywhere.
 SLO_P95_LATENCY_MS: float = 200.0   # alert if P95 exceeds this
 SLO_P99_LATENCY_MS: float = 500.0   # alert if P99 exceeds this
@@ -37,5 +268,143 @@ def record_error_class(status_code: int) -> None:
         ERROR_CLASS_COUNT.labels(error_class="5xx").inc()
 
 
-def get_metrics() -> Response:
-    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
\ No newline at end of file
+# Only live-gauge files name a pid still worth checking: once they are removed
+# the pid drops out of the scan, so a reused pid is checked again.
+_LIVE_GAUGE_FILE = re.compile(r"^gauge_live\w+_(\d+)\.db$")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def reap_dead_workers(path: str) -> list[int]:
+    """
+    Drop live-gauge files of worker processes that no longer exist.
+
+    uvicorn's supervisor has no child-exit hook to call mark_process_dead()
+    from, so dead workers are detected at scrape time instead. Counter and
+    histogram files are kept — removing them would make totals go backwards.
+    """
+    pids = {int(m.group(1)) for name in os.listdir(path) if (m := _LIVE_GAUGE_FILE.match(name))}
+    dead = [pid for pid in pids if pid != os.getpid() and not _pid_alive(pid)]
+    for pid in dead:
+        multiprocess.mark_process_dead(pid, path)  # type: ignore[no-untyped-call]
+    return dead
+
+
+def multiprocess_registry(path: str) -> CollectorRegistry:
+    """Registry that aggregates every worker's metric files under ``path``."""
+    reap_dead_workers(path)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=path)  # type: ignore[no-untyped-call]
+    return registry
+
+
+def render_exposition() -> bytes:
+    registry = REGISTRY if MULTIPROC_DIR is None else multiprocess_registry(MULTIPROC_DIR)
+    return generate_latest(registry)
+
+
+@dataclass(frozen=True)
+class Exposition:
+    body: bytes
+    gzipped: bytes
+    rendered_at: float
+
+
+class ExpositionCache:
+    """
+    A.17: Short-TTL cache of the rendered /metrics payload.
+
+    Rendering (registry walk + text serialization + gzip) runs on a worker
+    thread, never on the event loop. Concurrent scrapes that find the cache
+    stale share a single in-flight render instead of each serializing the
+    registry. A TTL of 0 disables caching but keeps the off-loop render.
+    """
+
+    def __init__(
+        self,
+        ttl_s: float = 5.0,
+        *,
+        render: Callable[[], bytes] = render_exposition,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl_s
+        self._render_fn = render
+        self._clock = clock
+        self._cached: Optional[Exposition] = None
+        self._inflight: Optional[asyncio.Future[Exposition]] = None
+
+    async def get(self) -> Exposition:
+        cached = self._cached
+        if cached is not None and self._clock() - cached.rendered_at < self._ttl:
+            METRICS_CACHE_REQUESTS.labels(result="hit").inc()
+            return cached
+        inflight = self._inflight
+        if inflight is not None and not inflight.done() and inflight.get_loop() is asyncio.get_running_loop():
+            METRICS_CACHE_REQUESTS.labels(result="coalesced").inc()
+            return await asyncio.shield(inflight)
+        METRICS_CACHE_REQUESTS.labels(result="miss").inc()
+        inflight = self._inflight = asyncio.ensure_future(self._refresh())
+        # shield: a disconnecting scraper must not cancel the shared render
+        return await asyncio.shield(inflight)
+
+    async def _refresh(self) -> Exposition:
+        try:
+            exposition = await asyncio.to_thread(self._render)
+            self._cached = exposition
+            return exposition
+        finally:
+            self._inflight = None
+
+    def _render(self) -> Exposition:
+        started = time.perf_counter()
+        body = self._render_fn()
+        gzipped = gzip.compress(body, compresslevel=6)
+        METRICS_RENDER_SECONDS.observe(time.perf_counter() - started)
+        return Exposition(body=body, gzipped=gzipped, rendered_at=self._clock())
+
+
+exposition_cache = ExpositionCache(ttl_s=settings.METRICS_CACHE_TTL_S)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows gzip (RFC 9110 §12.5.3).
+
+    "gzip" (or its alias "x-gzip") must appear as a whole coding with a
+    non-zero q-value; "*" covers it unless gzip is listed with q=0.
+    """
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    for coding in ("gzip", "x-gzip"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return qualities.get("*", 0.0) > 0
+
+
+async def get_metrics(accept_encoding: str = "") -> Response:
+    """Prometheus exposition — gzip-compressed when the scraper accepts it."""
+    exposition = await exposition_cache.get()
+    headers = {"Vary": "Accept-Encoding"}
+    if _accepts_gzip(accept_encoding):
+        headers["Content-Encoding"] = "gzip"
+        return Response(exposition.gzipped, media_type=CONTENT_TYPE_LATEST, headers=headers)
+    return Response(exposition.body, media_type=CONTENT_TYPE_LATEST, headers=headers)
\ No newline at end of file
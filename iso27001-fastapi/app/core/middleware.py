@@ -1,16 +1,25 @@
+import asyncio
 import uuid
 import time
+from typing import Optional
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.responses import Response
 from starlette.types import ASGIApp
 from fastapi import Request
 from fastapi.responses import JSONResponse
+from app.config.settings import settings
 from app.core.telemetry import request_id_ctx, logger
 from app.core.metrics import REQUEST_COUNT, REQUEST_LATENCY, record_error_class
+from app.core.query_metrics import query_monitor
 from app.core.rate_limiter import RedisRateLimiter
 from app.infrastructure.error_budget import error_budget
+from app.infrastructure.fleet_slo import fleet_slo
+from app.infrastructure.latency_sketch import latency_tracker
 from app.infrastructure.aws_telemetry import cw_emitter, xray
 
+# Route label shared by every request that matched no route (404 scans)
+UNMATCHED_ROUTE = "<unmatched>"
+
 
 class CorrelationIdMiddleware(BaseHTTPMiddleware):
     """
@@ -24,29 +33,87 @@ class CorrelationIdMiddleware(BaseHTTPMiddleware):
         request_id_ctx.set(request_id)
         request.state.request_id = request_id
 
-        # X-Ray trace context (no-op when header is absent)
+        # X-Ray trace context (no-op when header is absent); sampled requests get a segment
         trace_id = xray.extract_trace_id(dict(request.headers))
+        trace_header = xray.parse_header(request.headers.get(xray.HEADER))
+        sampled_flag = trace_header.get("Sampled")
+        segment = xray.begin_segment(
+            settings.APP_NAME,
+            trace_header.get("Root"),
+            parent_id=trace_header.get("Parent"),
+            sampled=None if sampled_flag not in ("0", "1") else sampled_flag == "1",
+        )
+        if segment is not None:
+            trace_id = segment.trace_id
+            segment.http = {"request": {"method": request.method, "url": request.url.path}}
         request.state.trace_id = trace_id
 
         start = time.perf_counter()
+        query_token = query_monitor.begin_request()
 
-        # Log request start
+        # Log request start (buffered under the correlation ID when tail sampling is on)
+        logger.begin_request(method=request.method, path=request.url.path)
         logger.info("request.started", method=request.method, path=request.url.path)
 
-        response = await call_next(request)
+        response: Optional[Response] = None
+        failed_status = 500
+        try:
+            response = await call_next(request)
+        except asyncio.CancelledError:
+            failed_status = 499   # client disconnected mid-request
+            raise
+        finally:
+            duration_s = time.perf_counter() - start
+            duration_ms = round(duration_s * 1000, 2)
+            route = self._route(request)
+            # Per-request state (query stats, log buffer, X-Ray segment) is
+            # released on every exit, cancellation (a BaseException) included
+            queries = query_monitor.end_request(query_token, route=route)
+            if response is None:
+                logger.end_request(status_code=failed_status, duration_ms=duration_ms)
+                xray.end_segment(status_code=failed_status)
 
-        duration_s = time.perf_counter() - start
-        duration_ms = round(duration_s * 1000, 2)
+        try:
+            self._observe(request, response, route, duration_s, duration_ms, request_id, trace_id)
+            if segment is not None:
+                segment.annotations["route"] = route
+            # Log request completion
+            logger.info(
+                "request.completed",
+                status_code=response.status_code,
+                duration_ms=duration_ms,
+                db_queries=queries.count,
+                db_ms=round(queries.total_ms, 2),
+            )
+        finally:
+            xray.end_segment(status_code=response.status_code)
+            logger.end_request(status_code=response.status_code, duration_ms=duration_ms)
+        return response
 
+    @staticmethod
+    def _observe(
+        request: Request,
+        response: Response,
+        route: str,
+        duration_s: float,
+        duration_ms: float,
+        request_id: str,
+        trace_id: Optional[str],
+    ) -> None:
+        """Record a completed request's metrics and set its correlation headers."""
         # Prometheus metrics
         REQUEST_COUNT.labels(method=request.method, endpoint=request.url.path, status_code=response.status_code).inc()
         REQUEST_LATENCY.labels(method=request.method, endpoint=request.url.path).observe(duration_s)
 
+        # A.17: Rolling quantile sketches — live p95/p99 for SLO evaluation
+        latency_tracker.record(route, duration_ms)
+
         # A.17: 4xx/5xx separation — record error class for alert-level visibility
         record_error_class(response.status_code)
 
         # A.17: Record in error budget (5xx responses consume budget; 4xx tracked separately)
-        error_budget.record(status_code=response.status_code)
+        error_budget.record(status_code=response.status_code, route=route)
+        fleet_slo.record(response.status_code, duration_ms)   # local delta; flushed to Redis off-path
 
         # CloudWatch custom metrics (no-op when boto3 is absent)
         cw_emitter.emit_request(
@@ -62,9 +129,31 @@ class CorrelationIdMiddleware(BaseHTTPMiddleware):
         if trace_id:
             response.headers["X-Amzn-Trace-Id"] = trace_id
 
-        # Log request completion
-        logger.info("request.completed", status_code=response.status_code, duration_ms=duration_ms)
-        return response
+    @staticmethod
+    def _route(request: Request) -> str:
+        """
+        Full route template (e.g. /api/v1/users/{user_id}) rather than the raw
+        path, so per-route metrics have a bounded label set. Requests that
+        matched no route all share UNMATCHED_ROUTE.
+        """
+        scope = request.scope
+        route = scope.get("route")
+        if route is None and "endpoint" in scope:
+            # plain Starlette routes (add_route) record only their endpoint
+            route = next(
+                (r for r in getattr(scope.get("router"), "routes", ())
+                 if getattr(r, "endpoint", None) is scope["endpoint"]),
+                None,
+            )
+        if route is None:
+            return UNMATCHED_ROUTE
+        # FastAPI includes routers lazily: the route keeps its router-relative
+        # path and the prefixed template is on the effective route context
+        effective = scope.get("fastapi", {}).get("effective_route_context")
+        template = getattr(effective, "path_format", "") or getattr(route, "path", "")
+        if not template:
+            return UNMATCHED_ROUTE
+        return str(scope.get("root_path", "")) + template   # mount prefix, if any
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -0,0 +1,111 @@
+"""
+A.14: Opaque, signed keyset-pagination cursors.
+
+A cursor encodes a position in the (created_at, id) ordering plus a
+direction and is signed with HMAC-SHA256 under a key derived from
+JWT_SECRET_KEY, so clients cannot forge positions or probe the ordering
+columns; a tampered or malformed cursor is a 400 VALIDATION_ERROR.
+
+Seeking from a cursor is an index range scan, so every page costs the
+same regardless of how deep into the collection it lies (OFFSET pages
+scan and discard every preceding row).
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+from datetime import datetime, timezone
+from typing import Optional
+
+from starlette.requests import Request
+
+from app.core.exceptions import ValidationError
+from app.core.responses import CursorMeta, PaginationLinks
+from app.domain.users.repository import Keyset, KeysetPage
+
+NEXT = "next"
+PREV = "prev"
+_VERSION = 1
+_KEY_CONTEXT = b"pagination-cursor/v1"   # domain separation from JWT signing
+_MAC_BYTES = 16
+
+
+def _key() -> bytes:
+    from app.config.settings import settings
+    return hmac.new(settings.JWT_SECRET_KEY.encode(), _KEY_CONTEXT, hashlib.sha256).digest()
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # Stored timestamps are naive UTC; normalise so a round trip compares equal
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def encode_cursor(key: Keyset, direction: str) -> str:
+    created_at, row_id = key
+    payload = json.dumps(
+        {"v": _VERSION, "d": direction, "t": _naive_utc(created_at).isoformat(), "i": row_id},
+        separators=(",", ":"),
+    ).encode()
+    mac = hmac.new(_key(), payload, hashlib.sha256).digest()[:_MAC_BYTES]
+    return f"{_b64encode(payload)}.{_b64encode(mac)}"
+
+
+def _invalid() -> ValidationError:
+    return ValidationError(
+        "Invalid pagination cursor",
+        details=[{"field": "cursor", "message": "Cursor is malformed or has been tampered with", "code": "INVALID_CURSOR"}],
+    )
+
+
+def decode_cursor(cursor: str) -> tuple[str, Keyset]:
+    """Return (direction, key) for a cursor produced by encode_cursor()."""
+    try:
+        body, sig = cursor.split(".", 1)
+        payload, mac = _b64decode(body), _b64decode(sig)
+    except (ValueError, binascii.Error):
+        raise _invalid() from None
+    expected = hmac.new(_key(), payload, hashlib.sha256).digest()[:_MAC_BYTES]
+    if not hmac.compare_digest(mac, expected):
+        raise _invalid()
+    try:
+        data = json.loads(payload)
+        direction, key = data["d"], (datetime.fromisoformat(data["t"]), str(data["i"]))
+    except (ValueError, KeyError, TypeError):
+        raise _invalid() from None
+    if data.get("v") != _VERSION or direction not in (NEXT, PREV):
+        raise _invalid()
+    return direction, key
+
+
+def cursor_bounds(cursor: Optional[str]) -> tuple[Optional[Keyset], Optional[Keyset]]:
+    """(after, before) repository bounds for an optional request cursor."""
+    if cursor is None:
+        return None, None
+    direction, key = decode_cursor(cursor)
+    return (key, None) if direction == NEXT else (None, key)
+
+
+def cursor_meta(request: Request, page: KeysetPage, per_page: int) -> tuple[CursorMeta, PaginationLinks]:
+    """Cursors and next/prev links for ``page``; links keep the request's other query params."""
+    next_cursor = encode_cursor(page.next_key, NEXT) if page.next_key else None
+    prev_cursor = encode_cursor(page.prev_key, PREV) if page.prev_key else None
+    base = request.url.remove_query_params("skip")
+
+    def link(token: Optional[str]) -> Optional[str]:
+        return str(base.include_query_params(cursor=token)) if token else None
+
+    return (
+        CursorMeta(per_page=per_page, next_cursor=next_cursor, prev_cursor=prev_cursor),
+        PaginationLinks(next=link(next_cursor), prev=link(prev_cursor)),
+    )
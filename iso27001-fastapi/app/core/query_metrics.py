@@ -0,0 +1,177 @@
+"""
+A.12: SQL query instrumentation.
+
+Hooks SQLAlchemy cursor events on an engine and attributes every statement to
+the request that issued it, through a per-request QueryStats object carried in
+a context variable (the object is shared, not copied, with route threadpool
+workers, so sync handlers are counted too).
+
+At the end of a request the middleware reports the query count and time per
+route template, and flags statements repeated N+1-style. Slow statements are
+logged with every bound parameter value masked.
+"""
+import contextvars
+import threading
+import time
+import weakref
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from app.config.settings import settings
+from app.core.metrics import (
+    DB_N_PLUS_ONE_SUSPECTS,
+    DB_QUERIES_PER_REQUEST,
+    DB_SLOW_QUERIES,
+    DB_TIME_PER_REQUEST,
+)
+from app.core.redaction import REDACTED
+from app.core.telemetry import logger
+
+
+class QueryStats:
+    """Statements executed within one request (or one assert_max_queries block)."""
+
+    __slots__ = ("count", "total_ms", "statements", "_lock")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.statements: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, statement: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Statements executed at least ``threshold`` times — N+1 suspects."""
+        return {sql: n for sql, n in self.statements.items() if n >= threshold}
+
+
+def _mask_params(params: Any) -> object:
+    """Keep the parameter shape (names / arity) but never the values."""
+    if isinstance(params, dict):
+        return {key: REDACTED for key in params}
+    if isinstance(params, (list, tuple)):
+        if params and isinstance(params[0], (dict, list, tuple)):   # executemany
+            return {"rows": len(params)}
+        return [REDACTED] * len(params)
+    return REDACTED
+
+
+_request_stats: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar(
+    "query_stats", default=None
+)
+
+
+class QueryMonitor:
+    """Per-request SQL statement accounting fed by engine events."""
+
+    def __init__(self, *, slow_query_ms: float = 100.0, n_plus_one_threshold: int = 3) -> None:
+        self.slow_query_ms = slow_query_ms
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._budgets: list[QueryStats] = []
+        self._budgets_lock = threading.Lock()
+        self._instrumented: weakref.WeakSet[Any] = weakref.WeakSet()
+
+    # ── Request scope ──
+
+    def begin_request(self) -> contextvars.Token[Optional[QueryStats]]:
+        """Start counting statements for the current request."""
+        return _request_stats.set(QueryStats())
+
+    def end_request(self, token: contextvars.Token[Optional[QueryStats]], *, route: str) -> QueryStats:
+        """Stop counting, export per-route histograms and flag N+1 suspects."""
+        stats = _request_stats.get() or QueryStats()
+        _request_stats.reset(token)
+        DB_QUERIES_PER_REQUEST.labels(endpoint=route).observe(stats.count)
+        DB_TIME_PER_REQUEST.labels(endpoint=route).observe(stats.total_ms / 1000)
+        suspects = stats.repeated(self.n_plus_one_threshold)
+        if suspects:
+            DB_N_PLUS_ONE_SUSPECTS.labels(endpoint=route).inc()
+            for statement, executions in suspects.items():
+                logger.warning("db.n_plus_one_suspect", route=route, statement=statement, executions=executions)
+        return stats
+
+    def current(self) -> Optional[QueryStats]:
+        return _request_stats.get()
+
+    # ── Engine events ──
+
+    def record(self, statement: str, params: Any, elapsed_ms: float) -> None:
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.add(statement, elapsed_ms)
+        if self._budgets:
+            with self._budgets_lock:
+                for budget in self._budgets:
+                    budget.add(statement, elapsed_ms)
+        if elapsed_ms >= self.slow_query_ms:
+            DB_SLOW_QUERIES.inc()
+            logger.warning(
+                "db.slow_query",
+                statement=statement,
+                params=_mask_params(params),
+                duration_ms=round(elapsed_ms, 2),
+            )
+
+    def instrument_engine(self, engine: Any) -> None:
+        """Time every statement executed on ``engine`` (idempotent per engine)."""
+        from sqlalchemy import event
+
+        if engine in self._instrumented:
+            return
+        self._instrumented.add(engine)
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn: Any, cursor: Any, statement: str, params: Any, context: Any, executemany: bool) -> None:
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn: Any, cursor: Any, statement: str, params: Any, context: Any, executemany: bool) -> None:
+            started = conn.info.get("query_started")
+            if started:
+                self.record(statement, params, (time.perf_counter() - started.pop()) * 1000)
+
+        @event.listens_for(engine, "handle_error")
+        def _error(exception_context: Any) -> None:
+            conn = exception_context.connection
+            started = conn.info.get("query_started") if conn is not None else None
+            if started:
+                started.pop()
+
+    # ── Test support ──
+
+    @contextmanager
+    def assert_max_queries(self, limit: int) -> Iterator[QueryStats]:
+        """
+        Fail if more than ``limit`` statements run inside the block.
+
+        Counts every statement on instrumented engines regardless of which
+        thread or request issued it, so it works around TestClient calls:
+
+            with query_monitor.assert_max_queries(3):
+                client.put(f"/api/v1/users/{user_id}", json=payload)
+        """
+        budget = QueryStats()
+        with self._budgets_lock:
+            self._budgets.append(budget)
+        try:
+            yield budget
+        finally:
+            with self._budgets_lock:
+                self._budgets.remove(budget)
+        if budget.count > limit:
+            executed = "\n".join(f"  {n}x {sql}" for sql, n in budget.statements.most_common())
+            raise AssertionError(f"expected at most {limit} queries, {budget.count} executed:\n{executed}")
+
+
+# Module-level singleton — thresholds resolved from settings at import time
+query_monitor = QueryMonitor(
+    slow_query_ms=settings.DB_SLOW_QUERY_MS,
+    n_plus_one_threshold=settings.DB_N_PLUS_ONE_THRESHOLD,
+)
+assert_max_queries = query_monitor.assert_max_queries
@@ -12,6 +12,7 @@ Falls back to an in-process sliding window when Redis is unavailable.
 import time
 from typing import Any
 from fastapi import Request, HTTPException, status
+from app.infrastructure.aws_telemetry import xray
 
 _LIMITS: dict[str, int] = {
     "auth":   10,
@@ -93,7 +94,8 @@ class RedisRateLimiter:
 
         r = _redis_client()
         if r is not None:
-            allowed = int(r.eval(_LUA_SCRIPT, 1, key, limit, now, window)) == 0
+            with xray.subsegment("redis", namespace="remote"):
+                allowed = int(r.eval(_LUA_SCRIPT, 1, key, limit, now, window)) == 0
         else:
             allowed = _local_check(key, limit, window)
 
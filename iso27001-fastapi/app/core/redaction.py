@@ -0,0 +1,93 @@
+"""
+A.12: Sensitive-field redaction for structured log contexts.
+
+The matcher is built once from the field list; key normalisation results are
+memoised in a bounded dict, so each distinct key is lower-cased only once per
+process. Traversal covers dicts, lists and tuples at any depth, and containers
+are copied only on the path to a value that actually gets redacted — clean
+contexts are returned as-is without allocating.
+
+With ``Redactor(..., snapshot=True)`` nested dicts and lists are always copied as well, so
+an entry encoded later on another thread (async writer, tail sampler) is not
+affected by the caller mutating its context after the log call. Flat
+contexts of scalars still allocate nothing.
+"""
+from typing import Iterable, TypeVar
+
+REDACTED = "[REDACTED]"
+
+_KEY_CACHE_SIZE = 4096   # distinct log-context keys are few; bound it anyway
+_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+K = TypeVar("K")
+
+
+class Redactor:
+    """Copy-on-write redaction of sensitive keys in nested log contexts."""
+
+    def __init__(self, fields: Iterable[str], *, snapshot: bool = False) -> None:
+        self._fields = frozenset(f.lower() for f in fields)
+        self._snapshot = snapshot
+        self._key_cache: dict[object, bool] = {}
+
+    def redact(self, value: object) -> object:
+        """Return ``value`` with sensitive keys masked (same object if clean)."""
+        if isinstance(value, dict):
+            return self.redact_dict(value)
+        if isinstance(value, (list, tuple)):
+            return self._redact_sequence(value)
+        return value
+
+    def redact_dict(self, data: dict[K, object]) -> dict[K, object]:
+        """Dict-typed variant of redact() for top-level log contexts."""
+        cache = self._key_cache
+        out: dict[K, object] | None = None
+        for key, item in data.items():
+            sensitive = cache.get(key)
+            if sensitive is None:
+                sensitive = self._classify(key)
+            if sensitive:
+                new: object = REDACTED
+            elif type(item) in _SCALARS:
+                continue
+            elif isinstance(item, dict):
+                new = self._nested_dict(item)
+            elif isinstance(item, (list, tuple)):
+                new = self._redact_sequence(item)
+            else:
+                continue
+            if new is not item:
+                if out is None:
+                    out = dict(data)
+                out[key] = new
+        return data if out is None else out
+
+    def _classify(self, key: object) -> bool:
+        sensitive = isinstance(key, str) and key.lower() in self._fields
+        if len(self._key_cache) >= _KEY_CACHE_SIZE:
+            self._key_cache.clear()
+        self._key_cache[key] = sensitive
+        return sensitive
+
+    def _nested_dict(self, data: dict[K, object]) -> dict[K, object]:
+        out = self.redact_dict(data)
+        return dict(out) if out is data and self._snapshot else out
+
+    def _redact_sequence(self, seq: list[object] | tuple[object, ...]) -> object:
+        out: list[object] | None = None
+        for i, item in enumerate(seq):
+            if type(item) in _SCALARS:
+                continue
+            if isinstance(item, dict):
+                new: object = self._nested_dict(item)
+            elif isinstance(item, (list, tuple)):
+                new = self._redact_sequence(item)
+            else:
+                continue
+            if new is not item:
+                if out is None:
+                    out = list(seq)
+                out[i] = new
+        if out is None:
+            return list(seq) if self._snapshot and isinstance(seq, list) else seq
+        return tuple(out) if isinstance(seq, tuple) else out
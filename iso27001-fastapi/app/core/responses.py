@@ -52,11 +52,27 @@ class PaginatedMeta(BaseModel):
     total_pages: int
 
 
+class CursorMeta(BaseModel):
+    """Keyset pagination metadata — cursors are opaque and signed."""
+
+    per_page: int
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+class PaginationLinks(BaseModel):
+    """Absolute URLs of the neighbouring pages (None at either end)."""
+
+    next: str | None = None
+    prev: str | None = None
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     """Paginated list response."""
 
     data: list[T]
-    meta: PaginatedMeta
+    meta: PaginatedMeta | CursorMeta
+    links: PaginationLinks | None = None
 
 
 def create_error_response(
@@ -0,0 +1,57 @@
+"""
+A.17: High-concurrency SQLite for single-node / edge deployments (SQLITE_TUNED).
+
+Every new connection to a file database gets:
+
+  journal_mode=WAL      readers never block the writer (or each other); one
+                        writer at a time still, see write_queue
+  synchronous=NORMAL    fsync at checkpoints, not every commit — safe against
+                        application crashes; a power loss may drop the last
+                        few commits
+  busy_timeout          a writer waits for the lock instead of failing
+                        immediately with "database is locked"
+  cache_size            page cache per connection (negative = KiB)
+  mmap_size             reads served from a memory map instead of read()
+
+In-memory databases have no journal to tune and are left alone.
+"""
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+
+def is_file_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (None, "", ":memory:")
+
+
+def sqlite_pragmas(*, busy_timeout_ms: int, cache_size_kib: int, mmap_size: int) -> list[str]:
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={int(busy_timeout_ms)}",
+        f"PRAGMA cache_size=-{int(cache_size_kib)}",
+        f"PRAGMA mmap_size={int(mmap_size)}",
+    ]
+
+
+def tune_sqlite(engine: Engine, pragmas: list[str]) -> None:
+    """Apply ``pragmas`` to every connection ``engine`` opens (pass AsyncEngine.sync_engine for async)."""
+    @event.listens_for(engine, "connect")
+    def _apply(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def configured_pragmas() -> list[str]:
+    from app.config.settings import settings
+    return sqlite_pragmas(
+        busy_timeout_ms=settings.SQLITE_BUSY_TIMEOUT_MS,
+        cache_size_kib=settings.SQLITE_CACHE_SIZE_KIB,
+        mmap_size=settings.SQLITE_MMAP_SIZE_BYTES,
+    )
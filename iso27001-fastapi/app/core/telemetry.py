@@ -1,41 +1,303 @@
+import atexit
 import json
+import queue
+import random
+import sys
 import logging
+import threading
 import contextvars
+import itertools
 from datetime import datetime, timezone
+from typing import Callable, Optional, TextIO
 from app.config.settings import settings
+from app.core.metrics import LOG_ENTRIES_DROPPED, SLO_P95_LATENCY_MS
+from app.core.redaction import Redactor
+
+try:  # optional fast encoder — falls back to the stdlib json module
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    _orjson = None  # type: ignore[assignment]
 
 # Context variable for Correlation ID
 request_id_ctx: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="system")
 
+# Tail-sampling buffer of the current request. Keyed by a server-generated
+# id: the correlation ID is client-supplied (X-Request-ID) and two concurrent
+# requests may send the same one
+_log_buffer_ctx: contextvars.ContextVar[int] = contextvars.ContextVar("log_buffer", default=0)
+_log_buffer_ids = itertools.count(1)
+
 def get_correlation_id() -> str:
     return request_id_ctx.get()
 
+def encode_entry(entry: dict[str, object]) -> str:
+    """Serialize a log entry to one JSON line (orjson when installed)."""
+    if _orjson is not None:
+        return _orjson.dumps(entry, default=str).decode("utf-8")
+    return json.dumps(entry, default=str)
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_DEBUG_FIRST = "drop-debug-first"
+
+class AsyncLogWriter:
+    """
+    A.12: Non-blocking log sink — bounded queue drained by a writer thread.
+
+    Request handlers only enqueue the entry dict; JSON encoding and the stream
+    write happen on the writer thread, in batches of up to ``batch_size``.
+
+    Overflow policy when the queue backs up:
+      - "block"            : every entry waits for space (no loss)
+      - "drop-debug-first" : DEBUG entries are dropped once the queue is 80%
+                             full, INFO once it is full; WARNING/ERROR and
+                             audit entries always wait for space
+    """
+
+    _HIGH_WATER = 0.8
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        *,
+        maxsize: int = 10000,
+        batch_size: int = 256,
+        overflow: str = OVERFLOW_DROP_DEBUG_FIRST,
+    ) -> None:
+        if overflow not in (OVERFLOW_BLOCK, OVERFLOW_DROP_DEBUG_FIRST):
+            raise ValueError(f"unknown overflow policy: {overflow!r}")
+        self._stream = stream
+        self._queue: queue.Queue[Optional[dict[str, object]]] = queue.Queue(maxsize=maxsize)
+        self._high_water = max(1, int(maxsize * self._HIGH_WATER))
+        self._batch_size = batch_size
+        self._overflow = overflow
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._dropped_lock = threading.Lock()
+        self._dropped = 0
+
+    @property
+    def dropped(self) -> int:
+        """Entries discarded under back-pressure (also ``log_entries_dropped_total``)."""
+        with self._dropped_lock:
+            return self._dropped
+
+    def submit(self, levelno: int, entry: dict[str, object], *, essential: bool = False) -> None:
+        """Enqueue an entry; may drop low-severity entries under back-pressure."""
+        if self._thread is None:
+            self._start()
+        if self._overflow == OVERFLOW_DROP_DEBUG_FIRST and not essential and levelno < logging.WARNING:
+            size = self._queue.qsize()
+            if levelno <= logging.DEBUG and size >= self._high_water:
+                self._drop(levelno)
+                return
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                self._drop(levelno)
+            return
+        self._queue.put(entry)
+
+    def _drop(self, levelno: int) -> None:
+        with self._dropped_lock:   # submit() runs on request threads and the event loop
+            self._dropped += 1
+        LOG_ENTRIES_DROPPED.labels(level=logging.getLevelName(levelno)).inc()
+
+    def flush(self) -> None:
+        """Block until every entry submitted so far has been written."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Drain the queue and stop the writer thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            entries = [e for e in batch if e is not None]
+            try:
+                if entries:
+                    stream = self._stream or sys.stderr
+                    stream.write("\n".join(encode_entry(e) for e in entries) + "\n")
+                    stream.flush()
+            except Exception:  # noqa: BLE001
+                # Logging must never take the process down; the batch is lost
+                pass
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(entries) != len(batch):
+                return
+
+class _StatsCell:
+    """One thread's log-entry counters (written only by ``owner``)."""
+    __slots__ = ("owner", "built", "correlated")
+
+    def __init__(self, owner: threading.Thread) -> None:
+        self.owner = owner
+        self.built = 0
+        self.correlated = 0
+
+class _RequestLogBuffer:
+    __slots__ = ("method", "path", "entries", "keep", "overflowed")
+
+    def __init__(self, method: str, path: str) -> None:
+        self.method = method
+        self.path = path
+        self.entries: list[tuple[int, dict[str, object]]] = []
+        self.keep = False
+        self.overflowed = 0
+
+class TailSampler:
+    """
+    A.12: Tail-based sampling of per-request log lines.
+
+    Lines logged while a request is in flight are buffered under a
+    per-request key issued by StructuredLogger.begin_request. When the request finishes, the buffer is released in full
+    if the request failed (5xx), logged a WARNING or above, was slower than
+    ``slow_ms``, or falls in the random ``sample_rate`` share; otherwise the
+    lines collapse into a single ``request.summary`` entry.
+
+    A WARNING/ERROR line releases the buffer immediately and switches the
+    request to pass-through, so problems are never held back.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate: float = 0.01,
+        slow_ms: float = SLO_P95_LATENCY_MS,
+        max_buffered: int = 100,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self._sample_rate = sample_rate
+        self._slow_ms = slow_ms
+        self._max_buffered = max_buffered
+        self._rng = rng
+        self._buffers: dict[int, _RequestLogBuffer] = {}
+        self._lock = threading.Lock()
+
+    def begin(self, key: int, method: str, path: str) -> None:
+        with self._lock:
+            self._buffers[key] = _RequestLogBuffer(method, path)
+
+    def offer(
+        self, key: int, levelno: int, entry: dict[str, object]
+    ) -> Optional[list[tuple[int, dict[str, object]]]]:
+        """
+        Buffer ``entry`` for a tracked request.
+
+        Returns None when the entry should be written straight away, or the
+        list of entries to write now (empty while the request is buffered).
+        """
+        with self._lock:
+            buf = self._buffers.get(key)
+            if buf is None or buf.keep:
+                return None
+            if levelno >= logging.WARNING:
+                buf.keep = True
+                released, buf.entries = buf.entries, []
+                released.append((levelno, entry))
+                return released
+            if len(buf.entries) < self._max_buffered:
+                buf.entries.append((levelno, entry))
+            else:
+                buf.overflowed += 1
+            return []
+
+    def finish(
+        self, key: int, status_code: int, duration_ms: float
+    ) -> tuple[list[tuple[int, dict[str, object]]], Optional[dict[str, object]]]:
+        """
+        Close the buffer for ``key``.
+
+        Returns (entries to write, summary context) — the summary context is
+        None when the request is kept in full.
+        """
+        with self._lock:
+            buf = self._buffers.pop(key, None)
+        if buf is None:
+            return [], None
+        if (
+            buf.keep
+            or status_code >= 500
+            or duration_ms > self._slow_ms
+            or self._rng() < self._sample_rate
+        ):
+            return buf.entries, None
+        return [], {
+            "method": buf.method,
+            "path": buf.path,
+            "status_code": status_code,
+            "duration_ms": duration_ms,
+            "sampled_out_lines": len(buf.entries) + buf.overflowed,
+        }
+
 class StructuredLogger:
     """
     A.12: JSON structured logger with automatic sensitive data redaction.
     Every log entry includes correlation ID for request tracing.
+
+    With an AsyncLogWriter the entry dict is handed to the writer thread;
+    otherwise it is encoded and written inline through the stdlib logger.
+    Entries are only built when their level is enabled. With a TailSampler,
+    request-scoped lines are held until end_request() decides their fate.
     """
     REDACTED_FIELDS = frozenset({
         "password", "token", "secret", "authorization", "api_key",
         "credit_card", "ssn", "refresh_token", "cookie",
     })
 
-    def __init__(self, name: str) -> None:
+    def __init__(
+        self,
+        name: str,
+        writer: Optional[AsyncLogWriter] = None,
+        sampler: Optional[TailSampler] = None,
+    ) -> None:
         self._logger = logging.getLogger(name)
-        handler = logging.StreamHandler()
-        self._logger.addHandler(handler)
+        self._writer = writer
+        self._sampler = sampler
+        # Per-thread counters: the hot path bumps its own thread's cell without
+        # a lock; correlation_stats() sums them. The lock guards the cell list
+        # and the totals folded in from threads that have exited
+        self._stats_local = threading.local()
+        self._stats_cells: list[_StatsCell] = []
+        self._stats_retired = (0, 0)   # (built, correlated)
+        self._stats_lock = threading.Lock()
+        if writer is None:
+            handler = logging.StreamHandler()
+            self._logger.addHandler(handler)
         self._logger.setLevel(logging.DEBUG if settings.APP_DEBUG else logging.INFO)
 
+    _redactor = Redactor(REDACTED_FIELDS)
+    # Entries encoded later on another thread must not share the caller's containers
+    _snapshot_redactor = Redactor(REDACTED_FIELDS, snapshot=True)
+
     def _redact(self, data: dict[str, object]) -> dict[str, object]:
-        """A.12: Automatically strip sensitive fields. Never manual."""
-        return {
-            k: "[REDACTED]" if k.lower() in self.REDACTED_FIELDS
-            else self._redact(v) if isinstance(v, dict)
-            else v
-            for k, v in data.items()
-        }
+        """A.12: Automatically strip sensitive fields (nested dicts, lists, tuples). Never manual."""
+        deferred = self._writer is not None or self._sampler is not None
+        return (self._snapshot_redactor if deferred else self._redactor).redact_dict(data)
 
     def _entry(self, level: str, message: str, **ctx: object) -> dict[str, object]:
+        request_id = get_correlation_id()
+        cell = self._stats_cell()
+        cell.built += 1
+        if request_id != "system":
+            cell.correlated += 1
         return {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "level": level,
@@ -43,26 +305,118 @@ class StructuredLogger:
             "service": settings.APP_NAME,
             "version": settings.APP_VERSION,
             "environment": settings.APP_ENV,
-            "request_id": get_correlation_id(),
+            "request_id": request_id,
             "context": self._redact(ctx) if ctx else None,
         }
 
+    def _stats_cell(self) -> _StatsCell:
+        cell: Optional[_StatsCell] = getattr(self._stats_local, "cell", None)
+        if cell is None:
+            self._prune_stats_cells()   # worker threads come and go (AnyIO retires idle ones)
+            cell = self._stats_local.cell = _StatsCell(threading.current_thread())
+            with self._stats_lock:
+                self._stats_cells.append(cell)
+        return cell
+
+    def _prune_stats_cells(self) -> None:
+        """Fold the cells of threads that have exited into the retired totals."""
+        with self._stats_lock:
+            dead = [c for c in self._stats_cells if not c.owner.is_alive()]
+            if dead:
+                built, correlated = self._stats_retired
+                self._stats_retired = (
+                    built + sum(c.built for c in dead), correlated + sum(c.correlated for c in dead)
+                )
+                self._stats_cells = [c for c in self._stats_cells if c.owner.is_alive()]
+
+    def correlation_stats(self) -> tuple[int, int]:
+        """A.12: (entries carrying a request correlation ID, entries built) since start."""
+        self._prune_stats_cells()
+        with self._stats_lock:
+            built, correlated = self._stats_retired
+            cells = list(self._stats_cells)
+        return correlated + sum(c.correlated for c in cells), built + sum(c.built for c in cells)
+
+    def _emit(self, levelno: int, entry: dict[str, object], *, essential: bool = False) -> None:
+        if self._sampler is not None and not essential:
+            released = self._sampler.offer(_log_buffer_ctx.get(), levelno, entry)
+            if released is not None:
+                for released_levelno, released_entry in released:
+                    self._write(released_levelno, released_entry)
+                return
+        self._write(levelno, entry, essential=essential)
+
+    def _write(self, levelno: int, entry: dict[str, object], *, essential: bool = False) -> None:
+        if self._writer is not None:
+            self._writer.submit(levelno, entry, essential=essential)
+        else:
+            self._logger.log(levelno, encode_entry(entry))
+
+    def debug(self, msg: str, **ctx: object) -> None:
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._emit(logging.DEBUG, self._entry("DEBUG", msg, **ctx))
+
     def info(self, msg: str, **ctx: object) -> None:
-        self._logger.info(json.dumps(self._entry("INFO", msg, **ctx)))
+        if self._logger.isEnabledFor(logging.INFO):
+            self._emit(logging.INFO, self._entry("INFO", msg, **ctx))
 
     def warning(self, msg: str, **ctx: object) -> None:
-        self._logger.warning(json.dumps(self._entry("WARNING", msg, **ctx)))
+        if self._logger.isEnabledFor(logging.WARNING):
+            self._emit(logging.WARNING, self._entry("WARNING", msg, **ctx))
 
     def error(self, msg: str, **ctx: object) -> None:
-        self._logger.error(json.dumps(self._entry("ERROR", msg, **ctx)))
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._emit(logging.ERROR, self._entry("ERROR", msg, **ctx))
 
     def audit(self, action: str, user_id: str, **ctx: object) -> None:
-        """A.12: Immutable audit trail entry for compliance."""
-        self._logger.info(json.dumps(self._entry(
+        """A.12: Immutable audit trail entry for compliance — never dropped."""
+        self._emit(logging.INFO, self._entry(
             "AUDIT", f"audit.{action}",
             user_id=user_id, action=action,
             audited_at=datetime.now(timezone.utc).isoformat(),
             **ctx,
-        )))
+        ), essential=True)
+
+    def begin_request(self, *, method: str, path: str) -> None:
+        """Start buffering the current request's lines (sampling only)."""
+        if self._sampler is not None:
+            key = next(_log_buffer_ids)
+            _log_buffer_ctx.set(key)
+            self._sampler.begin(key, method, path)
+
+    def end_request(self, *, status_code: int, duration_ms: float) -> None:
+        """Release or collapse the current request's buffered lines."""
+        if self._sampler is None:
+            return
+        entries, summary = self._sampler.finish(_log_buffer_ctx.get(), status_code, duration_ms)
+        _log_buffer_ctx.set(0)
+        for levelno, entry in entries:
+            self._write(levelno, entry)
+        if summary is not None and self._logger.isEnabledFor(logging.INFO):
+            self._write(logging.INFO, self._entry("INFO", "request.summary", **summary))
+
+    def flush(self) -> None:
+        """Wait for queued entries to reach the stream (no-op when synchronous)."""
+        if self._writer is not None:
+            self._writer.flush()
+
+def _build_writer() -> Optional[AsyncLogWriter]:
+    if not settings.LOG_ASYNC:
+        return None
+    writer = AsyncLogWriter(
+        maxsize=settings.LOG_QUEUE_MAXSIZE,
+        batch_size=settings.LOG_BATCH_SIZE,
+        overflow=settings.LOG_OVERFLOW_POLICY,
+    )
+    atexit.register(writer.close)
+    return writer
+
+def _build_sampler() -> Optional[TailSampler]:
+    if not settings.LOG_SAMPLING_ENABLED:
+        return None
+    return TailSampler(
+        sample_rate=settings.LOG_SAMPLING_RATE,
+        max_buffered=settings.LOG_SAMPLING_MAX_BUFFERED,
+    )
 
-logger = StructuredLogger("api")
\ No newline at end of file
+logger = StructuredLogger("api", writer=_build_writer(), sampler=_build_sampler())
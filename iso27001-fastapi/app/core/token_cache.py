@@ -0,0 +1,97 @@
+"""
+A.9 / A.17: Cache of verified access-token payloads.
+
+A client presents the same access token on every request for its whole
+lifetime; decode_token re-runs the HMAC verification and the TokenPayload
+validation each time. This cache keys the validated payload by the
+SHA-256 of the token string (the token itself is never stored) and returns
+it until the token's exp, after which the entry is dropped and the token
+is decoded again — and rejected as expired. Only successful decodes are
+cached; the expected typ is still checked on every hit.
+
+The cache replaces signature and expiry checks only. Everything get_current_user
+does after decoding — the revocation list, the principal cache / is_active
+lookup — runs on every request, hit or miss, so a revoked or deactivated
+user's cached token is still refused.
+
+  jwt_decode_cache_lookups_total{result}   hit | miss
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+import jwt
+
+from app.config.security import TokenPayload, decode_token
+from app.core.metrics import JWT_DECODE_CACHE_LOOKUPS
+
+_HITS = JWT_DECODE_CACHE_LOOKUPS.labels(result="hit")   # resolved once — this is the hot path
+_MISSES = JWT_DECODE_CACHE_LOOKUPS.labels(result="miss")
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of token hash → verified payload, valid until exp."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 10_000,
+        decode: Callable[[str], TokenPayload] = decode_token,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._max = max_entries
+        self._decode = decode
+        self._clock = clock
+        self._entries: OrderedDict[bytes, TokenPayload] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def decode(self, token: str, expected_typ: str | None = None) -> TokenPayload:
+        """decode_token, served from the cache while the token is unexpired."""
+        if self._max <= 0:
+            return self._checked(self._decode(token), expected_typ)
+        key = hashlib.sha256(token.encode()).digest()
+        now = self._clock()
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                if now < payload.exp:
+                    self._entries.move_to_end(key)
+                else:
+                    del self._entries[key]
+                    payload = None
+        if payload is not None:
+            _HITS.inc()
+            return self._checked(payload, expected_typ)
+
+        _MISSES.inc()
+        payload = self._decode(token)   # raises on a bad signature or an expired token
+        with self._lock:
+            self._entries[key] = payload
+            while len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+        return self._checked(payload, expected_typ)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _checked(payload: TokenPayload, expected_typ: str | None) -> TokenPayload:
+        if expected_typ is not None and payload.typ != expected_typ:
+            raise jwt.InvalidTokenError(
+                f"unexpected token typ: got {payload.typ!r}, expected {expected_typ!r}"
+            )
+        return payload
+
+
+def _build_token_cache() -> VerifiedTokenCache:
+    from app.config.settings import settings
+    return VerifiedTokenCache(max_entries=settings.JWT_DECODE_CACHE_SIZE)
+
+
+# Module-level singleton — shared by every request in this process
+token_cache = _build_token_cache()
@@ -0,0 +1,132 @@
+"""
+A.17: Single-writer queue — one thread owns every queued write transaction.
+
+SQLite allows one writer at a time. Request threads that each open their
+own write transaction queue up on the database lock (or fail with
+"database is locked"); routing writes through one thread turns that
+contention into a plain in-process queue, and lets the writer group
+several jobs into one transaction — one commit (one WAL fsync at most)
+per batch instead of per write. Reads keep running concurrently on the
+request sessions.
+
+A job is a callable taking the writer's Session; ``submit()`` returns a
+Future resolved after the batch commits. If any job in a batch fails, the
+batch is rolled back and its jobs are retried one per transaction, so a
+bad job fails alone. Callers that need durability wait on the Future —
+``call()`` does so with a timeout, cancelling the job if it has not started
+(a job already running may still commit). Jobs still queued when the
+process is killed are lost. Objects a job returns outlive the writer's
+session, so its factory should not expire them on commit (SessionLocal
+doesn't).
+
+Only writes submitted here are serialised — audit rows, and user writes
+from repositories given database.queued_writer(). Other connections still
+take the SQLite write lock themselves and wait for it up to busy_timeout.
+
+  db_write_queue_depth        jobs waiting for the writer
+  db_write_batch_size         jobs committed per transaction
+"""
+from __future__ import annotations
+
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.metrics import DB_WRITE_BATCH_SIZE, DB_WRITE_QUEUE_DEPTH
+
+
+@dataclass
+class _Job:
+    fn: Callable[[Session], Any]
+    future: Future[Any] = field(default_factory=Future)
+
+
+class WriteQueue:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        maxsize: int = 10000,
+        batch_size: int = 64,
+    ) -> None:
+        self._session_factory = session_factory
+        self._queue: queue.Queue[Optional[_Job]] = queue.Queue(maxsize=maxsize)
+        self._batch_size = batch_size
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, fn: Callable[[Session], Any]) -> Future[Any]:
+        """Queue a write; blocks only while the queue is full."""
+        if self._thread is None:
+            self._start()
+        job = _Job(fn)
+        self._queue.put(job)
+        DB_WRITE_QUEUE_DEPTH.set(self._queue.qsize())
+        return job.future
+
+    def call(self, fn: Callable[[Session], Any], timeout: Optional[float] = None) -> Any:
+        """Queue a write and wait for its batch to commit; returns or raises what ``fn`` did."""
+        future = self.submit(fn)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()   # only succeeds while the job is still queued
+            raise
+
+    def flush(self) -> None:
+        """Block until every job submitted so far has committed or failed."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Drain the queue and stop the writer thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            DB_WRITE_QUEUE_DEPTH.set(self._queue.qsize())
+            # Drops jobs whose caller gave up waiting while they were queued
+            jobs = [job for job in batch if job is not None and job.future.set_running_or_notify_cancel()]
+            try:
+                if jobs:
+                    self._execute(jobs)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if None in batch:
+                return
+
+    def _execute(self, jobs: list[_Job]) -> None:
+        try:
+            with self._session_factory() as db:
+                results = [job.fn(db) for job in jobs]
+                db.commit()
+        except Exception as exc:  # noqa: BLE001
+            if len(jobs) == 1:
+                jobs[0].future.set_exception(exc)
+                return
+            for job in jobs:   # isolate the failing job
+                self._execute([job])
+            return
+        DB_WRITE_BATCH_SIZE.observe(len(jobs))
+        for job, result in zip(jobs, results):
+            job.future.set_result(result)
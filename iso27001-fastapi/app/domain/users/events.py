@@ -41,3 +41,34 @@ class UserCreated(DomainEvent):
             raise ValueError("UserCreated.email_hash is required")
         if not self.role:
             raise ValueError("UserCreated.role is required")
+
+
+@dataclass(frozen=True)
+class UserUpdated(DomainEvent):
+    """Emitted after a user's profile columns change. ``fields`` names the columns, never their values."""
+    user_id: str = ""
+    fields: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        if not self.user_id:
+            raise ValueError("UserUpdated.user_id is required")
+
+
+@dataclass(frozen=True)
+class UserDeactivated(DomainEvent):
+    """Emitted after a user is deactivated — their tokens must stop authenticating."""
+    user_id: str = ""
+
+    def __post_init__(self) -> None:
+        if not self.user_id:
+            raise ValueError("UserDeactivated.user_id is required")
+
+
+@dataclass(frozen=True)
+class UserDeleted(DomainEvent):
+    """Emitted after a user is deleted."""
+    user_id: str = ""
+
+    def __post_init__(self) -> None:
+        if not self.user_id:
+            raise ValueError("UserDeleted.user_id is required")
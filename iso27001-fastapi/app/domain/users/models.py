@@ -1,10 +1,15 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, Index
 from app.domain.persistence import Base
 
 class User(Base):  # type: ignore[misc]
     __tablename__ = "users"
+    # Keyset pagination order — (created_at, id) is unique and index-ordered
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
+    # Server-generated values come back in the INSERT/UPDATE's RETURNING clause,
+    # never through a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     email = Column(String, unique=True, index=True, nullable=False)
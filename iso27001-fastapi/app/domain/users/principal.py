@@ -0,0 +1,45 @@
+"""
+The authenticated caller, as authorisation sees it.
+
+A Principal carries only what access checks need — never the password hash
+or profile fields — so it can be cached across requests and shared between
+workers without holding ORM or session state. In stateless claims mode it is
+built from the access token alone: id, role and the token's jti.
+"""
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from app.domain.users.models import User
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: str
+    role: str
+    email: str = ""
+    is_active: bool = True
+    jti: str = ""   # set only when built from token claims
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=str(user.id), role=str(user.role), email=str(user.email), is_active=bool(user.is_active))
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == "admin"
+
+    def may_access(self, user_id: str) -> bool:
+        """A.9: Owner-or-admin rule for per-user resources."""
+        return self.is_admin or self.id == user_id
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Principal":
+        return cls(
+            id=str(data["id"]),
+            role=str(data["role"]),
+            email=str(data.get("email", "")),
+            is_active=bool(data.get("is_active", True)),
+        )
@@ -1,11 +1,103 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional, List, Protocol, TypeVar
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.domain.exceptions import ConflictError
 from app.domain.users.models import User
 
+# Position in the (created_at, id) ordering used by keyset pagination
+Keyset = tuple[datetime, str]
+
+T = TypeVar("T")
+
+
+class Writer(Protocol):
+    """Runs a write job on its own session; returns the job's result once committed."""
+    def __call__(self, job: Callable[[Session], T]) -> T: ...
+
+
+class AsyncWriter(Protocol):
+    """Async counterpart of Writer; the job still receives a sync Session."""
+    def __call__(self, job: Callable[[Session], T]) -> Awaitable[T]: ...
+
+
+def keyset_of(user: User) -> Keyset:
+    return (user.created_at, str(user.id))  # type: ignore[return-value]
+
+
+@dataclass(frozen=True)
+class KeysetPage:
+    """One page in (created_at, id) order plus the keys of its neighbours."""
+    items: List[User]
+    next_key: Optional[Keyset] = None   # resume after this key for the next page
+    prev_key: Optional[Keyset] = None   # resume before this key for the previous page
+
+
+def _keyset_query(limit: int, after: Optional[Keyset], before: Optional[Keyset]) -> Any:
+    """Seek past the cursor on the (created_at, id) index instead of OFFSET-scanning to it."""
+    stmt = select(User)
+    position = tuple_(User.created_at, User.id)
+    if before is not None:
+        return stmt.where(position < tuple_(*before)).order_by(User.created_at.desc(), User.id.desc()).limit(limit)
+    if after is not None:
+        stmt = stmt.where(position > tuple_(*after))
+    return stmt.order_by(User.created_at, User.id).limit(limit)
+
+
+def _page(rows: List[User], limit: int, after: Optional[Keyset], before: Optional[Keyset]) -> KeysetPage:
+    """Build a page from ``limit + 1`` fetched rows (the extra row only signals more)."""
+    if before is not None:
+        rows.reverse()
+        has_prev, has_next = len(rows) > limit, True
+        items = rows[-limit:]
+    else:
+        has_prev, has_next = after is not None, len(rows) > limit
+        items = rows[:limit]
+    if not items:
+        return KeysetPage(items=[])
+    return KeysetPage(
+        items=items,
+        next_key=keyset_of(items[-1]) if has_next else None,
+        prev_key=keyset_of(items[0]) if has_prev else None,
+    )
+
+
+def _update_query(user_id: str, values: dict[str, Any]) -> Any:
+    """UPDATE ... RETURNING the row; the session's copy of the user is overwritten with it."""
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(**values)
+        .returning(User)
+        .execution_options(populate_existing=True)
+    )
+
+
+# How drivers name the email unique index in an IntegrityError: PostgreSQL and
+# MySQL by index name, SQLite by column ("NOT NULL ... users.email" must not match)
+_EMAIL_CONSTRAINT_MARKERS = ("ix_users_email", "UNIQUE constraint failed: users.email")
+
+
+def _is_email_conflict(exc: IntegrityError) -> bool:
+    """True when the violated constraint is the email unique index."""
+    return any(marker in str(exc.orig) for marker in _EMAIL_CONSTRAINT_MARKERS)
+
+
+# Write paths rely on the email unique constraint instead of a SELECT before
+# writing, and commit without a refresh (sessions use expire_on_commit=False):
+#   add()           INSERT            + COMMIT
+#   update()        UPDATE RETURNING  + COMMIT
+#   delete_by_id()  DELETE RETURNING  + COMMIT
+
 class UserRepositoryInterface(ABC):
     @abstractmethod
-    def save(self, user: User) -> User: ...
+    def add(self, user: User) -> User: ...
+    @abstractmethod
+    def update(self, user_id: str, values: dict[str, Any]) -> Optional[User]: ...
     @abstractmethod
     def get_by_email(self, email: str) -> Optional[User]: ...
     @abstractmethod
@@ -15,16 +107,41 @@ class UserRepositoryInterface(ABC):
     @abstractmethod
     def get_all(self, skip: int, limit: int) -> List[User]: ...
     @abstractmethod
-    def delete(self, user: User) -> None: ...
+    def get_page(self, limit: int, after: Optional[Keyset] = None, before: Optional[Keyset] = None) -> KeysetPage: ...
+    @abstractmethod
+    def delete_by_id(self, user_id: str) -> bool: ...
 
 class UserRepository(UserRepositoryInterface):
-    def __init__(self, db: Session):
+    """Writes commit on ``db`` unless a ``write`` callable (e.g. the SQLite writer) is injected."""
+    def __init__(self, db: Session, write: Optional[Writer] = None):
         self.db = db
+        self._write = write
 
-    def save(self, user: User) -> User:
-        self.db.add(user)
+    def _commit(self, job: Callable[[Session], T]) -> T:
+        if self._write is not None:
+            return self._write(job)
+        result = job(self.db)
         self.db.commit()
-        self.db.refresh(user)
+        return result
+
+    def add(self, user: User) -> User:
+        try:
+            self._commit(lambda db: db.add(user))
+        except IntegrityError as exc:
+            self.db.rollback()
+            if _is_email_conflict(exc):
+                raise ConflictError("Email already exists") from exc
+            raise
+        return user
+
+    def update(self, user_id: str, values: dict[str, Any]) -> Optional[User]:
+        try:
+            user = self._commit(lambda db: db.scalars(_update_query(user_id, values)).one_or_none())
+        except IntegrityError as exc:
+            self.db.rollback()
+            if _is_email_conflict(exc):
+                raise ConflictError("Email already exists") from exc
+            raise
         return user
 
     def get_by_email(self, email: str) -> Optional[User]:
@@ -34,11 +151,94 @@ class UserRepository(UserRepositoryInterface):
         return self.db.query(User).filter(User.email == email).first() is not None
 
     def get_by_id(self, user_id: str) -> Optional[User]:
-        return self.db.query(User).filter(User.id == user_id).first()
+        # Session.get: a user already loaded in this request comes from the identity map
+        return self.db.get(User, user_id)
 
     def get_all(self, skip: int, limit: int) -> List[User]:
-        return self.db.query(User).offset(skip).limit(limit).all()
+        return self.db.query(User).order_by(User.created_at, User.id).offset(skip).limit(limit).all()
+
+    def get_page(self, limit: int, after: Optional[Keyset] = None, before: Optional[Keyset] = None) -> KeysetPage:
+        rows = list(self.db.scalars(_keyset_query(limit + 1, after, before)))
+        return _page(rows, limit, after, before)
+
+    def delete_by_id(self, user_id: str) -> bool:
+        deleted = self._commit(lambda db: db.scalar(delete(User).where(User.id == user_id).returning(User.id)))
+        return deleted is not None
+
+class AsyncUserRepositoryInterface(ABC):
+    """Async counterpart of UserRepositoryInterface for the asyncio DB stack."""
+    @abstractmethod
+    async def add(self, user: User) -> User: ...
+    @abstractmethod
+    async def update(self, user_id: str, values: dict[str, Any]) -> Optional[User]: ...
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Optional[User]: ...
+    @abstractmethod
+    async def exists_by_email(self, email: str) -> bool: ...
+    @abstractmethod
+    async def get_by_id(self, user_id: str) -> Optional[User]: ...
+    @abstractmethod
+    async def get_all(self, skip: int, limit: int) -> List[User]: ...
+    @abstractmethod
+    async def get_page(
+        self, limit: int, after: Optional[Keyset] = None, before: Optional[Keyset] = None
+    ) -> KeysetPage: ...
+    @abstractmethod
+    async def delete_by_id(self, user_id: str) -> bool: ...
+
+class AsyncUserRepository(AsyncUserRepositoryInterface):
+    """Writes commit on ``db`` unless a ``write`` callable (e.g. the SQLite writer) is injected."""
+    def __init__(self, db: AsyncSession, write: Optional[AsyncWriter] = None):
+        self.db = db
+        self._write = write
+
+    async def _commit(self, job: Callable[[Session], T]) -> T:
+        if self._write is not None:
+            return await self._write(job)
+        result = await self.db.run_sync(job)
+        await self.db.commit()
+        return result
+
+    async def add(self, user: User) -> User:
+        try:
+            await self._commit(lambda db: db.add(user))
+        except IntegrityError as exc:
+            await self.db.rollback()
+            if _is_email_conflict(exc):
+                raise ConflictError("Email already exists") from exc
+            raise
+        return user
+
+    async def update(self, user_id: str, values: dict[str, Any]) -> Optional[User]:
+        try:
+            user = await self._commit(lambda db: db.scalars(_update_query(user_id, values)).one_or_none())
+        except IntegrityError as exc:
+            await self.db.rollback()
+            if _is_email_conflict(exc):
+                raise ConflictError("Email already exists") from exc
+            raise
+        return user
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        result = await self.db.execute(select(User).where(User.email == email).limit(1))
+        return result.scalars().first()
+
+    async def exists_by_email(self, email: str) -> bool:
+        return await self.db.scalar(select(User.id).where(User.email == email).limit(1)) is not None
+
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        return await self.db.get(User, user_id)
+
+    async def get_all(self, skip: int, limit: int) -> List[User]:
+        result = await self.db.execute(select(User).order_by(User.created_at, User.id).offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_page(
+        self, limit: int, after: Optional[Keyset] = None, before: Optional[Keyset] = None
+    ) -> KeysetPage:
+        rows = list(await self.db.scalars(_keyset_query(limit + 1, after, before)))
+        return _page(rows, limit, after, before)
 
-    def delete(self, user: User) -> None:
-        self.db.delete(user)
-        self.db.commit()
\ No newline at end of file
+    async def delete_by_id(self, user_id: str) -> bool:
+        deleted = await self._commit(lambda db: db.scalar(delete(User).where(User.id == user_id).returning(User.id)))
+        return deleted is not None
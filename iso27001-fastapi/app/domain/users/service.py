@@ -1,29 +1,44 @@
+import asyncio
 import hashlib
-from app.domain.users.repository import UserRepositoryInterface
+from typing import Awaitable, Callable, Optional
+from app.domain.users.repository import AsyncUserRepositoryInterface, Keyset, KeysetPage, UserRepositoryInterface
 from app.domain.users.models import User
 from app.domain.users.schemas import CreateUserRequest, UpdateUserRequest
-from app.domain.users.events import UserCreated
+from app.domain.users.events import UserCreated, UserDeactivated, UserDeleted, UserUpdated
 from app.config.security import hash_password
-from app.domain.exceptions import ConflictError
-from app.domain.events import EventBus, event_bus
+from app.domain.events import DomainEvent, EventBus, event_bus
+
+def _changes(request: UpdateUserRequest) -> dict[str, str]:
+    """Columns to update — fields left empty in the request are unchanged."""
+    values: dict[str, str] = {}
+    if request.email:
+        values["email"] = request.email
+    if request.full_name:
+        values["full_name"] = request.full_name
+    return values
 
 class UserService:
-    def __init__(self, repo: UserRepositoryInterface, bus: EventBus = event_bus):
+    def __init__(
+        self,
+        repo: UserRepositoryInterface,
+        bus: EventBus = event_bus,
+        password_hasher: Callable[[str], str] = hash_password,
+    ):
         self.repo = repo
         self.bus = bus
+        self.password_hasher = password_hasher
 
     def create_user(self, request: CreateUserRequest) -> User:
-        if self.repo.exists_by_email(request.email):
-            raise ConflictError("Email already exists")
-        
-        hashed_pw = hash_password(request.password)
+        # Duplicate emails are rejected by the unique constraint (ConflictError
+        # from the repository) — no existence SELECT before the INSERT
+        hashed_pw = self.password_hasher(request.password)
         user = User(
             email=request.email,
             hashed_password=hashed_pw,
             full_name=request.full_name,
             role="viewer"
         )
-        saved_user = self.repo.save(user)
+        saved_user = self.repo.add(user)
         
         # A.12: Emit event for audit trail (never log raw email)
         email_hash = hashlib.sha256(str(saved_user.email).encode()).hexdigest()
@@ -32,19 +47,105 @@ class UserService:
         
         return saved_user
 
+    def get_user(self, user_id: str) -> Optional[User]:
+        return self.repo.get_by_id(user_id)
+
     def list_users(self, skip: int, limit: int) -> list[User]:
         return self.repo.get_all(skip, limit)
 
-    def update_user(self, user: User, request: UpdateUserRequest) -> User:
-        if request.email and request.email != user.email:
-            if self.repo.exists_by_email(request.email):
-                raise ConflictError("Email already exists")
-            user.email = request.email  # type: ignore[assignment]
+    def list_users_page(
+        self, limit: int, after: Optional[Keyset] = None, before: Optional[Keyset] = None
+    ) -> KeysetPage:
+        return self.repo.get_page(limit, after, before)
+
+    def update_user(self, user_id: str, request: UpdateUserRequest) -> Optional[User]:
+        """Apply ``request`` in one UPDATE ... RETURNING; None if the user does not exist."""
+        values = _changes(request)
+        if not values:
+            return self.repo.get_by_id(user_id)
+        user = self.repo.update(user_id, values)
+        if user is not None:
+            self.bus.publish(UserUpdated(user_id=user_id, fields=tuple(values)))
+        return user
+
+    def deactivate_user(self, user_id: str) -> Optional[User]:
+        """A.9: Deactivate in one UPDATE; the user's tokens stop authenticating."""
+        user = self.repo.update(user_id, {"is_active": False})
+        if user is not None:
+            self.bus.publish(UserDeactivated(user_id=user_id))
+        return user
+
+    def delete_user(self, user_id: str) -> bool:
+        """Delete by id; False if there was no such user."""
+        deleted = self.repo.delete_by_id(user_id)
+        if deleted:
+            self.bus.publish(UserDeleted(user_id=user_id))
+        return deleted
+
+class AsyncUserService:
+    """
+    UserService for the asyncio stack. bcrypt hashing and event publication
+    (listeners such as the audit writer are synchronous) run on worker threads
+    so neither blocks the event loop.
+    """
+    def __init__(
+        self,
+        repo: AsyncUserRepositoryInterface,
+        bus: EventBus = event_bus,
+        password_hasher: Callable[[str], str] = hash_password,
+    ):
+        self.repo = repo
+        self.bus = bus
+        self.password_hasher = password_hasher
+
+    async def create_user(self, request: CreateUserRequest) -> User:
+        hashed_pw = await asyncio.to_thread(self.password_hasher, request.password)
+        user = User(
+            email=request.email,
+            hashed_password=hashed_pw,
+            full_name=request.full_name,
+            role="viewer"
+        )
+        saved_user = await self.repo.add(user)
+
+        # A.12: Emit event for audit trail (never log raw email)
+        email_hash = hashlib.sha256(str(saved_user.email).encode()).hexdigest()
+        event = UserCreated(user_id=str(saved_user.id), email_hash=email_hash, role=str(saved_user.role))
+        await self._publish(event)
+
+        return saved_user
+
+    async def get_user(self, user_id: str) -> Optional[User]:
+        return await self.repo.get_by_id(user_id)
+
+    async def list_users(self, skip: int, limit: int) -> list[User]:
+        return await self.repo.get_all(skip, limit)
+
+    async def list_users_page(
+        self, limit: int, after: Optional[Keyset] = None, before: Optional[Keyset] = None
+    ) -> KeysetPage:
+        return await self.repo.get_page(limit, after, before)
+
+    async def update_user(self, user_id: str, request: UpdateUserRequest) -> Optional[User]:
+        values = _changes(request)
+        if not values:
+            return await self.repo.get_by_id(user_id)
+        user = await self.repo.update(user_id, values)
+        if user is not None:
+            await self._publish(UserUpdated(user_id=user_id, fields=tuple(values)))
+        return user
+
+    async def deactivate_user(self, user_id: str) -> Optional[User]:
+        user = await self.repo.update(user_id, {"is_active": False})
+        if user is not None:
+            await self._publish(UserDeactivated(user_id=user_id))
+        return user
 
-        if request.full_name:
-            user.full_name = request.full_name  # type: ignore[assignment]
-            
-        return self.repo.save(user)
+    async def delete_user(self, user_id: str) -> bool:
+        deleted = await self.repo.delete_by_id(user_id)
+        if deleted:
+            await self._publish(UserDeleted(user_id=user_id))
+        return deleted
 
-    def delete_user(self, user: User) -> None:
-        self.repo.delete(user)
\ No newline at end of file
+    def _publish(self, event: DomainEvent) -> Awaitable[None]:
+        return asyncio.to_thread(self.bus.publish, event)
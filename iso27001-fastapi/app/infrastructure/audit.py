@@ -4,8 +4,10 @@ from datetime import datetime, timezone
 from sqlalchemy import Column, DateTime, String, JSON
 from sqlalchemy.orm import Session
 
-from app.core.database import Base, SessionLocal
+from app.core.database import Base, SessionLocal, WRITE_TIMEOUT_S, write_queue
 from app.core.telemetry import logger, get_correlation_id
+from app.infrastructure.aws_telemetry import xray
+from app.infrastructure.quality_monitor import quality_signals
 from app.domain.users.events import UserCreated, DomainEvent
 
 
@@ -31,6 +33,11 @@ class AuditService:
     """
     Service to persist audit logs.
     Typically called via event listeners to avoid coupling in domain services.
+
+    With SQLITE_TUNED the insert is handed to the single-writer queue and
+    batched with concurrent audit rows (one commit per batch). record() waits
+    for that commit, so a recorded row is durable (A.12) — nothing is left
+    queued in memory when the process is killed.
     """
     def record(
         self,
@@ -40,27 +47,46 @@ class AuditService:
         performed_by: str = "system",
         changes: dict[str, str] | None = None,
     ) -> None:
+        correlation_id = get_correlation_id() or "unknown"
+        entry = AuditLog(
+            action=action,
+            performed_by=performed_by,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            changes=changes,
+            correlation_id=correlation_id,
+        )
+
+        def written(error: BaseException | None) -> None:
+            if error is not None:
+                quality_signals.audit_write(committed=False)
+                logger.error(f"Failed to write audit log: {error}", correlation_id=correlation_id)
+                return
+            quality_signals.audit_write(committed=True)
+            # Also log to structured logger for redundancy/shipping
+            logger.audit(action, user_id=performed_by, resource_id=resource_id)
+
+        if write_queue is not None:
+            with xray.subsegment("audit.write"):
+                try:
+                    write_queue.call(lambda db: db.add(entry), timeout=WRITE_TIMEOUT_S)
+                    written(None)
+                except Exception as e:   # a timeout counts as a failed write
+                    written(e)
+            return
+
         # Use a separate session to ensure audit logs are committed 
         # even if the main transaction fails (best effort)
         db: Session = SessionLocal()
-        try:
-            entry = AuditLog(
-                action=action,
-                performed_by=performed_by,
-                resource_type=resource_type,
-                resource_id=resource_id,
-                changes=changes,
-                correlation_id=get_correlation_id() or "unknown",
-            )
-            db.add(entry)
-            db.commit()
-            
-            # Also log to structured logger for redundancy/shipping
-            logger.audit(action, user_id=performed_by, resource_id=resource_id)
-        except Exception as e:
-            logger.error(f"Failed to write audit log: {e}")
-        finally:
-            db.close()
+        with xray.subsegment("audit.write"):
+            try:
+                db.add(entry)
+                db.commit()
+                written(None)
+            except Exception as e:
+                written(e)
+            finally:
+                db.close()
 
 
 def audit_listener(event: DomainEvent) -> None:
@@ -4,10 +4,9 @@ AWS CloudWatch + X-Ray telemetry emitter.
 Sends custom metrics to CloudWatch and propagates X-Ray trace headers
 so distributed traces are linked across services.
 
-NOTE: Requires boto3 and aws-xray-sdk.
+NOTE: CloudWatch API metrics require boto3.
       Add to pyproject.toml under [project.optional-dependencies] → aws:
         boto3>=1.34
-        aws-xray-sdk>=2.12
 
       Set env vars (or use IAM role — preferred in production):
         AWS_DEFAULT_REGION=eu-west-1
@@ -15,13 +14,35 @@ NOTE: Requires boto3 and aws-xray-sdk.
 
       If AWS credentials are absent, all methods are no-ops so the
       application still starts in dev/test environments.
+
+      CLOUDWATCH_TRANSPORT=emf switches the emitter to Embedded Metric Format:
+      metrics are batched per flush interval and written as JSON lines to
+      stdout (or CLOUDWATCH_EMF_LOG_PATH); CloudWatch Logs extracts them, so
+      no PutMetricData calls (and no boto3) are needed on the request path.
+
+      XRAY_TRACING_ENABLED=true records per-request segments and per-stage
+      subsegments (DB, Redis, bcrypt, audit) for head-sampled requests and
+      ships them in UDP batches to the X-Ray daemon (AWS_XRAY_DAEMON_ADDRESS,
+      the Fargate sidecar). No SDK is needed; unsampled requests allocate
+      nothing beyond one context-variable lookup per stage.
 """
 from __future__ import annotations
 
+import atexit
+import contextvars
+import json
 import os
+import random
+import socket
+import sys
 import logging
+import threading
+import time
+import weakref
+from collections import deque
 from datetime import datetime, timezone
-from typing import Any, Optional
+from types import TracebackType
+from typing import Any, Callable, Optional, TextIO
 
 logger = logging.getLogger(__name__)
 
@@ -39,18 +60,165 @@ def _cloudwatch_client() -> Any:
         return None
 
 
+# EMF specification limits per log event
+_EMF_MAX_METRICS = 100   # metric definitions per CloudWatchMetrics directive
+_EMF_MAX_VALUES = 100    # values per metric array
+
+# (("Service", "iso27001-api"), ("Environment", "production"), ...)
+_DimensionKey = tuple[tuple[str, str], ...]
+
+
+class EmfWriter:
+    """
+    Buffers datapoints and writes them as CloudWatch Embedded Metric Format.
+
+    Datapoints are grouped by dimension set; every flush interval each group
+    becomes one or more EMF documents (one JSON line each) whose metric
+    members hold the buffered values as arrays. The flush thread is started
+    lazily on the first datapoint and a final flush runs at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        namespace: str = _CW_NAMESPACE,
+        *,
+        flush_interval_s: float = 10.0,
+        path: str = "",
+        stream: Optional[TextIO] = None,
+    ) -> None:
+        self._namespace = namespace
+        self._interval = flush_interval_s
+        self._path = path
+        self._stream = stream
+        self._buffer: dict[_DimensionKey, dict[str, tuple[str, list[float]]]] = {}
+        self._first_seen: dict[_DimensionKey, float] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, name: str, value: float, unit: str, dimensions: list[dict[str, str]]) -> None:
+        """Buffer one datapoint (cheap — no I/O on the caller's thread)."""
+        key: _DimensionKey = tuple((d["Name"], d["Value"]) for d in dimensions)
+        with self._lock:
+            group = self._buffer.get(key)
+            if group is None:
+                group = self._buffer[key] = {}
+                self._first_seen[key] = time.time()
+            entry = group.get(name)
+            if entry is None:
+                group[name] = (unit, [value])
+            else:
+                entry[1].append(value)
+            if self._thread is None:
+                self._start()
+
+    def flush(self) -> None:
+        """Write every buffered datapoint as EMF documents."""
+        with self._lock:
+            buffer, self._buffer = self._buffer, {}
+            first_seen, self._first_seen = self._first_seen, {}
+        if not buffer:
+            return
+        lines = [
+            json.dumps(doc, separators=(",", ":"))
+            for key, group in buffer.items()
+            for doc in self._documents(key, group, first_seen.get(key, time.time()))
+        ]
+        self._write("\n".join(lines) + "\n")
+
+    def close(self) -> None:
+        """Stop the flush thread and write whatever is still buffered."""
+        self._stop.set()
+        self.flush()
+
+    # ── internal ─────────────────────────────────────────────────────────────
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="emf-flush", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.flush()
+            except Exception as exc:  # noqa: BLE001
+                # Never let telemetry failure kill the flush loop
+                logger.warning("EMF flush failed: %s", exc)
+
+    def _documents(
+        self,
+        key: _DimensionKey,
+        group: dict[str, tuple[str, list[float]]],
+        first_seen: float,
+    ) -> list[dict[str, Any]]:
+        """Split one dimension group into spec-sized EMF documents."""
+        pending = {name: (unit, list(values)) for name, (unit, values) in group.items()}
+        docs: list[dict[str, Any]] = []
+        while pending:
+            names = list(pending)[:_EMF_MAX_METRICS]
+            doc: dict[str, Any] = {
+                "_aws": {
+                    "Timestamp": int(first_seen * 1000),
+                    "CloudWatchMetrics": [{
+                        "Namespace": self._namespace,
+                        "Dimensions": [[dim for dim, _ in key]],
+                        "Metrics": [{"Name": n, "Unit": pending[n][0]} for n in names],
+                    }],
+                },
+            }
+            doc.update(key)
+            for name in names:
+                unit, values = pending[name]
+                chunk, rest = values[:_EMF_MAX_VALUES], values[_EMF_MAX_VALUES:]
+                doc[name] = chunk   # always an array, even for one value: consumers read one shape
+                if rest:
+                    pending[name] = (unit, rest)
+                else:
+                    del pending[name]
+            docs.append(doc)
+        return docs
+
+    def _write(self, data: str) -> None:
+        with self._write_lock:
+            if self._path:
+                with open(self._path, "a", encoding="utf-8") as fh:
+                    fh.write(data)
+                return
+            stream = self._stream or sys.stdout
+            stream.write(data)
+            stream.flush()
+
+
 class CloudWatchEmitter:
     """
     Emits custom CloudWatch metrics for the ISO 27001 telemetry contract.
 
     Metric names follow the CloudWatch naming convention (PascalCase).
     All metrics include a "Service" dimension for per-service filtering.
+
+    transport="api" calls PutMetricData once per emit (emit_quality_snapshot
+    sends its whole batch in one call); transport="emf" hands datapoints to an
+    EmfWriter and never touches the CloudWatch API.
     """
 
-    def __init__(self, service_name: str, environment: str = "production") -> None:
+    def __init__(
+        self,
+        service_name: str,
+        environment: str = "production",
+        *,
+        transport: str = "api",
+        emf_writer: Optional[EmfWriter] = None,
+    ) -> None:
         self._service = service_name
         self._env = environment
-        self._cw: Any = _cloudwatch_client()
+        self._emf: Optional[EmfWriter] = None
+        self._cw: Any = None
+        if transport == "emf":
+            self._emf = emf_writer or EmfWriter()
+        else:
+            self._cw = _cloudwatch_client()
 
     # ── public API ───────────────────────────────────────────────────────────
 
@@ -89,6 +257,31 @@ class CloudWatchEmitter:
         """Publish the composite quality score (0–1 mapped to 0–100)."""
         self._put_metric("QualityScore", composite_score * 100, "Percent")
 
+    def emit_quality_snapshot(
+        self,
+        *,
+        composite_score: float,
+        pillars: dict[str, float],
+        budget_consumed_pct: float,
+        slo_breach: bool,
+    ) -> None:
+        """Publish the quality score, its pillars and the error budget in one batch."""
+        batch: list[tuple[str, float, str, Optional[list[dict[str, str]]]]] = [
+            ("QualityScore", composite_score * 100, "Percent", None),
+            ("ErrorBudgetConsumedPct", budget_consumed_pct, "Percent", None),
+            ("SloBreach", 1.0 if slo_breach else 0.0, "Count", None),
+        ]
+        batch.extend(
+            ("QualityPillar", score * 100, "Percent", [{"Name": "Pillar", "Value": pillar}])
+            for pillar, score in pillars.items()
+        )
+        self._put_metrics(batch)
+
+    def flush(self) -> None:
+        """Flush buffered EMF datapoints (no-op for the API transport)."""
+        if self._emf is not None:
+            self._emf.flush()
+
     # ── internal ─────────────────────────────────────────────────────────────
 
     def _put_metric(
@@ -98,45 +291,298 @@ class CloudWatchEmitter:
         unit: str,
         extra_dimensions: Optional[list[dict[str, str]]] = None,
     ) -> None:
-        if self._cw is None:
+        self._put_metrics([(name, value, unit, extra_dimensions)])
+
+    def _put_metrics(self, batch: list[tuple[str, float, str, Optional[list[dict[str, str]]]]]) -> None:
+        """Send datapoints in one PutMetricData call (or hand them all to the EMF writer)."""
+        if self._cw is None and self._emf is None:
             return
 
-        dimensions = [
-            {"Name": "Service", "Value": self._service},
-            {"Name": "Environment", "Value": self._env},
-        ]
-        if extra_dimensions:
-            dimensions.extend(extra_dimensions)
+        now = datetime.now(timezone.utc)
+        metric_data = []
+        for name, value, unit, extra_dimensions in batch:
+            dimensions = [
+                {"Name": "Service", "Value": self._service},
+                {"Name": "Environment", "Value": self._env},
+            ]
+            if extra_dimensions:
+                dimensions.extend(extra_dimensions)
+            if self._emf is not None:
+                self._emf.add(name, value, unit, dimensions)
+                continue
+            metric_data.append({
+                "MetricName": name,
+                "Dimensions": dimensions,
+                "Timestamp": now,
+                "Value": value,
+                "Unit": unit,
+            })
+        if not metric_data:
+            return
 
         try:
-            self._cw.put_metric_data(
-                Namespace=_CW_NAMESPACE,
-                MetricData=[{
-                    "MetricName": name,
-                    "Dimensions": dimensions,
-                    "Timestamp": datetime.now(timezone.utc),
-                    "Value": value,
-                    "Unit": unit,
-                }],
-            )
+            self._cw.put_metric_data(Namespace=_CW_NAMESPACE, MetricData=metric_data)
         except Exception as exc:  # noqa: BLE001
             # Never let telemetry failure crash the application
             logger.warning("CloudWatch emit failed: %s", exc)
 
 
+class HeadSampler:
+    """
+    A.12: Head sampling decision for new traces (X-Ray default-rule semantics).
+
+    An upstream ``Sampled=1``/``Sampled=0`` decision is always honoured.
+    Otherwise the first ``reservoir_per_s`` requests each second are traced,
+    plus a fixed ``rate`` share of the remainder.
+    """
+
+    def __init__(
+        self,
+        *,
+        reservoir_per_s: int = 1,
+        rate: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self._reservoir = reservoir_per_s
+        self._rate = rate
+        self._clock = clock
+        self._rng = rng
+        self._second = -1
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def should_sample(self, upstream: Optional[bool] = None) -> bool:
+        if upstream is not None:
+            return upstream
+        second = int(self._clock())
+        with self._lock:
+            if second != self._second:
+                self._second = second
+                self._used = 0
+            if self._used < self._reservoir:
+                self._used += 1
+                return True
+        return self._rng() < self._rate
+
+
+class Span:
+    """One X-Ray segment (request) or subsegment (stage)."""
+
+    __slots__ = (
+        "name", "id", "trace_id", "parent_id", "namespace", "start_time",
+        "end_time", "fault", "http", "sql", "annotations", "subsegments",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str] = None,
+        namespace: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.id = os.urandom(8).hex()
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.namespace = namespace
+        self.start_time = time.time()
+        self.end_time: Optional[float] = None
+        self.fault = False
+        self.http: Optional[dict[str, Any]] = None
+        self.sql: Optional[dict[str, str]] = None
+        self.annotations: dict[str, str | int | float | bool] = {}
+        self.subsegments: list[Span] = []
+
+    def child(self, name: str, namespace: Optional[str] = None) -> Span:
+        span = Span(name, self.trace_id, namespace=namespace)
+        self.subsegments.append(span)
+        return span
+
+    def close(self) -> None:
+        if self.end_time is None:
+            self.end_time = time.time()
+
+    def to_document(self, *, is_segment: bool = True) -> dict[str, Any]:
+        doc: dict[str, Any] = {
+            "name": self.name,
+            "id": self.id,
+            "start_time": self.start_time,
+            "end_time": self.end_time if self.end_time is not None else time.time(),
+        }
+        if is_segment:
+            doc["trace_id"] = self.trace_id
+            if self.parent_id:
+                doc["parent_id"] = self.parent_id
+        if self.namespace:
+            doc["namespace"] = self.namespace
+        if self.fault:
+            doc["fault"] = True
+        if self.http:
+            doc["http"] = self.http
+        if self.sql:
+            doc["sql"] = self.sql
+        if self.annotations:
+            doc["annotations"] = self.annotations
+        if self.subsegments:
+            doc["subsegments"] = [s.to_document(is_segment=False) for s in self.subsegments]
+        return doc
+
+
+class _NoopScope:
+    """Returned by XRayTracer.subsegment() when the request is not sampled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> Optional[Span]:
+        return None
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        return None
+
+
+_NOOP_SCOPE = _NoopScope()
+
+
+class _SubsegmentScope:
+    __slots__ = ("_parent", "_name", "_namespace", "_span", "_token")
+
+    def __init__(self, parent: Span, name: str, namespace: Optional[str]) -> None:
+        self._parent = parent
+        self._name = name
+        self._namespace = namespace
+
+    def __enter__(self) -> Optional[Span]:
+        self._span = self._parent.child(self._name, self._namespace)
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self._span.fault = exc_type is not None
+        self._span.close()
+        _current_span.reset(self._token)
+
+
+# Innermost open span of the sampled request running in this context (None = unsampled)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("xray_span", default=None)
+_current_segment: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("xray_segment", default=None)
+
+
+class UdpSpanExporter:
+    """
+    Buffers finished segments and sends them to the X-Ray daemon over UDP.
+
+    Segments are queued in memory (bounded; oldest dropped first) and the
+    whole buffer is sent every flush interval from a background thread, one
+    datagram per document as the daemon protocol requires. Segments too large
+    for one datagram are split into the parent plus independent subsegments.
+    """
+
+    _HEADER = b'{"format":"json","version":1}\n'
+    _MAX_DATAGRAM = 64_000
+
+    def __init__(
+        self,
+        address: str = "127.0.0.1:2000",
+        *,
+        flush_interval_s: float = 1.0,
+        max_buffered: int = 1000,
+    ) -> None:
+        host, _, port = address.rpartition(":")
+        self._address = (host or "127.0.0.1", int(port))
+        self._interval = flush_interval_s
+        self._buffer: deque[Span] = deque(maxlen=max_buffered)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def export(self, segment: Span) -> None:
+        """Queue a closed segment for the next flush (never blocks)."""
+        self._buffer.append(segment)
+        if self._thread is None:
+            self._start()
+
+    def flush(self) -> None:
+        """Send every buffered segment now."""
+        while self._buffer:
+            try:
+                segment = self._buffer.popleft()
+            except IndexError:
+                break
+            for payload in self._datagrams(segment):
+                try:
+                    self._sock.sendto(self._HEADER + payload, self._address)
+                except OSError as exc:
+                    # Daemon down or socket buffer full — tracing is best effort
+                    logger.debug("X-Ray export failed: %s", exc)
+
+    def close(self) -> None:
+        self._stop.set()
+        self.flush()
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="xray-export", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.flush()
+
+    def _datagrams(self, segment: Span) -> list[bytes]:
+        doc = segment.to_document()
+        payload = json.dumps(doc, separators=(",", ":")).encode()
+        if len(payload) <= self._MAX_DATAGRAM:
+            return [payload]
+        subsegments = doc.pop("subsegments", [])
+        parts = [json.dumps(doc, separators=(",", ":")).encode()]
+        for sub in subsegments:
+            sub.update(type="subsegment", trace_id=segment.trace_id, parent_id=segment.id)
+            parts.append(json.dumps(sub, separators=(",", ":")).encode())
+        return parts
+
+
 class XRayTracer:
     """
-    Propagates AWS X-Ray trace context.
+    Propagates AWS X-Ray trace context and records sampled request traces.
 
     Reads the X-Amzn-Trace-Id header from incoming requests and adds
     it to outgoing log entries so traces are linked in the X-Ray console.
 
-    Full SDK integration (aws-xray-sdk) is opt-in; this class works
-    without it by treating the header as a pass-through correlation ID.
+    When enabled, begin_segment() makes a head-sampling decision; sampled
+    requests get a segment in a context variable, stages open subsegments via
+    subsegment() / start_subsegment(), and end_segment() hands the finished
+    segment to the exporter. Unsampled requests get no Span objects at all.
     """
 
     HEADER = "X-Amzn-Trace-Id"
 
+    def __init__(
+        self,
+        *,
+        enabled: bool = False,
+        sampler: Optional[HeadSampler] = None,
+        exporter: Optional[UdpSpanExporter] = None,
+    ) -> None:
+        self.enabled = enabled and exporter is not None
+        self._sampler = sampler or HeadSampler()
+        self._exporter = exporter
+        self._instrumented: weakref.WeakSet[Any] = weakref.WeakSet()
+
     @staticmethod
     def extract_trace_id(headers: dict[str, str]) -> Optional[str]:
         """Extract the X-Ray trace ID from request headers."""
@@ -150,35 +596,139 @@ class XRayTracer:
         return raw
 
     @staticmethod
-    def begin_segment(name: str, trace_id: Optional[str] = None) -> None:
-        """Start an X-Ray segment if aws-xray-sdk is available."""
-        try:
-            from aws_xray_sdk.core import xray_recorder  # type: ignore[import-untyped,import-not-found]
-            xray_recorder.begin_segment(name, traceid=trace_id)
-        except ImportError:
-            pass
+    def parse_header(raw: Optional[str]) -> dict[str, str]:
+        """Split a trace header into its Root/Parent/Sampled fields."""
+        if not raw:
+            return {}
+        fields: dict[str, str] = {}
+        for part in raw.split(";"):
+            key, sep, value = part.strip().partition("=")
+            if sep:
+                fields[key] = value
+        return fields
 
     @staticmethod
-    def end_segment() -> None:
-        """End an X-Ray segment if aws-xray-sdk is available."""
-        try:
-            from aws_xray_sdk.core import xray_recorder  # type: ignore[import-untyped,import-not-found]
-            xray_recorder.end_segment()
-        except ImportError:
-            pass
+    def new_trace_id() -> str:
+        return f"1-{int(time.time()):08x}-{os.urandom(12).hex()}"
+
+    def begin_segment(
+        self,
+        name: str,
+        trace_id: Optional[str] = None,
+        *,
+        parent_id: Optional[str] = None,
+        sampled: Optional[bool] = None,
+    ) -> Optional[Span]:
+        """Start a request segment if tracing is on and the request is sampled."""
+        if not self.enabled or not self._sampler.should_sample(sampled):
+            return None
+        segment = Span(name, trace_id or self.new_trace_id(), parent_id=parent_id)
+        _current_segment.set(segment)
+        _current_span.set(segment)
+        return segment
+
+    def end_segment(self, *, status_code: Optional[int] = None) -> None:
+        """Close the current request segment and queue it for export."""
+        segment = _current_segment.get()
+        if segment is None:
+            return
+        _current_segment.set(None)
+        _current_span.set(None)
+        if status_code is not None:
+            segment.fault = status_code >= 500
+            if segment.http is not None:
+                segment.http["response"] = {"status": status_code}
+        segment.close()
+        if self._exporter is not None:
+            self._exporter.export(segment)
+
+    def subsegment(self, name: str, namespace: Optional[str] = None) -> _SubsegmentScope | _NoopScope:
+        """Context manager timing one stage of the current sampled request."""
+        parent = _current_span.get()
+        if parent is None:
+            return _NOOP_SCOPE
+        return _SubsegmentScope(parent, name, namespace)
+
+    def start_subsegment(self, name: str, namespace: Optional[str] = None) -> Optional[Span]:
+        """Open a leaf subsegment for callback-style hooks (close it with Span.close())."""
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        return parent.child(name, namespace)
+
+    def instrument_engine(self, engine: Any) -> None:
+        """Record one remote subsegment per SQL statement executed on ``engine`` (idempotent)."""
+        from sqlalchemy import event
+
+        if engine in self._instrumented:
+            return
+        self._instrumented.add(engine)
+
+        database_type = engine.dialect.name
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn: Any, cursor: Any, statement: str, params: Any, context: Any, executemany: bool) -> None:
+            span = self.start_subsegment(database_type, namespace="remote")
+            if span is not None:
+                # Statements are parameterised — no literal values reach the trace
+                span.sql = {"database_type": database_type, "sanitized_query": statement}
+                conn.info.setdefault("xray_spans", []).append(span)
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn: Any, cursor: Any, statement: str, params: Any, context: Any, executemany: bool) -> None:
+            spans = conn.info.get("xray_spans")
+            if spans:
+                spans.pop().close()
+
+        @event.listens_for(engine, "handle_error")
+        def _error(exception_context: Any) -> None:
+            conn = exception_context.connection
+            spans = conn.info.get("xray_spans") if conn is not None else None
+            if spans:
+                span = spans.pop()
+                span.fault = True
+                span.close()
 
 
 # Module-level singletons — service name resolved from settings at import time
 def _build_emitter() -> CloudWatchEmitter:
     try:
         from app.config.settings import settings
+        emf_writer = None
+        if settings.CLOUDWATCH_TRANSPORT == "emf":
+            emf_writer = EmfWriter(
+                flush_interval_s=settings.CLOUDWATCH_EMF_FLUSH_INTERVAL_S,
+                path=settings.CLOUDWATCH_EMF_LOG_PATH,
+            )
         return CloudWatchEmitter(
             service_name=settings.APP_NAME,
             environment=settings.APP_ENV,
+            transport=settings.CLOUDWATCH_TRANSPORT,
+            emf_writer=emf_writer,
         )
     except Exception:  # noqa: BLE001
         return CloudWatchEmitter(service_name="iso27001-api")
 
 
+def _build_tracer() -> XRayTracer:
+    try:
+        from app.config.settings import settings
+        if not settings.XRAY_TRACING_ENABLED:
+            return XRayTracer()
+        return XRayTracer(
+            enabled=True,
+            sampler=HeadSampler(
+                reservoir_per_s=settings.XRAY_SAMPLING_RESERVOIR,
+                rate=settings.XRAY_SAMPLING_RATE,
+            ),
+            exporter=UdpSpanExporter(
+                settings.AWS_XRAY_DAEMON_ADDRESS,
+                flush_interval_s=settings.XRAY_FLUSH_INTERVAL_S,
+            ),
+        )
+    except Exception:  # noqa: BLE001
+        return XRayTracer()
+
+
 cw_emitter = _build_emitter()
-xray = XRayTracer()
+xray = _build_tracer()
@@ -8,11 +8,75 @@ SLA mapping (99.9% = 43.8 min/month budget):
   - 99.9%  →  43.8 min downtime budget per month
   - 99.95% →  21.9 min downtime budget per month
   - 99.99% →   4.4 min downtime budget per month
+
+Counts live in time-bucketed ring buffers, so the budget is measured over a
+rolling 30-day SLO period rather than since process start:
+  - per-second ring (3600 slots)   → 5m, 30m and 1h windows
+  - per-minute ring (43200 slots)  → 6h and 30d windows
+  - per-route minute rings (60)    → 1h budget per route template
+
+Burn rate = observed error rate / allowed error rate (1 - SLA). Alerts follow
+the multi-window scheme from the Google SRE workbook: a long window proves the
+burn is significant, a short window proves it is still happening.
+  - fast burn: 1h AND 5m burn > 14.4  (2% of a 30d budget in 1h → page)
+  - slow burn: 6h AND 30m burn > 6    (5% of a 30d budget in 6h → ticket)
+
+All rings live in one CounterBlock. With a path (e.g. under /dev/shm) the
+block is a file-backed mmap shared by every worker on the host, updated under
+flock, so any worker's snapshot shows the host aggregate. The block can be
+copied periodically to a snapshot file (tmp + rename) and is restored from it
+when a fresh block is created — the SLA window survives deploys.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
-from threading import Lock
+import atexit
+import mmap
+import os
+import time
+from array import array
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Event, Lock, Thread, current_thread, local
+from typing import Callable, Iterator, Optional, Union
+
+SECOND_SLOTS = 3600          # 1h at 1s resolution
+MINUTE_SLOTS = 43200         # 30d at 1m resolution
+ROUTE_SLOTS = 60             # 1h at 1m resolution, per route
+MAX_ROUTES = 256
+ROUTE_NAME_BYTES = 128
+
+FAST_BURN_THRESHOLD = 14.4
+SLOW_BURN_THRESHOLD = 6.0
+
+# window name → (seconds, ring) — "s" windows read the second ring, "m" the minute ring
+WINDOWS: dict[str, tuple[int, str]] = {
+    "5m": (300, "s"),
+    "30m": (1800, "s"),
+    "1h": (3600, "s"),
+    "6h": (21600, "m"),
+    "30d": (2592000, "m"),
+}
+BUDGET_WINDOW = "30d"
+
+_Int64Buffer = Union["array[int]", memoryview]
+
+
+@dataclass
+class WindowStats:
+    total_requests: int
+    failed_requests: int
+    client_errors: int
+    error_rate: float
+    burn_rate: float
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "total_requests": self.total_requests,
+            "failed_requests": self.failed_requests,
+            "client_errors": self.client_errors,
+            "error_rate": self.error_rate,
+            "burn_rate": self.burn_rate,
+        }
 
 
 @dataclass
@@ -24,6 +88,210 @@ class ErrorBudgetSnapshot:
     observed_availability: float
     budget_consumed_pct: float  # 0–100; >100 means budget exhausted
     budget_exhausted: bool
+    window_s: int = WINDOWS[BUDGET_WINDOW][0]
+    windows: dict[str, WindowStats] = field(default_factory=dict)
+    routes: dict[str, WindowStats] = field(default_factory=dict)   # 1h per route template
+    fast_burn: bool = False
+    slow_burn: bool = False
+
+
+class _BucketRing:
+    """
+    Fixed-size ring of (epoch, total, failed, client) int64 slots.
+
+    ``epoch`` is the absolute bucket number (timestamp // width), so a slot
+    whose epoch is stale is recognised and reset on write, and ignored on
+    read — no background rotation needed. The storage is any mutable int64
+    sequence (an array here; a shared memory view works the same way).
+    """
+
+    FIELDS = 4
+
+    def __init__(self, slots: int, width_s: int, buffer: Optional[_Int64Buffer] = None) -> None:
+        self.slots = slots
+        self.width_s = width_s
+        self._buf: _Int64Buffer = buffer if buffer is not None else array("q", bytes(8 * slots * self.FIELDS))
+
+    def add(self, epoch: int, total: int, failed: int, client: int) -> None:
+        i = (epoch % self.slots) * self.FIELDS
+        buf = self._buf
+        if buf[i] != epoch:
+            buf[i], buf[i + 1], buf[i + 2], buf[i + 3] = epoch, total, failed, client
+        else:
+            buf[i + 1] += total
+            buf[i + 2] += failed
+            buf[i + 3] += client
+
+    def totals(self, since_epoch: int, until_epoch: int) -> tuple[int, int, int]:
+        """Sum of (total, failed, client) over buckets in [since_epoch, until_epoch]."""
+        total = failed = client = 0
+        buf = self._buf
+        if until_epoch - since_epoch + 1 >= self.slots:
+            for epoch, t, f, c in zip(buf[0::4], buf[1::4], buf[2::4], buf[3::4]):
+                if since_epoch <= epoch <= until_epoch:
+                    total += t
+                    failed += f
+                    client += c
+            return total, failed, client
+        for epoch in range(since_epoch, until_epoch + 1):
+            i = (epoch % self.slots) * self.FIELDS
+            if buf[i] == epoch:
+                total += buf[i + 1]
+                failed += buf[i + 2]
+                client += buf[i + 3]
+        return total, failed, client
+
+
+# CounterBlock layout — every offset is a multiple of 8 so int64 views line up
+_MAGIC = b"ISOEB001"
+_SLOT_BYTES = 8 * _BucketRing.FIELDS
+_HEADER_BYTES = 64
+_SECONDS_OFF = _HEADER_BYTES
+_MINUTES_OFF = _SECONDS_OFF + SECOND_SLOTS * _SLOT_BYTES
+_NAMES_OFF = _MINUTES_OFF + MINUTE_SLOTS * _SLOT_BYTES
+_ROUTES_OFF = _NAMES_OFF + MAX_ROUTES * ROUTE_NAME_BYTES
+BLOCK_SIZE = _ROUTES_OFF + MAX_ROUTES * ROUTE_SLOTS * _SLOT_BYTES
+
+
+class CounterBlock:
+    """
+    Fixed-layout counter storage: second ring, minute ring, route name table
+    and per-route rings in one mmap (~2 MB).
+
+    ``path=None`` maps anonymous memory (single process). With a path, every
+    process mapping the same file shares the counters; writers serialize on
+    flock (cross-process) plus a thread lock (flock does not exclude threads
+    sharing one descriptor).
+    """
+
+    def __init__(self, path: Optional[str] = None, *, restore_from: Optional[str] = None) -> None:
+        self.path = path
+        self._fd: Optional[int] = None
+        self._thread_lock = Lock()
+        if path:
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            with self.locked():
+                if os.fstat(self._fd).st_size < BLOCK_SIZE:
+                    os.ftruncate(self._fd, BLOCK_SIZE)
+                self._mm = mmap.mmap(self._fd, BLOCK_SIZE)
+                self.restored = self._initialize(restore_from)
+        else:
+            self._mm = mmap.mmap(-1, BLOCK_SIZE)
+            self.restored = self._initialize(restore_from)
+        self._words = memoryview(self._mm).cast("q")
+        self.seconds = _BucketRing(SECOND_SLOTS, 1, self._view(_SECONDS_OFF, SECOND_SLOTS))
+        self.minutes = _BucketRing(MINUTE_SLOTS, 60, self._view(_MINUTES_OFF, MINUTE_SLOTS))
+        self._route_rings: dict[int, _BucketRing] = {}
+        self._route_index: dict[str, int] = {}
+
+    @contextmanager
+    def locked(self, *, shared: bool = False) -> Iterator[None]:
+        with self._thread_lock:
+            if self._fd is None:
+                yield
+                return
+            import fcntl
+            fcntl.flock(self._fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def route(self, name: str, *, create: bool) -> Optional[_BucketRing]:
+        """Ring for ``name`` (caller holds the lock); None if absent or the table is full."""
+        encoded = name.encode("utf-8")
+        if len(encoded) >= ROUTE_NAME_BYTES:
+            return None
+        index = self._route_index.get(name)
+        if index is None or self._name_at(index) != encoded:   # table may be reset by any worker
+            self._route_index.clear()
+            index = self._find_route(encoded, create)
+            if index is None:
+                return None
+            self._route_index[name] = index
+        ring = self._route_rings.get(index)
+        if ring is None:
+            offset = _ROUTES_OFF + index * ROUTE_SLOTS * _SLOT_BYTES
+            ring = self._route_rings[index] = _BucketRing(ROUTE_SLOTS, 60, self._view(offset, ROUTE_SLOTS))
+        return ring
+
+    def route_names(self) -> list[str]:
+        names = (self._name_at(i) for i in range(MAX_ROUTES))
+        return [n.decode("utf-8") for n in names if n]
+
+    def clear(self) -> None:
+        """Zero every counter and the route table (caller holds the lock)."""
+        self._mm[_HEADER_BYTES:] = bytes(BLOCK_SIZE - _HEADER_BYTES)
+        self._route_index.clear()
+
+    def save(self, snapshot_path: str) -> None:
+        """Atomically copy the block to ``snapshot_path`` (tmp file + rename)."""
+        with self.locked(shared=True):
+            data = bytes(self._mm)
+        tmp = f"{snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, snapshot_path)
+
+    def close(self) -> None:
+        self._route_rings.clear()
+        self.seconds = self.minutes = None  # type: ignore[assignment]
+        self._words.release()
+        self._mm.close()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _initialize(self, restore_from: Optional[str]) -> bool:
+        """Stamp a fresh block, restoring a saved snapshot if one is valid; True if restored."""
+        if self._mm[: len(_MAGIC)] == _MAGIC:
+            return False   # another worker already initialised the shared block
+        restored = False
+        if restore_from and os.path.exists(restore_from):
+            with open(restore_from, "rb") as f:
+                data = f.read()
+            if len(data) == BLOCK_SIZE and data[: len(_MAGIC)] == _MAGIC:
+                self._mm[:] = data
+                restored = True
+        self._mm[: len(_MAGIC)] = _MAGIC
+        return restored
+
+    def _view(self, offset: int, slots: int) -> _Int64Buffer:
+        start = offset // 8
+        return self._words[start : start + slots * _BucketRing.FIELDS]
+
+    def _name_at(self, index: int) -> bytes:
+        offset = _NAMES_OFF + index * ROUTE_NAME_BYTES
+        return self._mm[offset : offset + ROUTE_NAME_BYTES].rstrip(b"\0")
+
+    def _find_route(self, encoded: bytes, create: bool) -> Optional[int]:
+        free = None
+        for index in range(MAX_ROUTES):
+            existing = self._name_at(index)
+            if existing == encoded:
+                return index
+            if not existing and free is None:
+                free = index
+        if not create or free is None:
+            return None
+        offset = _NAMES_OFF + free * ROUTE_NAME_BYTES
+        self._mm[offset : offset + ROUTE_NAME_BYTES] = encoded.ljust(ROUTE_NAME_BYTES, b"\0")
+        return free
+
+
+class _Shard:
+    """One thread's pending counts, keyed by second (and by route + minute)."""
+
+    __slots__ = ("owner", "lock", "seconds", "routes", "current_second")
+
+    def __init__(self, owner: Thread) -> None:
+        self.owner = owner
+        self.lock = Lock()   # only contended while a snapshot drains this shard
+        self.seconds: dict[int, list[int]] = {}
+        self.routes: dict[tuple[str, int], list[int]] = {}
+        self.current_second = -1
 
 
 class ErrorBudgetTracker:
@@ -34,40 +302,96 @@ class ErrorBudgetTracker:
     (they represent client errors, not service failures) so operators can
     alert on abuse/anomaly patterns without conflating them with availability.
 
+    record() only touches a per-thread shard; shards are merged into the
+    counter block once per second by their owning thread and on snapshot(),
+    so request threads do not contend on a single lock. With a shared block
+    or a persist path, a background thread also merges idle shards every
+    second and saves the block every ``persist_interval_s``.
+
     Usage:
         tracker = ErrorBudgetTracker(sla_target=0.999)
         tracker.record(status_code=200)
-        tracker.record(status_code=500)
+        tracker.record(status_code=500, route="/api/v1/users")
         snapshot = tracker.snapshot()
     """
 
-    def __init__(self, sla_target: float = 0.999) -> None:
+    def __init__(
+        self,
+        sla_target: float = 0.999,
+        *,
+        clock: Callable[[], float] = time.time,
+        block: Optional[CounterBlock] = None,
+        persist_path: Optional[str] = None,
+        persist_interval_s: float = 60.0,
+    ) -> None:
         if not (0.0 < sla_target < 1.0):
             raise ValueError("sla_target must be between 0 and 1 exclusive")
         self._sla_target = sla_target
-        self._total: int = 0
-        self._failed: int = 0        # 5xx
-        self._client_errors: int = 0  # 4xx
-        self._lock = Lock()
+        self._clock = clock
+        self._block = block if block is not None else CounterBlock(restore_from=persist_path)
+        self._persist_path = persist_path
+        self._persist_interval = persist_interval_s
+        self._lock = Lock()                    # guards the shard registry
+        self._shards: list[_Shard] = []
+        self._local = local()
+        self._background: Optional[Thread] = None
+        self._stop = Event()
 
-    def record(self, status_code: int) -> None:
+    def record(self, status_code: int, route: Optional[str] = None) -> None:
         """Record a completed request.
         5xx responses deduct from the availability budget.
         4xx responses are counted separately for anomaly alerting.
         """
-        with self._lock:
-            self._total += 1
-            if status_code >= 500:
-                self._failed += 1
-            elif 400 <= status_code < 500:
-                self._client_errors += 1
+        if self._background is None and (self._block.path or self._persist_path):
+            self._start_background()
+        shard = self._shard()
+        second = int(self._clock())
+        failed = 1 if status_code >= 500 else 0
+        client = 1 if 400 <= status_code < 500 else 0
+        with shard.lock:
+            if second != shard.current_second:
+                if shard.current_second >= 0:
+                    self._merge(shard)   # first request of a new second: publish the old ones
+                shard.current_second = second
+            counts = shard.seconds.get(second)
+            if counts is None:
+                counts = shard.seconds[second] = [0, 0, 0]
+            counts[0] += 1
+            counts[1] += failed
+            counts[2] += client
+            if route is not None:
+                key = (route, second // 60)
+                route_counts = shard.routes.get(key)
+                if route_counts is None:
+                    route_counts = shard.routes[key] = [0, 0, 0]
+                route_counts[0] += 1
+                route_counts[1] += failed
+                route_counts[2] += client
 
     def snapshot(self) -> ErrorBudgetSnapshot:
         """Return current error budget state."""
-        with self._lock:
-            total = self._total
-            failed = self._failed
-            client_errors = self._client_errors
+        now = int(self._clock())
+        self._merge_all()
+
+        block = self._block
+        with block.locked(shared=True):
+            windows = {name: self._window(now, seconds, ring) for name, (seconds, ring) in WINDOWS.items()}
+            routes: dict[str, WindowStats] = {}
+            for route in block.route_names():
+                ring = block.route(route, create=False)
+                if ring is not None:
+                    stats = self._stats(*ring.totals(now // 60 - ROUTE_SLOTS + 1, now // 60))
+                    if stats.total_requests:
+                        routes[route] = stats
+
+        budget = windows[BUDGET_WINDOW]
+        total, failed = budget.total_requests, budget.failed_requests
+        fast_burn = (
+            windows["1h"].burn_rate > FAST_BURN_THRESHOLD and windows["5m"].burn_rate > FAST_BURN_THRESHOLD
+        )
+        slow_burn = (
+            windows["6h"].burn_rate > SLOW_BURN_THRESHOLD and windows["30m"].burn_rate > SLOW_BURN_THRESHOLD
+        )
 
         if total == 0:
             return ErrorBudgetSnapshot(
@@ -78,6 +402,8 @@ class ErrorBudgetTracker:
                 observed_availability=1.0,
                 budget_consumed_pct=0.0,
                 budget_exhausted=False,
+                windows=windows,
+                routes=routes,
             )
 
         availability = (total - failed) / total
@@ -95,19 +421,138 @@ class ErrorBudgetTracker:
             sla_target=self._sla_target,
             total_requests=total,
             failed_requests=failed,
-            client_errors=client_errors,
+            client_errors=budget.client_errors,
             observed_availability=round(availability, 6),
             budget_consumed_pct=budget_consumed_pct_rounded,
             budget_exhausted=budget_consumed_pct_rounded >= 100.0,
+            windows=windows,
+            routes=routes,
+            fast_burn=fast_burn,
+            slow_burn=slow_burn,
         )
 
     def reset(self) -> None:
         """Reset counters (e.g. at the start of a new SLA measurement period)."""
         with self._lock:
-            self._total = 0
-            self._failed = 0
-            self._client_errors = 0
+            shards = list(self._shards)
+        for shard in shards:
+            with shard.lock:
+                shard.seconds.clear()
+                shard.routes.clear()
+        with self._block.locked():
+            self._block.clear()
+
+    def save(self) -> None:
+        """Merge pending counts and write the block to the persist path (if any)."""
+        self._merge_all()
+        if self._persist_path:
+            self._block.save(self._persist_path)
+
+    def close(self) -> None:
+        """Stop the background thread, save a final snapshot, and unmap the block."""
+        self._stop.set()
+        if self._background is not None:
+            self._background.join()
+            self._background = None
+        self.save()
+        self._block.close()
+
+    # ── helpers ──────────────────────────────────────────────────────────────
+
+    def _start_background(self) -> None:
+        with self._lock:
+            if self._background is None:
+                self._background = Thread(target=self._run, name="error-budget-sync", daemon=True)
+                self._background.start()
+
+    def _run(self) -> None:
+        next_save = time.monotonic() + self._persist_interval
+        while not self._stop.wait(1.0):
+            try:
+                if self._persist_path and time.monotonic() >= next_save:
+                    next_save = time.monotonic() + self._persist_interval
+                    self.save()
+                else:
+                    self._merge_all()
+            except Exception:  # noqa: BLE001
+                # Persistence is best-effort; counting must carry on regardless
+                pass
+
+    def _merge_all(self) -> None:
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            with shard.lock:
+                self._merge(shard)
+        self._prune_shards()
+
+    def _shard(self) -> _Shard:
+        shard: Optional[_Shard] = getattr(self._local, "shard", None)
+        if shard is None:
+            self._prune_shards()   # worker threads come and go (AnyIO retires idle ones)
+            shard = self._local.shard = _Shard(current_thread())
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def _prune_shards(self) -> None:
+        """Merge and forget the shards of threads that have exited."""
+        with self._lock:
+            dead = [s for s in self._shards if not s.owner.is_alive()]
+        for shard in dead:
+            with shard.lock:
+                self._merge(shard)
+        if dead:
+            with self._lock:
+                self._shards = [s for s in self._shards if s not in dead]
+
+    def _merge(self, shard: _Shard) -> None:
+        """Move a shard's pending counts into the shared rings (caller holds shard.lock)."""
+        if not shard.seconds and not shard.routes:
+            return
+        block = self._block
+        with block.locked():
+            for second, (total, failed, client) in shard.seconds.items():
+                block.seconds.add(second, total, failed, client)
+                block.minutes.add(second // 60, total, failed, client)
+            for (route, minute), (total, failed, client) in shard.routes.items():
+                ring = block.route(route, create=True)
+                if ring is not None:   # route table full — overall rings still count it
+                    ring.add(minute, total, failed, client)
+        shard.seconds.clear()
+        shard.routes.clear()
+
+    def _window(self, now: int, seconds: int, ring: str) -> WindowStats:
+        if ring == "s":
+            return self._stats(*self._block.seconds.totals(now - seconds + 1, now))
+        minute = now // 60
+        return self._stats(*self._block.minutes.totals(minute - seconds // 60 + 1, minute))
+
+    def _stats(self, total: int, failed: int, client: int) -> WindowStats:
+        error_rate = failed / total if total else 0.0
+        return WindowStats(
+            total_requests=total,
+            failed_requests=failed,
+            client_errors=client,
+            error_rate=round(error_rate, 6),
+            burn_rate=round(error_rate / (1.0 - self._sla_target), 3),
+        )
+
+
+def _build_tracker() -> ErrorBudgetTracker:
+    from app.config.settings import settings
+    persist_path = settings.ERROR_BUDGET_SNAPSHOT_PATH or None
+    block = CounterBlock(settings.ERROR_BUDGET_SHARED_PATH or None, restore_from=persist_path)
+    tracker = ErrorBudgetTracker(
+        sla_target=0.999,
+        block=block,
+        persist_path=persist_path,
+        persist_interval_s=settings.ERROR_BUDGET_SNAPSHOT_INTERVAL_S,
+    )
+    if block.path or persist_path:
+        atexit.register(tracker.save)   # publish this worker's pending counts on shutdown
+    return tracker
 
 
 # Module-level singleton — shared across all middleware/handlers
-error_budget = ErrorBudgetTracker(sla_target=0.999)
+error_budget = _build_tracker()
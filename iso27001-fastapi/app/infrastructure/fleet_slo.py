@@ -0,0 +1,347 @@
+"""
+A.17: Fleet-wide SLO aggregation through Redis.
+
+Each worker accumulates per-minute deltas locally — request totals, 5xx, 4xx
+and DDSketch latency buckets — and a background thread flushes them every
+few seconds in one pipelined round-trip of HINCRBYs:
+
+  slo:{service}:m:{minute}  total/failed/client + sketch buckets   (TTL 2h)
+  slo:{service}:h:{hour}    total/failed/client                    (TTL 26h)
+  slo:{service}:d:{day}     total/failed/client                    (TTL 31d)
+
+Counters only ever increase, so concurrent flushes from every task merge
+without coordination. fleet_view() reads the keys back to compute the
+service-wide budget, burn rates and p95/p99. The request path only touches
+the local delta; when Redis is down deltas are kept (bounded) and retried,
+and callers fall back to the local view.
+"""
+from __future__ import annotations
+
+import atexit
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from app.infrastructure.error_budget import (
+    FAST_BURN_THRESHOLD,
+    SLOW_BURN_THRESHOLD,
+    ErrorBudgetSnapshot,
+    WindowStats,
+)
+from app.infrastructure.latency_sketch import DDSketch, LatencySummary, summarize
+
+MINUTE_TTL_S = 2 * 3600
+HOUR_TTL_S = 26 * 3600
+DAY_TTL_S = 31 * 86400
+MAX_PENDING_MINUTES = 60      # deltas kept while Redis is unreachable
+RECONNECT_INTERVAL_S = 30.0
+
+# window name → (key granularity, bucket count)
+FLEET_WINDOWS: dict[str, tuple[str, int]] = {
+    "5m": ("m", 5),
+    "30m": ("m", 30),
+    "1h": ("m", 60),
+    "6h": ("h", 6),      # hour resolution
+    "30d": ("d", 30),    # day resolution
+}
+QUANTILE_MINUTES = 5
+
+
+def _redis_client() -> Any:
+    """Return a redis.Redis client or None if unavailable."""
+    try:
+        import redis as _redis
+        from app.config.settings import settings
+
+        client = _redis.Redis.from_url(
+            settings.REDIS_URL, encoding="utf-8", decode_responses=True, socket_connect_timeout=0.5
+        )
+        client.ping()
+        return client
+    except Exception:
+        return None
+
+
+class _MinuteDelta:
+    __slots__ = ("total", "failed", "client", "zero", "bins")
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.failed = 0
+        self.client = 0
+        self.zero = 0
+        self.bins: dict[int, int] = {}
+
+    def absorb(self, other: _MinuteDelta) -> None:
+        self.total += other.total
+        self.failed += other.failed
+        self.client += other.client
+        self.zero += other.zero
+        for key, n in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + n
+
+
+@dataclass
+class FleetSnapshot:
+    source: str                      # "fleet" (merged from Redis) or "local" (this worker only)
+    sla_target: float
+    windows: dict[str, WindowStats]
+    budget_consumed_pct: float
+    budget_exhausted: bool
+    fast_burn: bool
+    slow_burn: bool
+    latency: LatencySummary
+    pending_minutes: int = 0         # unflushed local minutes (non-zero while Redis is down)
+    dropped_minutes: int = 0
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "source": self.source,
+            "sla_target": self.sla_target,
+            "budget_consumed_pct": self.budget_consumed_pct,
+            "budget_exhausted": self.budget_exhausted,
+            "fast_burn": self.fast_burn,
+            "slow_burn": self.slow_burn,
+            "windows": {name: w.to_dict() for name, w in self.windows.items()},
+            "latency": self.latency.to_dict(),
+            "pending_minutes": self.pending_minutes,
+            "dropped_minutes": self.dropped_minutes,
+        }
+
+
+class FleetAggregator:
+    """Local per-minute deltas flushed to Redis; fleet-wide view read back on demand."""
+
+    def __init__(
+        self,
+        service: str,
+        *,
+        enabled: bool = True,
+        sla_target: float = 0.999,
+        flush_interval_s: float = 5.0,
+        redis_factory: Callable[[], Any] = _redis_client,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.enabled = enabled
+        self._prefix = f"slo:{service}:"
+        self._sla_target = sla_target
+        self._flush_interval = flush_interval_s
+        self._redis_factory = redis_factory
+        self._clock = clock
+        self._keys = DDSketch()   # bucket mapping only — same accuracy as latency_tracker
+        self._pending: dict[int, _MinuteDelta] = {}
+        self._lock = threading.Lock()
+        self._client: Any = None
+        self._retry_at = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.dropped_minutes = 0
+
+    # ── Request path (local only) ──
+
+    def record(self, status_code: int, duration_ms: float) -> None:
+        if not self.enabled:
+            return
+        if self._thread is None:
+            self._start()
+        minute = int(self._clock() // 60)
+        key = self._keys.key(duration_ms)
+        with self._lock:
+            delta = self._pending.get(minute)
+            if delta is None:
+                delta = self._pending[minute] = _MinuteDelta()
+            delta.total += 1
+            if status_code >= 500:
+                delta.failed += 1
+            elif status_code >= 400:
+                delta.client += 1
+            if key is None:
+                delta.zero += 1
+            else:
+                delta.bins[key] = delta.bins.get(key, 0) + 1
+
+    # ── Flush ──
+
+    def flush(self) -> bool:
+        """Push pending deltas in one pipeline; False (deltas kept) if Redis is unavailable."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return True
+        client = self._redis()
+        if client is None:
+            self._requeue(pending)
+            return False
+        try:
+            pipe = client.pipeline(transaction=False)
+            for minute, delta in pending.items():
+                minute_key = f"{self._prefix}m:{minute}"
+                fields = {"total": delta.total, "failed": delta.failed, "client": delta.client, "z": delta.zero}
+                fields.update({f"b:{k}": n for k, n in delta.bins.items()})
+                for name, n in fields.items():
+                    if n:
+                        pipe.hincrby(minute_key, name, n)
+                pipe.expire(minute_key, MINUTE_TTL_S)
+                for key, ttl in (
+                    (f"{self._prefix}h:{minute // 60}", HOUR_TTL_S),
+                    (f"{self._prefix}d:{minute // 1440}", DAY_TTL_S),
+                ):
+                    pipe.hincrby(key, "total", delta.total)
+                    if delta.failed:
+                        pipe.hincrby(key, "failed", delta.failed)
+                    if delta.client:
+                        pipe.hincrby(key, "client", delta.client)
+                    pipe.expire(key, ttl)
+            pipe.execute()
+            return True
+        except Exception:
+            # A failed pipeline may have partially applied; re-sending risks a
+            # small over-count, dropping risks an under-count — prefer resend.
+            self._client = None
+            self._retry_at = time.monotonic() + RECONNECT_INTERVAL_S
+            self._requeue(pending)
+            return False
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    # ── Fleet view ──
+
+    def fleet_view(self) -> Optional[FleetSnapshot]:
+        """Service-wide SLO state merged from Redis; None when Redis is unavailable."""
+        client = self._redis()
+        if client is None:
+            return None
+        now_minute = int(self._clock() // 60)
+        buckets = {
+            "m": range(now_minute - 59, now_minute + 1),
+            "h": range(now_minute // 60 - 5, now_minute // 60 + 1),
+            "d": range(now_minute // 1440 - 29, now_minute // 1440 + 1),
+        }
+        try:
+            pipe = client.pipeline(transaction=False)
+            for granularity, ids in buckets.items():
+                for i in ids:
+                    pipe.hgetall(f"{self._prefix}{granularity}:{i}")
+            replies = pipe.execute()
+        except Exception:
+            self._client = None
+            self._retry_at = time.monotonic() + RECONNECT_INTERVAL_S
+            return None
+
+        hashes: dict[str, list[dict[str, str]]] = {}
+        offset = 0
+        for granularity, ids in buckets.items():
+            hashes[granularity] = [r or {} for r in replies[offset : offset + len(ids)]]   # oldest first
+            offset += len(ids)
+
+        windows = {
+            name: self._stats(hashes[granularity][-count:])
+            for name, (granularity, count) in FLEET_WINDOWS.items()
+        }
+        sketch = DDSketch()
+        for h in hashes["m"][-QUANTILE_MINUTES:]:
+            sketch.add_to_bucket(None, int(h.get("z", 0)))
+            for name, n in h.items():
+                if name.startswith("b:"):
+                    sketch.add_to_bucket(int(name[2:]), int(n))
+        with self._lock:
+            pending = len(self._pending)
+        return self._snapshot("fleet", windows, summarize(sketch), pending)
+
+    def local_view(self, budget: ErrorBudgetSnapshot, latency: LatencySummary) -> FleetSnapshot:
+        """Fallback built from this worker's own (or host-wide) counters."""
+        windows = {name: budget.windows[name] for name in FLEET_WINDOWS if name in budget.windows}
+        with self._lock:
+            pending = len(self._pending)
+        return self._snapshot("local", windows, latency, pending)
+
+    # ── helpers ──
+
+    def _snapshot(
+        self, source: str, windows: dict[str, WindowStats], latency: LatencySummary, pending: int
+    ) -> FleetSnapshot:
+        def burn(name: str) -> float:
+            return windows[name].burn_rate if name in windows else 0.0
+
+        budget = windows.get("30d")
+        consumed = 0.0
+        if budget is not None and budget.total_requests:
+            consumed = round(min(budget.error_rate / (1.0 - self._sla_target) * 100.0, 100.0), 2)
+        return FleetSnapshot(
+            source=source,
+            sla_target=self._sla_target,
+            windows=windows,
+            budget_consumed_pct=consumed,
+            budget_exhausted=consumed >= 100.0,
+            fast_burn=burn("1h") > FAST_BURN_THRESHOLD and burn("5m") > FAST_BURN_THRESHOLD,
+            slow_burn=burn("6h") > SLOW_BURN_THRESHOLD and burn("30m") > SLOW_BURN_THRESHOLD,
+            latency=latency,
+            pending_minutes=pending,
+            dropped_minutes=self.dropped_minutes,
+        )
+
+    def _stats(self, hashes: list[dict[str, str]]) -> WindowStats:
+        total = sum(int(h.get("total", 0)) for h in hashes)
+        failed = sum(int(h.get("failed", 0)) for h in hashes)
+        client = sum(int(h.get("client", 0)) for h in hashes)
+        error_rate = failed / total if total else 0.0
+        return WindowStats(
+            total_requests=total,
+            failed_requests=failed,
+            client_errors=client,
+            error_rate=round(error_rate, 6),
+            burn_rate=round(error_rate / (1.0 - self._sla_target), 3),
+        )
+
+    def _redis(self) -> Any:
+        if self._client is None and time.monotonic() >= self._retry_at:
+            self._client = self._redis_factory()
+            if self._client is None:
+                self._retry_at = time.monotonic() + RECONNECT_INTERVAL_S
+        return self._client
+
+    def _requeue(self, pending: dict[int, _MinuteDelta]) -> None:
+        with self._lock:
+            for minute, delta in pending.items():
+                current = self._pending.get(minute)
+                if current is None:
+                    self._pending[minute] = delta
+                else:
+                    current.absorb(delta)
+            overflow = len(self._pending) - MAX_PENDING_MINUTES
+            if overflow > 0:
+                for minute in sorted(self._pending)[:overflow]:
+                    del self._pending[minute]
+                self.dropped_minutes += overflow
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="fleet-slo-flush", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._flush_interval):
+            self.flush()
+
+
+def _build_aggregator() -> FleetAggregator:
+    from app.config.settings import settings
+    aggregator = FleetAggregator(
+        settings.APP_NAME,
+        enabled=settings.FLEET_SLO_ENABLED,
+        flush_interval_s=settings.FLEET_SLO_FLUSH_INTERVAL_S,
+    )
+    if aggregator.enabled:
+        atexit.register(aggregator.close)
+    return aggregator
+
+
+# Module-level singleton — fed by CorrelationIdMiddleware
+fleet_slo = _build_aggregator()
@@ -0,0 +1,217 @@
+"""
+A.17: Streaming latency quantiles — DDSketch-style mergeable sketches.
+
+A DDSketch maps each value x to the logarithmic bucket ceil(log_γ(x)) with
+γ = (1 + α) / (1 - α), so every quantile it returns is within relative error
+α of the true value, whatever the distribution. Buckets are plain integer
+counters: recording is one dict increment, and two sketches merge by adding
+counters — which is what makes per-slot rolling windows (and, later,
+cross-worker aggregation) cheap.
+
+Memory is bounded: with α = 1% the 10 µs – 60 s range needs ~780 buckets, and
+``max_bins`` collapses the lowest buckets if that is ever exceeded (only the
+low tail loses accuracy; p95/p99 are unaffected).
+"""
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, Optional
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BINS = 2048
+MIN_TRACKED_MS = 0.01   # values at or below this land in the zero bucket
+
+
+class DDSketch:
+    """Relative-error quantile sketch over positive values (not thread-safe)."""
+
+    __slots__ = ("relative_accuracy", "max_bins", "bins", "zero_count", "count", "_gamma", "_log_gamma")
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, max_bins: int = DEFAULT_MAX_BINS) -> None:
+        if not (0.0 < relative_accuracy < 1.0):
+            raise ValueError("relative_accuracy must be between 0 and 1 exclusive")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+    def key(self, value: float) -> Optional[int]:
+        """Bucket index for ``value``; None for the zero bucket."""
+        if value <= MIN_TRACKED_MS:
+            return None
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value: float, weight: int = 1) -> None:
+        self.add_to_bucket(self.key(value), weight)
+
+    def add_to_bucket(self, key: Optional[int], weight: int = 1) -> None:
+        """Add ``weight`` observations to bucket ``key`` (None = zero bucket)."""
+        self.count += weight
+        if key is None:
+            self.zero_count += weight
+            return
+        self.bins[key] = self.bins.get(key, 0) + weight
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def merge(self, other: DDSketch) -> None:
+        """Add ``other``'s counts into this sketch (same accuracy required)."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different relative accuracy")
+        for key, n in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile ``q`` in [0, 1]; None when the sketch is empty."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                # Bucket midpoint (in relative terms) — within α of every value in it
+                return 2 * self._gamma ** key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.bins) / (self._gamma + 1)
+
+    def _collapse(self) -> None:
+        keys = sorted(self.bins)
+        excess = keys[: len(keys) - self.max_bins + 1]
+        folded = sum(self.bins.pop(k) for k in excess)
+        target = keys[len(excess)]
+        self.bins[target] = self.bins.get(target, 0) + folded
+
+
+@dataclass(frozen=True)
+class LatencySummary:
+    count: int
+    p50_ms: Optional[float]
+    p95_ms: Optional[float]
+    p99_ms: Optional[float]
+
+    def to_dict(self) -> dict[str, object]:
+        def _r(v: Optional[float]) -> Optional[float]:
+            return None if v is None else round(v, 2)
+        return {"count": self.count, "p50_ms": _r(self.p50_ms), "p95_ms": _r(self.p95_ms), "p99_ms": _r(self.p99_ms)}
+
+
+def summarize(sketch: DDSketch) -> LatencySummary:
+    return LatencySummary(
+        count=sketch.count,
+        p50_ms=sketch.quantile(0.50),
+        p95_ms=sketch.quantile(0.95),
+        p99_ms=sketch.quantile(0.99),
+    )
+
+
+class RollingSketch:
+    """
+    Sliding-window sketch: a ring of per-slot sketches, merged on read.
+
+    Writers touch only the current slot under a short lock; stale slots are
+    reset lazily when the ring wraps around to them.
+    """
+
+    def __init__(
+        self,
+        window_s: float = 300.0,
+        slots: int = 5,
+        *,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._slot_s = window_s / slots
+        self._accuracy = relative_accuracy
+        self._clock = clock
+        self._sketches = [DDSketch(relative_accuracy) for _ in range(slots)]
+        self._epochs = [-1] * slots
+        self._lock = Lock()
+
+    def add(self, value_ms: float) -> None:
+        epoch = int(self._clock() // self._slot_s)
+        i = epoch % len(self._sketches)
+        with self._lock:
+            if self._epochs[i] != epoch:
+                self._sketches[i] = DDSketch(self._accuracy)
+                self._epochs[i] = epoch
+            self._sketches[i].add(value_ms)
+
+    def merged(self) -> DDSketch:
+        """All in-window observations as one sketch."""
+        oldest = int(self._clock() // self._slot_s) - len(self._sketches) + 1
+        out = DDSketch(self._accuracy)
+        with self._lock:
+            for epoch, sketch in zip(self._epochs, self._sketches):
+                if epoch >= oldest:
+                    out.merge(sketch)
+        return out
+
+
+class LatencyTracker:
+    """Rolling latency sketches for the whole service and for each route template."""
+
+    def __init__(
+        self,
+        window_s: float = 300.0,
+        slots: int = 5,
+        *,
+        max_routes: int = 512,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._window_s = window_s
+        self._slots = slots
+        self._max_routes = max_routes
+        self._clock = clock
+        self._overall = RollingSketch(window_s, slots, clock=clock)
+        self._routes: dict[str, RollingSketch] = {}
+        self._routes_lock = Lock()
+
+    @property
+    def window_s(self) -> float:
+        return self._window_s
+
+    def record(self, route: str, duration_ms: float) -> None:
+        self._overall.add(duration_ms)
+        sketch = self._routes.get(route)
+        if sketch is None:
+            with self._routes_lock:
+                sketch = self._routes.get(route)
+                if sketch is None:
+                    if len(self._routes) >= self._max_routes:
+                        return   # unbounded path labels — overall sketch still counts it
+                    sketch = self._routes[route] = RollingSketch(self._window_s, self._slots, clock=self._clock)
+        sketch.add(duration_ms)
+
+    def summary(self, route: Optional[str] = None) -> LatencySummary:
+        """p50/p95/p99 over the rolling window — overall, or for one route."""
+        if route is None:
+            return summarize(self._overall.merged())
+        sketch = self._routes.get(route)
+        return summarize(sketch.merged()) if sketch is not None else LatencySummary(0, None, None, None)
+
+    def route_summaries(self) -> dict[str, LatencySummary]:
+        with self._routes_lock:
+            routes = list(self._routes.items())
+        summaries = {route: summarize(sketch.merged()) for route, sketch in routes}
+        return {route: s for route, s in summaries.items() if s.count}
+
+
+def _build_tracker() -> LatencyTracker:
+    from app.config.settings import settings
+    return LatencyTracker(window_s=settings.LATENCY_WINDOW_S)
+
+
+# Module-level singleton — fed by CorrelationIdMiddleware
+latency_tracker = _build_tracker()
@@ -0,0 +1,193 @@
+"""
+A.9 / A.17: Two-tier principal cache for request authentication.
+
+get_current_user resolves the token subject to a Principal (id, role,
+email, is_active) instead of loading the User row on every request:
+
+  L1  in-process LRU, PRINCIPAL_CACHE_TTL_S per entry
+  L2  Redis (PRINCIPAL_CACHE_REDIS=true), PRINCIPAL_CACHE_SHARED_TTL_S,
+      shared by every worker; skipped silently while Redis is unreachable
+
+UserUpdated, UserDeactivated and UserDeleted events evict the user from
+this worker's L1 and from L2, so the next request reloads from the
+database. Other workers' L1 copies live at most PRINCIPAL_CACHE_TTL_S —
+keep it short; it bounds how long a deactivated user stays authenticated
+there.
+
+A load that raced an invalidation (read before the write committed,
+stored after the event) must not be cached. Locally, put() drops loads
+whose stamp() predates the eviction. Across workers, an eviction leaves an
+empty tombstone in Redis for TOMBSTONE_TTL_S and L2 writes are SET NX, so
+a racing load from another worker cannot repopulate L2 behind it.
+
+  principal_cache_lookups_total{tier, result}   l1|l2 × hit|miss
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from app.core.metrics import PRINCIPAL_CACHE_LOOKUPS
+from app.core.telemetry import logger
+from app.domain.users.events import DomainEvent
+from app.domain.users.principal import Principal
+
+_KEY_PREFIX = "principal:"
+RECONNECT_INTERVAL_S = 30.0
+TOMBSTONE_TTL_S = 5   # longer than any principal load takes
+
+
+def _redis_client() -> Any:
+    """Return a redis.Redis client or None if unavailable."""
+    try:
+        import redis as _redis
+        from app.config.settings import settings
+
+        client = _redis.Redis.from_url(
+            settings.REDIS_URL, encoding="utf-8", decode_responses=True, socket_connect_timeout=0.5
+        )
+        client.ping()
+        return client
+    except Exception:
+        return None
+
+
+class PrincipalCache:
+    """Per-worker LRU of principals over an optional shared Redis tier."""
+
+    def __init__(
+        self,
+        *,
+        ttl_s: float = 10.0,
+        max_entries: int = 10_000,
+        shared_ttl_s: float = 300.0,
+        redis_factory: Optional[Callable[[], Any]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl_s
+        self._max = max_entries
+        self._shared_ttl = shared_ttl_s
+        self._redis_factory = redis_factory
+        self._client: Any = None
+        self._retry_at = 0.0
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+        self._invalidated: OrderedDict[str, int] = OrderedDict()   # user id → stamp of last eviction
+        self._stamps = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0 and self._max > 0
+
+    @property
+    def shared(self) -> bool:
+        """True when an L2 is configured — its calls block on the network."""
+        return self.enabled and self._redis_factory is not None
+
+    def stamp(self) -> int:
+        """Take before loading a principal from the database; pass to put()."""
+        with self._lock:
+            return next(self._stamps)
+
+    def get(self, user_id: str, *, shared: bool = True) -> Optional[Principal]:
+        if not self.enabled:
+            return None
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                PRINCIPAL_CACHE_LOOKUPS.labels(tier="l1", result="hit").inc()
+                return entry[1]
+            if entry is not None:
+                del self._entries[user_id]
+        PRINCIPAL_CACHE_LOOKUPS.labels(tier="l1", result="miss").inc()
+        if not shared or self._redis_factory is None:
+            return None
+
+        stamp = self.stamp()
+        raw = self._call_redis(lambda r: r.get(_KEY_PREFIX + user_id))
+        PRINCIPAL_CACHE_LOOKUPS.labels(tier="l2", result="hit" if raw else "miss").inc()
+        if not raw:
+            return None
+        principal = Principal.from_dict(json.loads(raw))
+        self._store(principal, stamp)
+        return principal
+
+    def put(self, principal: Principal, stamp: int) -> None:
+        """Cache a principal loaded from the database (dropped if invalidated since ``stamp``)."""
+        if not self.enabled or not self._store(principal, stamp):
+            return
+        if self._redis_factory is not None:
+            payload = json.dumps(principal.to_dict())
+            self._call_redis(
+                lambda r: r.set(_KEY_PREFIX + principal.id, payload, ex=int(self._shared_ttl), nx=True)
+            )
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._invalidated[user_id] = next(self._stamps)
+            self._invalidated.move_to_end(user_id)
+            while len(self._invalidated) > self._max:
+                self._invalidated.popitem(last=False)
+        if self._redis_factory is not None:
+            self._call_redis(lambda r: r.set(_KEY_PREFIX + user_id, "", ex=TOMBSTONE_TTL_S))
+
+    def on_user_changed(self, event: DomainEvent) -> None:
+        """EventBus listener for UserUpdated / UserDeactivated / UserDeleted."""
+        user_id = getattr(event, "user_id", "")
+        if user_id:
+            self.invalidate(user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, principal: Principal, stamp: int) -> bool:
+        with self._lock:
+            if self._invalidated.get(principal.id, 0) > stamp:
+                return False
+            self._entries[principal.id] = (self._clock() + self._ttl, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+        return True
+
+    def _call_redis(self, op: Callable[[Any], Any]) -> Any:
+        client = self._redis()
+        if client is None:
+            return None
+        try:
+            return op(client)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("principal_cache.redis_unavailable", error=str(exc))
+            self._client = None
+            self._retry_at = time.monotonic() + RECONNECT_INTERVAL_S
+            return None
+
+    def _redis(self) -> Any:
+        if self._client is None and self._redis_factory is not None and time.monotonic() >= self._retry_at:
+            self._client = self._redis_factory()
+            if self._client is None:
+                self._retry_at = time.monotonic() + RECONNECT_INTERVAL_S
+        return self._client
+
+
+def _build_cache() -> PrincipalCache:
+    from app.config.settings import settings
+    return PrincipalCache(
+        ttl_s=settings.PRINCIPAL_CACHE_TTL_S if settings.PRINCIPAL_CACHE_ENABLED else 0.0,
+        max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+        shared_ttl_s=settings.PRINCIPAL_CACHE_SHARED_TTL_S,
+        redis_factory=_redis_client if settings.PRINCIPAL_CACHE_REDIS else None,
+    )
+
+
+# Module-level singleton — shared by every request in this process
+principal_cache = _build_cache()
@@ -0,0 +1,137 @@
+"""
+A.17: On-demand in-process sampling profiler.
+
+Samples the Python stack of every thread (including the event-loop thread)
+at a fixed interval via ``sys._current_frames()`` and aggregates the samples
+into collapsed stacks — one ``thread;outer;...;inner count`` line per unique
+stack, the input format of flamegraph.pl / speedscope — plus a top-N table of
+functions by self and total samples.
+
+Production safety:
+  - one profile at a time per process (a second caller gets ProfilerBusyError)
+  - duration capped at MAX_DURATION_S, stack depth at MAX_STACK_DEPTH
+  - the sampler measures its own cost and stretches the interval so that it
+    never spends more than CPU_BUDGET of wall time walking stacks
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Optional
+
+MAX_DURATION_S = 30.0
+MAX_STACK_DEPTH = 64
+DEFAULT_INTERVAL_S = 0.01
+CPU_BUDGET = 0.02   # fraction of wall time the sampler may spend on itself
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+
+@dataclass(frozen=True)
+class ProfileResult:
+    duration_s: float
+    samples: int
+    effective_interval_ms: float
+    collapsed: list[str] = field(default_factory=list)
+    top: list[dict[str, object]] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "duration_s": self.duration_s,
+            "samples": self.samples,
+            "effective_interval_ms": self.effective_interval_ms,
+            "top": self.top,
+            "collapsed": "\n".join(self.collapsed),
+        }
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    """Stack-sampling profiler; run() blocks the calling thread for the duration."""
+
+    def __init__(self, interval_s: float = DEFAULT_INTERVAL_S, max_depth: int = MAX_STACK_DEPTH) -> None:
+        self._interval = interval_s
+        self._max_depth = max_depth
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        duration_s: float,
+        *,
+        top_n: int = 20,
+        loop_thread_id: Optional[int] = None,
+    ) -> ProfileResult:
+        """Sample all threads for ``duration_s`` seconds (capped at MAX_DURATION_S)."""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("a profile is already running")
+        try:
+            return self._run(min(duration_s, MAX_DURATION_S), top_n, loop_thread_id)
+        finally:
+            self._lock.release()
+
+    def _run(self, duration_s: float, top_n: int, loop_thread_id: Optional[int]) -> ProfileResult:
+        own_id = threading.get_ident()
+        stacks: Counter[str] = Counter()
+        self_samples: Counter[str] = Counter()
+        total_samples: Counter[str] = Counter()
+        samples = 0
+        interval = self._interval
+        started = time.perf_counter()
+        deadline = started + duration_s
+
+        while time.perf_counter() < deadline:
+            tick = time.perf_counter()
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                labels = self._walk(frame)
+                if not labels:
+                    continue
+                thread = "event-loop" if thread_id == loop_thread_id else names.get(thread_id, str(thread_id))
+                stacks[";".join([thread, *labels])] += 1
+                self_samples[labels[-1]] += 1
+                for label in set(labels):
+                    total_samples[label] += 1
+            samples += 1
+            cost = time.perf_counter() - tick
+            # Stretch the interval whenever a sample costs more than the CPU budget allows
+            interval = max(self._interval, cost / CPU_BUDGET)
+            time.sleep(max(0.0, min(interval - cost, deadline - time.perf_counter())))
+
+        elapsed = time.perf_counter() - started
+        top = [
+            {"function": name, "self_samples": count, "total_samples": total_samples[name]}
+            for name, count in self_samples.most_common(top_n)
+        ]
+        return ProfileResult(
+            duration_s=round(elapsed, 3),
+            samples=samples,
+            effective_interval_ms=round(elapsed / samples * 1000, 3) if samples else 0.0,
+            collapsed=[f"{stack} {count}" for stack, count in stacks.most_common()],
+            top=top,
+        )
+
+    def _walk(self, frame: Optional[FrameType]) -> list[str]:
+        """Return frame labels outermost-first, truncated to the innermost max_depth."""
+        labels: list[str] = []
+        while frame is not None and len(labels) < self._max_depth:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        labels.reverse()
+        return labels
+
+
+# Module-level singleton — enforces one running profile per process
+profiler = SamplingProfiler()
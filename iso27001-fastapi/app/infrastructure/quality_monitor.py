@@ -0,0 +1,326 @@
+"""
+A.17: Background quality score and SLO alert computation.
+
+The request path only bumps cheap counters (QualitySignals): authentication
+checks passed/failed, audit writes attempted/committed, and — via the
+structured logger — log entries with and without a request correlation ID.
+Every QUALITY_MONITOR_INTERVAL_S a background task on the serving loop
+computes a QualitySnapshot off-loop:
+
+  security        auth checks passed / total          (trailing window)
+  data integrity  audit writes committed / attempted  (trailing window)
+  reliability     1 - 5xx rate over the last hour     (fleet view when available)
+  auditability    correlated log entries / total      (trailing window)
+  performance     observed p95 vs. target latency
+
+The snapshot (with its SloAlert) is appended to a bounded history ring,
+exported as Prometheus gauges and sent to CloudWatch in one batched call.
+/health/detailed reads the latest snapshot instead of computing one.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from app.core.metrics import (
+    ERROR_BUDGET_CONSUMED,
+    QUALITY_PILLAR_SCORE,
+    QUALITY_SCORE,
+    SLO_ALERT_ACTIVE,
+)
+from app.core.telemetry import logger
+from app.infrastructure.aws_telemetry import CloudWatchEmitter, cw_emitter
+from app.infrastructure.error_budget import ErrorBudgetSnapshot, ErrorBudgetTracker, error_budget
+from app.infrastructure.fleet_slo import FleetAggregator, FleetSnapshot, fleet_slo
+from app.infrastructure.latency_sketch import LatencySummary, LatencyTracker, latency_tracker
+from app.infrastructure.quality_score import QualityScore, QualityScoreCalculator, SloAlert
+
+TARGET_LATENCY_MS = 500.0    # p95 at which the performance pillar reaches 0
+RELIABILITY_WINDOW = "1h"    # error-rate window for the reliability pillar and 5xx/4xx alerts
+
+
+@dataclass(frozen=True)
+class SignalCounts:
+    """Cumulative counter values; subtract two readings to get a window."""
+    auth_passed: int = 0
+    auth_total: int = 0
+    audit_written: int = 0
+    audit_attempted: int = 0
+    logs_correlated: int = 0
+    logs_total: int = 0
+
+    def __sub__(self, other: SignalCounts) -> SignalCounts:
+        return SignalCounts(
+            auth_passed=self.auth_passed - other.auth_passed,
+            auth_total=self.auth_total - other.auth_total,
+            audit_written=self.audit_written - other.audit_written,
+            audit_attempted=self.audit_attempted - other.audit_attempted,
+            logs_correlated=self.logs_correlated - other.logs_correlated,
+            logs_total=self.logs_total - other.logs_total,
+        )
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "auth_passed": self.auth_passed,
+            "auth_total": self.auth_total,
+            "audit_written": self.audit_written,
+            "audit_attempted": self.audit_attempted,
+            "logs_correlated": self.logs_correlated,
+            "logs_total": self.logs_total,
+        }
+
+
+class QualitySignals:
+    """Thread-safe request-path tallies feeding the security and integrity pillars."""
+
+    def __init__(self, log_stats: Callable[[], tuple[int, int]] = logger.correlation_stats) -> None:
+        self._lock = threading.Lock()
+        self._log_stats = log_stats
+        self._auth_passed = 0
+        self._auth_total = 0
+        self._audit_written = 0
+        self._audit_attempted = 0
+
+    def auth_check(self, passed: bool) -> None:
+        """A.9: One credential or token verification."""
+        with self._lock:
+            self._auth_total += 1
+            if passed:
+                self._auth_passed += 1
+
+    def audit_write(self, committed: bool) -> None:
+        """A.12: One audit trail write attempt."""
+        with self._lock:
+            self._audit_attempted += 1
+            if committed:
+                self._audit_written += 1
+
+    def counts(self) -> SignalCounts:
+        logs_correlated, logs_total = self._log_stats()
+        with self._lock:
+            return SignalCounts(
+                auth_passed=self._auth_passed,
+                auth_total=self._auth_total,
+                audit_written=self._audit_written,
+                audit_attempted=self._audit_attempted,
+                logs_correlated=logs_correlated,
+                logs_total=logs_total,
+            )
+
+
+@dataclass(frozen=True)
+class QualitySnapshot:
+    computed_at: float           # epoch seconds
+    window_s: float              # span the signal ratios cover
+    signals: SignalCounts        # counts within the window
+    cumulative: SignalCounts     # raw counter values (baseline for later windows)
+    score: QualityScore
+    alert: SloAlert
+    budget: ErrorBudgetSnapshot
+    fleet: FleetSnapshot
+    latency: LatencySummary
+    route_latency: dict[str, LatencySummary]
+
+    @property
+    def timestamp(self) -> str:
+        return datetime.fromtimestamp(self.computed_at, timezone.utc).isoformat()
+
+    def history_entry(self) -> dict[str, object]:
+        """Compact form for the history series."""
+        return {
+            "timestamp": self.timestamp,
+            "composite": round(self.score.composite(), 4),
+            "security": self.score.security,
+            "data_integrity": self.score.data_integrity,
+            "reliability": self.score.reliability,
+            "auditability": self.score.auditability,
+            "performance": self.score.performance,
+            "budget_consumed_pct": self.fleet.budget_consumed_pct,
+            "any_breach": self.alert.any_breach(),
+        }
+
+
+class QualityMonitor:
+    """Recomputes the quality snapshot every ``interval_s`` and keeps a bounded history."""
+
+    def __init__(
+        self,
+        *,
+        signals: QualitySignals,
+        budget: ErrorBudgetTracker,
+        latency: LatencyTracker,
+        fleet: FleetAggregator,
+        emitter: Optional[CloudWatchEmitter] = None,
+        interval_s: float = 15.0,
+        window_s: float = 300.0,
+        history_size: int = 240,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._signals = signals
+        self._budget = budget
+        self._latency = latency
+        self._fleet = fleet
+        self._emitter = emitter
+        self._interval = interval_s
+        self._window = window_s
+        self._clock = clock
+        self._history: deque[QualitySnapshot] = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def start(self) -> None:
+        """Start the periodic computation on the running loop (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="quality-monitor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # Shard merges, the Redis round-trip and PutMetricData all block
+                await asyncio.to_thread(self.refresh)
+            except Exception as exc:  # noqa: BLE001
+                logger.error("quality_monitor.refresh_failed", error=str(exc))
+            await asyncio.sleep(self._interval)
+
+    # ── computation ──
+
+    def refresh(self) -> QualitySnapshot:
+        """Compute a snapshot from live counters, record it and export it."""
+        snapshot = self.compute()
+        with self._lock:
+            self._history.append(snapshot)
+        self._export(snapshot)
+        return snapshot
+
+    def compute(self) -> QualitySnapshot:
+        """Compute a snapshot from live counters without recording or exporting it."""
+        now = self._clock()
+        cumulative = self._signals.counts()
+        baseline, since = self._baseline(now)
+        window = cumulative - baseline
+
+        budget = self._budget.snapshot()
+        latency = self._latency.summary()
+        fleet = self._fleet.fleet_view() if self._fleet.enabled else None
+        if fleet is None:
+            fleet = self._fleet.local_view(budget, latency)
+        recent = fleet.windows.get(RELIABILITY_WINDOW)
+
+        calculator = QualityScoreCalculator(
+            sla_latency_p95_ms=fleet.latency.p95_ms or 0.0,
+            target_latency_ms=TARGET_LATENCY_MS,
+            sla_latency_p99_ms=fleet.latency.p99_ms or 0.0,
+        )
+        score = calculator.calculate(
+            auth_checks_passed=window.auth_passed,
+            auth_checks_total=window.auth_total,
+            audit_events_recorded=window.audit_written,
+            audit_events_expected=window.audit_attempted,
+            availability=1.0 - recent.error_rate if recent is not None else budget.observed_availability,
+            logs_with_correlation_id=window.logs_correlated,
+            total_logs=window.logs_total,
+        )
+        alert = calculator.slo_alert(
+            failed_requests=recent.failed_requests if recent is not None else 0,
+            client_errors=recent.client_errors if recent is not None else 0,
+            total_requests=recent.total_requests if recent is not None else 0,
+            fast_burn=fleet.fast_burn,
+            slow_burn=fleet.slow_burn,
+        )
+        return QualitySnapshot(
+            computed_at=now,
+            window_s=round(now - since, 3),
+            signals=window,
+            cumulative=cumulative,
+            score=score,
+            alert=alert,
+            budget=budget,
+            fleet=fleet,
+            latency=latency,
+            route_latency=self._latency.route_summaries(),
+        )
+
+    def _baseline(self, now: float) -> tuple[SignalCounts, float]:
+        """Newest recorded counters at least one window old (process start until one exists)."""
+        baseline: Optional[QualitySnapshot] = None
+        with self._lock:
+            for past in self._history:
+                if past.computed_at > now - self._window:
+                    break
+                baseline = past
+            if baseline is None and self._history and len(self._history) == self._history.maxlen:
+                baseline = self._history[0]   # history shorter than the window
+        if baseline is None:
+            return SignalCounts(), now - self._window
+        return baseline.cumulative, baseline.computed_at
+
+    def _export(self, snapshot: QualitySnapshot) -> None:
+        score, alert = snapshot.score, snapshot.alert
+        pillars = {
+            "security": score.security,
+            "data_integrity": score.data_integrity,
+            "reliability": score.reliability,
+            "auditability": score.auditability,
+            "performance": score.performance,
+        }
+        QUALITY_SCORE.set(score.composite())
+        for pillar, value in pillars.items():
+            QUALITY_PILLAR_SCORE.labels(pillar=pillar).set(value)
+        ERROR_BUDGET_CONSUMED.set(snapshot.fleet.budget_consumed_pct)
+        for signal, raised in alert.to_dict().items():
+            SLO_ALERT_ACTIVE.labels(signal=signal).set(1 if raised else 0)
+        if self._emitter is not None:
+            self._emitter.emit_quality_snapshot(
+                composite_score=score.composite(),
+                pillars=pillars,
+                budget_consumed_pct=snapshot.fleet.budget_consumed_pct,
+                slo_breach=alert.any_breach(),
+            )
+
+    # ── readers ──
+
+    def latest(self) -> Optional[QualitySnapshot]:
+        """Most recent snapshot, or None if it is older than two intervals (monitor not running)."""
+        with self._lock:
+            snapshot = self._history[-1] if self._history else None
+        if snapshot is None or self._clock() - snapshot.computed_at > 2 * self._interval:
+            return None
+        return snapshot
+
+    def history(self) -> list[QualitySnapshot]:
+        with self._lock:
+            return list(self._history)
+
+
+def _build_monitor() -> QualityMonitor:
+    from app.config.settings import settings
+    return QualityMonitor(
+        signals=quality_signals,
+        budget=error_budget,
+        latency=latency_tracker,
+        fleet=fleet_slo,
+        emitter=cw_emitter,
+        interval_s=settings.QUALITY_MONITOR_INTERVAL_S,
+        window_s=settings.QUALITY_WINDOW_S,
+        history_size=settings.QUALITY_HISTORY_SIZE,
+    )
+
+
+# Module-level singletons — signals fed by auth dependencies and AuditService;
+# the monitor is started and stopped by the application lifespan
+quality_signals = QualitySignals()
+quality_monitor = _build_monitor()
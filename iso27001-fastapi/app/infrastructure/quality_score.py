@@ -29,12 +29,14 @@ class SloAlert:
     A.17: SLO breach signals for alerting pipelines.
 
     Fields are set to True when the corresponding SLO threshold is exceeded.
-    All four signals are independent — any True value should trigger an alert.
+    All signals are independent — any True value should trigger an alert.
     """
     p95_latency_breached: bool   # observed P95 > SLO_P95_LATENCY_MS
     p99_latency_breached: bool   # observed P99 > SLO_P99_LATENCY_MS
     error_rate_breached: bool    # 5xx error rate > SLO_ERROR_RATE_PCT
     client_error_spike: bool     # 4xx rate > CLIENT_ERROR_SPIKE_PCT (abuse signal)
+    fast_burn: bool = False      # 1h and 5m budget burn rate > 14.4 (page)
+    slow_burn: bool = False      # 6h and 30m budget burn rate > 6 (ticket)
 
     def any_breach(self) -> bool:
         """True if at least one SLO is currently violated."""
@@ -43,6 +45,8 @@ class SloAlert:
             or self.p99_latency_breached
             or self.error_rate_breached
             or self.client_error_spike
+            or self.fast_burn
+            or self.slow_burn
         )
 
     def to_dict(self) -> dict[str, bool]:
@@ -52,6 +56,8 @@ class SloAlert:
             "p99_latency_breached": self.p99_latency_breached,
             "error_rate_breached": self.error_rate_breached,
             "client_error_spike": self.client_error_spike,
+            "fast_burn": self.fast_burn,
+            "slow_burn": self.slow_burn,
         }
 
 
@@ -166,10 +172,14 @@ class QualityScoreCalculator:
         failed_requests: int = 0,
         client_errors: int = 0,
         total_requests: int = 0,
+        fast_burn: bool = False,
+        slow_burn: bool = False,
     ) -> SloAlert:
         """
         A.17: Evaluate SLO breach conditions.
 
+        Burn-rate flags come from ErrorBudgetSnapshot (multi-window evaluation
+        needs the time-bucketed counts) and are passed through unchanged.
         Returns an SloAlert whose fields indicate which thresholds are violated.
         Wire this into your alerting pipeline: any_breach() == True → fire alert.
         """
@@ -181,6 +191,8 @@ class QualityScoreCalculator:
             p99_latency_breached=self._sla_latency_p99_ms > self.SLO_P99_LATENCY_MS,
             error_rate_breached=error_rate_pct > self.SLO_ERROR_RATE_PCT,
             client_error_spike=client_error_pct > self.CLIENT_ERROR_SPIKE_PCT,
+            fast_burn=fast_burn,
+            slow_burn=slow_burn,
         )
 
     # ── helpers ──────────────────────────────────────────────────────────────
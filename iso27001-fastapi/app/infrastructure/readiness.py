@@ -0,0 +1,230 @@
+"""
+A.17: Dependency readiness checks.
+
+Every dependency probe (database and replica ``SELECT 1``, Redis ``PING``) runs on a
+worker thread, all of them concurrently, each bounded by its own timeout.
+The combined report is cached for READINESS_CACHE_TTL_S and concurrent
+probes share one in-flight run, so a flood of load-balancer or kubelet
+probes costs one round of checks per interval.
+
+States:
+  check    ok | degraded | error
+  overall  ok       — every dependency answered
+           degraded — a non-critical dependency failed and its fallback is
+                      active (Redis down → in-process rate limiting/lockouts;
+                      a read replica down → its reads go to the primary)
+           down     — a critical dependency failed; respond 503
+
+A probe that times out keeps running on its thread; later rounds wait on
+that same probe instead of stacking new threads behind a hung dependency.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from sqlalchemy import text
+
+from app.core.telemetry import logger
+
+OK = "ok"
+DEGRADED = "degraded"
+ERROR = "error"
+DOWN = "down"
+HISTORY_SIZE = 20   # latency samples kept per dependency
+
+
+@dataclass(frozen=True)
+class DependencyCheck:
+    name: str
+    probe: Callable[[], None]    # blocking; raises on failure
+    timeout_s: float
+    critical: bool = True        # False: failure degrades the service instead of taking it down
+    fallback: str = ""           # reported while a non-critical dependency is failing
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    status: str
+    latency_ms: Optional[float]
+    detail: Optional[str] = None
+    recent_latency_ms: list[float] = field(default_factory=list)
+    consecutive_failures: int = 0
+
+    def to_dict(self) -> dict[str, object]:
+        out: dict[str, object] = {
+            "status": self.status,
+            "latency_ms": self.latency_ms,
+            "recent_latency_ms": self.recent_latency_ms,
+            "consecutive_failures": self.consecutive_failures,
+        }
+        if self.detail:
+            out["detail"] = self.detail
+        return out
+
+
+@dataclass(frozen=True)
+class ReadinessReport:
+    status: str
+    checks: dict[str, CheckResult]
+    checked_at: float            # clock() value when the round finished
+    timestamp: str
+
+    @property
+    def ready(self) -> bool:
+        return self.status != DOWN
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "status": self.status,
+            "checks": {name: result.to_dict() for name, result in self.checks.items()},
+            "checked_at": self.timestamp,
+        }
+
+
+class ReadinessChecker:
+    """Runs dependency checks concurrently and caches the combined report."""
+
+    def __init__(
+        self,
+        checks: list[DependencyCheck],
+        *,
+        ttl_s: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._checks = checks
+        self._ttl = ttl_s
+        self._clock = clock
+        self._cached: Optional[ReadinessReport] = None
+        self._inflight: Optional[asyncio.Future[ReadinessReport]] = None
+        self._probes: dict[str, asyncio.Future[None]] = {}
+        self._latency: dict[str, deque[float]] = {c.name: deque(maxlen=HISTORY_SIZE) for c in checks}
+        self._failures: dict[str, int] = {c.name: 0 for c in checks}
+
+    async def report(self) -> ReadinessReport:
+        cached = self._cached
+        if cached is not None and self._clock() - cached.checked_at < self._ttl:
+            return cached
+        inflight = self._inflight
+        if inflight is None or inflight.done() or inflight.get_loop() is not asyncio.get_running_loop():
+            inflight = self._inflight = asyncio.ensure_future(self._refresh())
+        # shield: a probe client hanging up must not cancel the shared round
+        return await asyncio.shield(inflight)
+
+    async def _refresh(self) -> ReadinessReport:
+        try:
+            results = await asyncio.gather(*(self._run(check) for check in self._checks))
+            checks = dict(zip((c.name for c in self._checks), results))
+            if any(c.critical and checks[c.name].status == ERROR for c in self._checks):
+                status = DOWN
+            elif any(r.status != OK for r in results):
+                status = DEGRADED
+            else:
+                status = OK
+            report = ReadinessReport(
+                status=status,
+                checks=checks,
+                checked_at=self._clock(),
+                timestamp=datetime.now(timezone.utc).isoformat(),
+            )
+            self._cached = report
+            return report
+        finally:
+            self._inflight = None
+
+    async def _run(self, check: DependencyCheck) -> CheckResult:
+        probe = self._probes.get(check.name)
+        if probe is None or probe.done() or probe.get_loop() is not asyncio.get_running_loop():
+            probe = self._probes[check.name] = asyncio.ensure_future(asyncio.to_thread(check.probe))
+            # a probe that outlives its timeout may fail unobserved — retrieve it
+            probe.add_done_callback(lambda f: f.cancelled() or f.exception())
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(probe), timeout=check.timeout_s)
+        except asyncio.TimeoutError:
+            return self._failed(check, "timeout")
+        except Exception as exc:
+            # A.12: exception text goes to the log only — the endpoint is unauthenticated
+            logger.error("health.dependency_check_failed", dependency=check.name, error=str(exc))
+            return self._failed(check, None)
+        latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        self._failures[check.name] = 0
+        self._latency[check.name].append(latency_ms)
+        return CheckResult(
+            status=OK,
+            latency_ms=latency_ms,
+            recent_latency_ms=list(self._latency[check.name]),
+        )
+
+    def _failed(self, check: DependencyCheck, reason: Optional[str]) -> CheckResult:
+        self._failures[check.name] += 1
+        details = [d for d in (reason, "" if check.critical else check.fallback) if d]
+        return CheckResult(
+            status=ERROR if check.critical else DEGRADED,
+            latency_ms=None,
+            detail="; ".join(details) or None,
+            recent_latency_ms=list(self._latency[check.name]),
+            consecutive_failures=self._failures[check.name],
+        )
+
+
+# ── Probes ───────────────────────────────────────────────────────────────────
+
+def database_probe(engine: Any) -> Callable[[], None]:
+    def probe() -> None:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    return probe
+
+
+def redis_probe(url: str, timeout_s: float) -> Callable[[], None]:
+    client: Any = None
+
+    def probe() -> None:
+        nonlocal client
+        if client is None:
+            import redis as _redis
+            client = _redis.Redis.from_url(url, socket_connect_timeout=timeout_s, socket_timeout=timeout_s)
+        client.ping()
+    return probe
+
+
+def _build_checker() -> ReadinessChecker:
+    from app.config.settings import settings
+    from app.core.database import engine, replicas
+    return ReadinessChecker(
+        [
+            DependencyCheck("database", database_probe(engine), settings.READINESS_DB_TIMEOUT_S),
+            *(
+                DependencyCheck(
+                    name,
+                    database_probe(replica),
+                    settings.READINESS_DB_TIMEOUT_S,
+                    critical=False,   # reads fall back to the primary
+                    fallback="reads served by primary",
+                )
+                for name, replica in replicas.named_engines
+            ),
+            DependencyCheck(
+                "redis",
+                redis_probe(settings.REDIS_URL, settings.READINESS_REDIS_TIMEOUT_S),
+                settings.READINESS_REDIS_TIMEOUT_S,
+                critical=False,   # rate limiting and lockouts fall back to in-process state
+                fallback="in-process fallback active",
+            ),
+        ],
+        ttl_s=settings.READINESS_CACHE_TTL_S,
+    )
+
+
+# Module-level singleton — shared by every readiness probe in this process
+readiness_checker = _build_checker()
+
+
+def get_readiness_checker() -> ReadinessChecker:
+    """FastAPI dependency (overridable in tests)."""
+    return readiness_checker
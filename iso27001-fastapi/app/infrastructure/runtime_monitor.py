@@ -0,0 +1,123 @@
+"""
+A.17: Event-loop lag and threadpool saturation monitor.
+
+A background task on the event loop sleeps for a fixed interval and measures
+how late it wakes up — the scheduling lag every coroutine on the loop is
+suffering (a sync Redis call or CPU-bound work on the loop shows up here).
+On each tick it also reads AnyIO's default thread limiter, which bounds the
+worker threads that run sync ``def`` routes: tokens in use and tasks waiting
+for one reveal when bcrypt or DB work has saturated the pool.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+import anyio.to_thread
+
+from app.core.metrics import (
+    EVENT_LOOP_LAG,
+    EVENT_LOOP_LAG_HISTOGRAM,
+    THREADPOOL_TASKS_WAITING,
+    THREADPOOL_TOKENS,
+    THREADPOOL_TOKENS_IN_USE,
+    THREADPOOL_WAITING_HISTOGRAM,
+)
+
+
+@dataclass
+class RuntimeSnapshot:
+    """Latest tick plus worst values over the recent window."""
+    running: bool
+    loop_lag_ms: float
+    loop_lag_max_ms: float
+    threadpool_tokens: float
+    threadpool_tokens_in_use: int
+    threadpool_tasks_waiting: int
+    threadpool_tasks_waiting_max: int
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "running": self.running,
+            "event_loop": {
+                "lag_ms": self.loop_lag_ms,
+                "lag_max_ms": self.loop_lag_max_ms,
+            },
+            "threadpool": {
+                "tokens": self.threadpool_tokens,
+                "tokens_in_use": self.threadpool_tokens_in_use,
+                "tasks_waiting": self.threadpool_tasks_waiting,
+                "tasks_waiting_max": self.threadpool_tasks_waiting_max,
+            },
+        }
+
+
+class RuntimeMonitor:
+    """Samples loop lag and threadpool tokens every ``interval_s`` seconds."""
+
+    def __init__(self, interval_s: float = 0.5, window: int = 120) -> None:
+        self._interval = interval_s
+        self._lags: deque[float] = deque(maxlen=window)
+        self._waiting: deque[int] = deque(maxlen=window)
+        self._tokens = 0.0
+        self._tokens_in_use = 0
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def start(self) -> None:
+        """Start sampling on the running loop (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="runtime-monitor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            scheduled = time.perf_counter()
+            await asyncio.sleep(self._interval)
+            self.sample(max(0.0, time.perf_counter() - scheduled - self._interval))
+
+    def sample(self, lag_s: float) -> None:
+        """Record one tick; must run on the event-loop thread (reads the loop's limiter)."""
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        stats = limiter.statistics()
+        self._tokens = limiter.total_tokens
+        self._tokens_in_use = stats.borrowed_tokens
+        self._lags.append(lag_s)
+        self._waiting.append(stats.tasks_waiting)
+
+        EVENT_LOOP_LAG.set(lag_s)
+        EVENT_LOOP_LAG_HISTOGRAM.observe(lag_s)
+        THREADPOOL_TOKENS.set(limiter.total_tokens)
+        THREADPOOL_TOKENS_IN_USE.set(stats.borrowed_tokens)
+        THREADPOOL_TASKS_WAITING.set(stats.tasks_waiting)
+        THREADPOOL_WAITING_HISTOGRAM.observe(stats.tasks_waiting)
+
+    def snapshot(self) -> RuntimeSnapshot:
+        return RuntimeSnapshot(
+            running=self._task is not None and not self._task.done(),
+            loop_lag_ms=round(self._lags[-1] * 1000, 2) if self._lags else 0.0,
+            loop_lag_max_ms=round(max(self._lags) * 1000, 2) if self._lags else 0.0,
+            threadpool_tokens=self._tokens,
+            threadpool_tokens_in_use=self._tokens_in_use,
+            threadpool_tasks_waiting=self._waiting[-1] if self._waiting else 0,
+            threadpool_tasks_waiting_max=max(self._waiting) if self._waiting else 0,
+        )
+
+
+def _build_monitor() -> RuntimeMonitor:
+    from app.config.settings import settings
+    return RuntimeMonitor(interval_s=settings.RUNTIME_MONITOR_INTERVAL_S)
+
+
+# Module-level singleton — started and stopped by the application lifespan
+runtime_monitor = _build_monitor()
@@ -0,0 +1,152 @@
+"""
+A.9: User-wide access-token revocation for stateless claims mode.
+
+With AUTH_STATELESS_CLAIMS on, get_current_user trusts an access token's
+sub/role/jti claims without reading the user, so a deactivated or deleted
+user's outstanding tokens would stay valid until they expire. The
+UserDeactivated and UserDeleted events record a revocation time per user;
+any token issued (iat) before it is rejected.
+
+A revocation only needs to outlive the tokens it cancels, so entries expire
+after JWT_ACCESS_TOKEN_EXPIRE_MINUTES. The check is a dict lookup; with
+AUTH_REVOCATION_REDIS the revocation is also written to Redis and every
+check reads it (one GET), so a revocation on one worker applies to all
+(settings refuse claims mode on several workers without it).
+
+Fail closed: while Redis is unreachable is_revoked() returns None
+("unknown") and get_current_user authenticates through the user lookup
+instead of the claims. A revocation that could not be written to Redis is
+logged as an error — other workers learn of the deactivation only through
+the user lookup.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from app.core.telemetry import logger
+from app.domain.users.events import DomainEvent
+
+_KEY_PREFIX = "revoked:"
+RECONNECT_INTERVAL_S = 30.0
+_UNAVAILABLE = object()   # Redis could not be reached (distinct from a missing key)
+
+
+def _redis_client() -> Any:
+    """Return a redis.Redis client or None if unavailable."""
+    try:
+        import redis as _redis
+        from app.config.settings import settings
+
+        client = _redis.Redis.from_url(
+            settings.REDIS_URL, encoding="utf-8", decode_responses=True, socket_connect_timeout=0.5
+        )
+        client.ping()
+        return client
+    except Exception:
+        return None
+
+
+class TokenRevocations:
+    """Per-user "not before" times for access tokens."""
+
+    def __init__(
+        self,
+        *,
+        window_s: float,
+        max_entries: int = 100_000,
+        redis_factory: Optional[Callable[[], Any]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._window = window_s
+        self._max = max_entries
+        self._redis_factory = redis_factory
+        self._client: Any = None
+        self._retry_at = 0.0
+        self._clock = clock
+        self._revoked: OrderedDict[str, float] = OrderedDict()   # user id → revoked at (epoch s)
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self) -> bool:
+        """True when checks read Redis — they block on the network."""
+        return self._redis_factory is not None
+
+    def revoke_user(self, user_id: str) -> None:
+        """Reject every access token issued to ``user_id`` until now."""
+        now = self._clock()
+        with self._lock:
+            self._revoked[user_id] = now
+            self._revoked.move_to_end(user_id)
+            while len(self._revoked) > self._max:
+                self._revoked.popitem(last=False)
+        if self._redis_factory is not None:
+            written = self._call_redis(
+                lambda r: r.set(_KEY_PREFIX + user_id, repr(now), ex=max(1, int(self._window)))
+            )
+            if written is _UNAVAILABLE:
+                logger.error("token_revocation.not_shared", user_id=user_id)
+
+    def is_revoked(self, user_id: str, issued_at: float) -> Optional[bool]:
+        """
+        Whether a token issued at ``issued_at`` is revoked; None when the
+        shared store is configured but unreachable and the answer is unknown.
+        """
+        revoked_at = self._local(user_id)
+        if revoked_at is None and self._redis_factory is not None:
+            raw = self._call_redis(lambda r: r.get(_KEY_PREFIX + user_id))
+            if raw is _UNAVAILABLE:
+                return None
+            revoked_at = float(raw) if raw else None
+        return revoked_at is not None and issued_at < revoked_at
+
+    def on_user_revoked(self, event: DomainEvent) -> None:
+        """EventBus listener for UserDeactivated / UserDeleted."""
+        user_id = getattr(event, "user_id", "")
+        if user_id:
+            self.revoke_user(user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._revoked.clear()
+
+    def _local(self, user_id: str) -> Optional[float]:
+        with self._lock:
+            revoked_at = self._revoked.get(user_id)
+            if revoked_at is not None and self._clock() - revoked_at > self._window:
+                del self._revoked[user_id]   # every token it covered has expired
+                return None
+            return revoked_at
+
+    def _call_redis(self, op: Callable[[Any], Any]) -> Any:
+        client = self._redis()
+        if client is None:
+            return _UNAVAILABLE
+        try:
+            return op(client)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("token_revocation.redis_unavailable", error=str(exc))
+            self._client = None
+            self._retry_at = time.monotonic() + RECONNECT_INTERVAL_S
+            return _UNAVAILABLE
+
+    def _redis(self) -> Any:
+        if self._client is None and self._redis_factory is not None and time.monotonic() >= self._retry_at:
+            self._client = self._redis_factory()
+            if self._client is None:
+                self._retry_at = time.monotonic() + RECONNECT_INTERVAL_S
+        return self._client
+
+
+def _build_revocations() -> TokenRevocations:
+    from app.config.settings import settings
+    return TokenRevocations(
+        window_s=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        redis_factory=_redis_client if settings.AUTH_REVOCATION_REDIS else None,
+    )
+
+
+# Module-level singleton — shared by every request in this process
+token_revocations = _build_revocations()
@@ -1,3 +1,7 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
@@ -5,15 +9,38 @@ from starlette.requests import Request as StarletteRequest
 
 from app.config.settings import settings
 from app.core.middleware import CorrelationIdMiddleware, RateLimitMiddleware, SecurityHeadersMiddleware
-from app.core.database import Base, engine
+from app.core.database import Base, engine, replicas, write_queue
 from app.core.events import event_bus
 from app.core.exceptions import APIError
 from app.core.metrics import get_metrics
+from app.core.query_metrics import query_monitor
 from app.domain.exceptions import ConflictError as DomainConflictError
 from app.core.responses import create_error_response
-from app.api.v1 import health, auth, users
-from app.domain.users.events import UserCreated
+from app.api.v1 import health, auth, auth_async, users, users_async
+from app.core.async_database import dispose_async_engine, get_async_engine, get_async_replica_engines
+from app.domain.users.events import UserCreated, UserDeactivated, UserDeleted, UserUpdated
 from app.infrastructure.audit import AuditLog, audit_listener
+from app.infrastructure.aws_telemetry import xray
+from app.infrastructure.principal_cache import principal_cache
+from app.infrastructure.token_revocation import token_revocations
+from app.infrastructure.quality_monitor import quality_monitor
+from app.infrastructure.runtime_monitor import runtime_monitor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start background monitors on the serving event loop; stop them on shutdown."""
+    await runtime_monitor.start()   # A.17: event-loop lag + threadpool saturation
+    await quality_monitor.start()   # A.17: periodic quality score / SLO alerts
+    try:
+        yield
+    finally:
+        await quality_monitor.stop()
+        await runtime_monitor.stop()
+        if write_queue is not None:
+            await asyncio.to_thread(write_queue.close)   # drain, commit and stop the writer thread
+        await dispose_async_engine()
+
 
 def create_app() -> FastAPI:
     # Create tables (for dev only - use Alembic in prod)
@@ -24,6 +51,7 @@ def create_app() -> FastAPI:
         version=settings.APP_VERSION,
         docs_url="/docs" if settings.APP_ENV != "production" else None,
         redoc_url=None,
+        lifespan=lifespan,
     )
 
     # Middleware Stack (added outermost to innermost — Starlette reverses order)
@@ -42,16 +70,30 @@ def create_app() -> FastAPI:
 
     # Routers
     app.include_router(health.router)
-    app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
-    app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
+    # A.17: DB_ASYNC serves users/auth on the event loop instead of the threadpool
+    app.include_router((auth_async if settings.DB_ASYNC else auth).router, prefix="/api/v1/auth", tags=["auth"])
+    app.include_router((users_async if settings.DB_ASYNC else users).router, prefix="/api/v1/users", tags=["users"])
 
     # Telemetry
+    engines = [engine, *replicas.engines]
+    if settings.DB_ASYNC:
+        engines.append(get_async_engine().sync_engine)   # events fire on the sync facade
+        engines.extend(replica.sync_engine for replica in get_async_replica_engines())
+    for instrumented in engines:
+        query_monitor.instrument_engine(instrumented)   # per-request query counts, slow-query log, N+1 flags
+        if xray.enabled:
+            xray.instrument_engine(instrumented)   # one X-Ray subsegment per SQL statement
+
     async def metrics_endpoint(request: StarletteRequest) -> Response:
-        return get_metrics()
+        return await get_metrics(request.headers.get("accept-encoding", ""))
     app.add_route("/metrics", metrics_endpoint)
 
     # Event Listeners
     event_bus.subscribe(UserCreated, audit_listener)
+    for changed in (UserUpdated, UserDeactivated, UserDeleted):
+        event_bus.subscribe(changed, principal_cache.on_user_changed)   # A.9: evict cached principals
+    for revoking in (UserDeactivated, UserDeleted):
+        event_bus.subscribe(revoking, token_revocations.on_user_revoked)   # A.9: stateless-mode tokens
 
     # Global Exception Handler (A.14)
     @app.exception_handler(APIError)
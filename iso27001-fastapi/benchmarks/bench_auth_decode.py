@@ -0,0 +1,62 @@
+"""
+Benchmark: per-request authentication CPU without vs. with the verified-JWT cache.
+
+Run from iso27001-fastapi/:
+    python -m benchmarks.bench_auth_decode
+
+One access token is presented repeatedly, as a client does for the token's
+lifetime. "decode" is the token verification alone. The get_current_user
+rows are the whole dependency with its lookup served from memory: the
+principal cache (default mode) or the token claims (AUTH_STATELESS_CLAIMS),
+so no row touches the database. The "without" column runs with the decode
+cache disabled (JWT_DECODE_CACHE_SIZE=0).
+"""
+import timeit
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.config.security import ACCESS_TOKEN_TYP, create_access_token, decode_token
+from app.config.settings import settings
+from app.core.token_cache import VerifiedTokenCache
+from app.domain.users.principal import Principal
+from app.domain.users.repository import UserRepository
+from app.infrastructure.principal_cache import principal_cache
+
+USER_ID = "5b0f6c1e-8d1a-4c36-9a57-0f3e2b7d9c41"
+
+
+def _timed(fn: Callable[[], object], number: int) -> float:
+    return timeit.timeit(fn, number=number) / number * 1e6
+
+
+def main(number: int = 50_000) -> None:
+    token = create_access_token(USER_ID, role="viewer", jti="bench-jti")
+    repo = UserRepository(Session())
+    uncached, cached = VerifiedTokenCache(max_entries=0), VerifiedTokenCache()
+
+    def auth() -> object:
+        return deps.get_current_user(token, repo)
+
+    rows: list[tuple[str, Callable[[], object], Callable[[], object]]] = [
+        ("decode",
+         lambda: decode_token(token, expected_typ=ACCESS_TOKEN_TYP),
+         lambda: cached.decode(token, expected_typ=ACCESS_TOKEN_TYP)),
+        ("get_current_user", auth, auth),
+        ("  claims mode", auth, auth),
+    ]
+    print(f"{'path':<22}{'without µs':>12}{'with µs':>10}{'speed-up':>10}")
+    for name, before_fn, after_fn in rows:
+        settings.AUTH_STATELESS_CLAIMS = name.strip() == "claims mode"
+        # re-seeded per row: a run lasts several seconds, PRINCIPAL_CACHE_TTL_S is 10
+        principal_cache.put(Principal(id=USER_ID, role="viewer"), principal_cache.stamp())
+        deps.token_cache = uncached
+        before = _timed(before_fn, number)
+        deps.token_cache = cached
+        after = _timed(after_fn, number)
+        print(f"{name:<22}{before:>12.2f}{after:>10.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: StructuredLogger redaction — previous implementation vs. Redactor.
+
+Run from iso27001-fastapi/:
+    python -m benchmarks.bench_redaction
+
+Note: on contexts holding secrets inside lists the Redactor does strictly
+more work than the legacy code, which never descended into lists (and so
+leaked those secrets); the copies it makes there are the price of redacting.
+"""
+import timeit
+
+from app.core.redaction import Redactor
+from app.core.telemetry import StructuredLogger
+
+FIELDS = StructuredLogger.REDACTED_FIELDS
+
+
+def legacy_redact(data: dict[str, object]) -> dict[str, object]:
+    """The pre-Redactor implementation: rebuilds every dict, skips lists."""
+    return {
+        k: "[REDACTED]" if k.lower() in FIELDS
+        else legacy_redact(v) if isinstance(v, dict)  # type: ignore[arg-type]
+        else v
+        for k, v in data.items()
+    }
+
+
+# Representative contexts taken from the call sites in app/
+CONTEXTS: dict[str, dict[str, object]] = {
+    "request.started": {"method": "GET", "path": "/api/v1/users/123"},
+    "request.completed": {"status_code": 200, "duration_ms": 12.34},
+    "auth.failed": {"email": "someone@example.com"},
+    "audit": {
+        "user_id": "7f1c2a", "action": "user.created", "audited_at": "2026-01-01T00:00:00+00:00",
+        "resource_id": "7f1c2a",
+    },
+    "nested-clean": {
+        "request": {"headers": {"Accept": "application/json", "User-Agent": "curl/8"}},
+        "changes": [{"field": "full_name", "old": "A", "new": "B"}],
+    },
+    "nested-with-secret": {
+        "request": {"headers": {"Authorization": "Bearer abc", "Accept": "application/json"}},
+        "attempts": [{"email": "a@b.c", "password": "x"}],
+    },
+}
+
+
+def main(number: int = 200_000) -> None:
+    redactor = Redactor(FIELDS)
+    print(f"{'context':<22}{'legacy µs':>12}{'redactor µs':>14}{'speed-up':>10}")
+    for name, ctx in CONTEXTS.items():
+        legacy = timeit.timeit(lambda: legacy_redact(ctx), number=number) / number * 1e6
+        new = timeit.timeit(lambda: redactor.redact_dict(ctx), number=number) / number * 1e6
+        print(f"{name:<22}{legacy:>12.3f}{new:>14.3f}{legacy / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Load test: sync (threadpool) vs. async (DB_ASYNC) users/auth routes, side by side.
+
+Run from iso27001-fastapi/ (needs the "async" and "dev" extras):
+    python -m benchmarks.load_db_modes --requests 2000 --concurrency 32
+
+Each mode gets a fresh app instance driven in-process through httpx's ASGI
+transport. A user is registered and logged in once; the workload is then
+GET /api/v1/users/me (JWT decode plus one primary-key lookup) at the given
+concurrency. Sync routes hold one of AnyIO's 40 worker-thread tokens per
+in-flight request; async routes hold none.
+
+Sync requests beyond DB_POOL_SIZE + DB_MAX_OVERFLOW queue for a session
+slot on the event loop (database.DB_SESSION_SLOTS) rather than in pool
+checkout on a worker thread, so high --concurrency measures queueing, not
+pool timeouts.
+
+The per-IP rate limiter is removed from the benchmarked apps — every
+request comes from the same client address and would be throttled.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+from app.config.settings import settings
+from app.core.middleware import RateLimitMiddleware
+from app.main import create_app
+
+PASSWORD = "Bench-Passw0rd!"
+
+
+async def _token(client: httpx.AsyncClient) -> str:
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    created = await client.post("/api/v1/users/", json={"email": email, "password": PASSWORD})
+    created.raise_for_status()
+    response = await client.post("/api/v1/auth/token", data={"username": email, "password": PASSWORD})
+    response.raise_for_status()
+    return str(response.json()["access_token"])
+
+
+async def run_mode(use_async: bool, requests: int, concurrency: int) -> dict[str, float]:
+    settings.DB_ASYNC = use_async
+    app = create_app()
+    app.user_middleware = [m for m in app.user_middleware if m.cls is not RateLimitMiddleware]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers = {"Authorization": f"Bearer {await _token(client)}"}
+        latencies: list[float] = []
+        errors = 0
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        for i in range(requests):
+            queue.put_nowait(i)
+
+        async def worker() -> None:
+            nonlocal errors
+            while not queue.empty():
+                queue.get_nowait()
+                started = time.perf_counter()
+                response = await client.get("/api/v1/users/me", headers=headers)
+                latencies.append((time.perf_counter() - started) * 1000)
+                errors += response.status_code != 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--only", choices=["sync", "async"])
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, use_async in (("sync", False), ("async", True)):
+        if args.only and args.only != name:
+            continue
+        result = asyncio.run(run_mode(use_async, args.requests, args.concurrency))
+        print(
+            f"{name:<8}{result['rps']:>10.0f}{result['p50_ms']:>10.2f}"
+            f"{result['p99_ms']:>10.2f}{result['errors']:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Integration tests for the async users/auth routes (DB_ASYNC=true)."""
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+pytest.importorskip("aiosqlite")
+
+from app.config.settings import settings  # noqa: E402
+from app.main import create_app  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "DB_ASYNC", True)
+    with TestClient(create_app()) as c:
+        yield c
+
+
+def _register_and_login(client: TestClient) -> tuple[str, str]:
+    email = f"async-{uuid.uuid4().hex[:12]}@example.com"
+    response = client.post(
+        "/api/v1/users/", json={"email": email, "password": "Sup3r-secret!", "full_name": "Async User"}
+    )
+    assert response.status_code == 201, response.text
+    token = client.post("/api/v1/auth/token", data={"username": email, "password": "Sup3r-secret!"})
+    assert token.status_code == 200, token.text
+    return response.json()["id"], token.json()["access_token"]
+
+
+class TestAsyncRoutes:
+    def test_register_login_and_read_profile(self, client):
+        user_id, token = _register_and_login(client)
+        response = client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+        assert response.json()["id"] == user_id
+
+    def test_owner_can_update_and_viewer_cannot_list(self, client):
+        user_id, token = _register_and_login(client)
+        headers = {"Authorization": f"Bearer {token}"}
+        response = client.patch(f"/api/v1/users/{user_id}", json={"full_name": "Renamed"}, headers=headers)
+        assert response.status_code == 200
+        assert response.json()["full_name"] == "Renamed"
+        assert client.get("/api/v1/users/", headers=headers).status_code == 403
+
+    def test_wrong_password_is_rejected(self, client):
+        email = f"async-{uuid.uuid4().hex[:12]}@example.com"
+        client.post("/api/v1/users/", json={"email": email, "password": "Sup3r-secret!", "full_name": "X"})
+        response = client.post("/api/v1/auth/token", data={"username": email, "password": "wrong-password"})
+        assert response.status_code == 401
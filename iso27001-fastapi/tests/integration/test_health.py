@@ -4,21 +4,24 @@ from fastapi.testclient import TestClient
 from unittest.mock import MagicMock
 
 from app.main import app
-from app.core.database import get_db
+from app.core.query_metrics import assert_max_queries
+from app.infrastructure.readiness import DependencyCheck, ReadinessChecker, get_readiness_checker
 
 
-def _mock_db_ok():
-    """Dependency override: DB responds to SELECT 1."""
-    session = MagicMock()
-    session.execute.return_value = None
-    yield session
+def _ok() -> None:
+    """Probe: dependency answers."""
 
 
-def _mock_db_error():
-    """Dependency override: DB raises an exception."""
-    session = MagicMock()
-    session.execute.side_effect = Exception("connection refused")
-    yield session
+def _refused() -> None:
+    """Probe: dependency raises an exception."""
+    raise ConnectionError("connection refused")
+
+
+def _checker(database, redis) -> ReadinessChecker:
+    return ReadinessChecker([
+        DependencyCheck("database", database, timeout_s=1.0),
+        DependencyCheck("redis", redis, timeout_s=1.0, critical=False, fallback="in-process fallback active"),
+    ])
 
 
 @pytest.fixture
@@ -27,20 +30,26 @@ def client():
         yield c
 
 
-@pytest.fixture
-def client_db_ok():
-    app.dependency_overrides[get_db] = _mock_db_ok
+def _client_with(checker: ReadinessChecker):
+    app.dependency_overrides[get_readiness_checker] = lambda: checker
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def client_db_ok():
+    yield from _client_with(_checker(_ok, _ok))
+
+
 @pytest.fixture
 def client_db_error():
-    app.dependency_overrides[get_db] = _mock_db_error
-    with TestClient(app) as c:
-        yield c
-    app.dependency_overrides.clear()
+    yield from _client_with(_checker(_refused, _ok))
+
+
+@pytest.fixture
+def client_redis_error():
+    yield from _client_with(_checker(_ok, _refused))
 
 
 class TestHealthEndpoints:
@@ -70,5 +79,23 @@ class TestHealthEndpoints:
         response = client_db_error.get("/health/ready")
         assert response.status_code == 503
         data = response.json()
-        assert data["status"] == "degraded"
+        assert data["status"] == "down"
         assert data["checks"]["database"]["status"] == "error"
+
+    def test_readiness_redis_error_is_degraded(self, client_redis_error):
+        response = client_redis_error.get("/health/ready")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "degraded"
+        assert data["checks"]["redis"]["status"] == "degraded"
+        assert data["checks"]["redis"]["detail"] == "in-process fallback active"
+
+
+class TestQueryBudgets:
+    def test_liveness_runs_no_queries(self, client):
+        with assert_max_queries(0):
+            assert client.get("/health").status_code == 200
+
+    def test_readiness_runs_one_query(self, client):
+        with assert_max_queries(1):
+            client.get("/health/ready")
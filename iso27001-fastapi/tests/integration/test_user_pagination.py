@@ -0,0 +1,66 @@
+"""Integration tests for cursor pagination on GET /api/v1/users/."""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.deps import get_current_user
+from app.core.database import get_db
+from app.domain.persistence import Base
+from app.domain.users.models import User
+from app.domain.users.principal import Principal
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    sessions = sessionmaker(bind=engine)
+    with sessions() as db:
+        for i in range(25):
+            db.add(User(email=f"page-{i}@example.com", hashed_password="x",
+                        created_at=datetime(2026, 1, 1) + timedelta(minutes=i)))
+        db.commit()
+
+    def _db():
+        with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = _db
+    app.dependency_overrides[get_current_user] = lambda: Principal(id="admin", role="admin")
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.clear()
+
+
+def test_offset_mode_still_returns_a_list(client):
+    response = client.get("/api/v1/users/?skip=20&limit=10")
+    assert response.status_code == 200
+    assert [u["email"] for u in response.json()] == [f"page-{i}@example.com" for i in range(20, 25)]
+
+
+def test_cursor_mode_follows_next_and_prev_links(client):
+    body = client.get("/api/v1/users/?pagination=cursor&limit=10").json()
+    assert body["meta"]["per_page"] == 10 and body["links"]["prev"] is None
+    emails = [u["email"] for u in body["data"]]
+    while body["links"]["next"]:
+        body = client.get(body["links"]["next"]).json()
+        emails += [u["email"] for u in body["data"]]
+    assert emails == [f"page-{i}@example.com" for i in range(25)]
+
+    body = client.get(body["links"]["prev"]).json()
+    assert [u["email"] for u in body["data"]] == [f"page-{i}@example.com" for i in range(10, 20)]
+    assert "limit=10" in body["links"]["next"]
+
+
+def test_tampered_cursor_is_rejected(client):
+    cursor = client.get("/api/v1/users/?pagination=cursor&limit=5").json()["meta"]["next_cursor"]
+    body, sig = cursor.split(".")
+    forged = f"{body}.{'A' if sig[0] != 'A' else 'B'}{sig[1:]}"
+    response = client.get(f"/api/v1/users/?cursor={forged}")
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "VALIDATION_ERROR"
@@ -0,0 +1,32 @@
+"""Fixtures shared by the unit tests."""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.events import EventBus
+from app.domain.persistence import Base
+from app.domain.users.repository import UserRepository
+from app.domain.users.service import UserService
+
+
+@pytest.fixture
+def db():
+    """Session on a fresh in-memory user store; ``db.info["statements"]`` collects the SQL it runs."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cur, sql, *a: statements.append(sql))
+    with sessionmaker(bind=engine, expire_on_commit=False)() as session:
+        session.info["statements"] = statements
+        yield session
+
+
+@pytest.fixture
+def bus():
+    return EventBus()
+
+
+@pytest.fixture
+def service(db, bus):
+    return UserService(UserRepository(db), bus=bus, password_hasher=lambda p: "hashed")
+
@@ -0,0 +1,55 @@
+"""Test doubles shared by the unit tests."""
+from typing import Any, Optional
+
+from app.domain.users.schemas import CreateUserRequest
+from app.domain.users.service import UserService
+
+PASSWORD = "Sup3r-secret!x"
+
+
+class Clock:
+    """Settable clock to inject where code takes ``clock=time.time`` / ``time.monotonic``."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.Redis string commands; ``down`` simulates an outage."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self.ttls: dict[str, int] = {}
+        self.down = False
+
+    def get(self, key: str) -> Optional[str]:
+        self._check()
+        return self.data.get(key)
+
+    def set(self, key: str, value: str, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        self._check()
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        if ex is not None:
+            self.ttls[key] = ex
+        return True
+
+    def _check(self) -> None:
+        if self.down:
+            raise ConnectionError("redis down")
+
+
+def create_user(service: UserService, email: str) -> str:
+    """Register a user through the service and return its id."""
+    return str(service.create_user(CreateUserRequest(email=email, password=PASSWORD)).id)
+
+
+def statements(db: Any) -> list[str]:
+    """First keyword of each statement run on the ``db`` fixture since the last call."""
+    executed = [sql.split()[0] for sql in db.info["statements"]]
+    db.info["statements"].clear()
+    return executed
@@ -0,0 +1,77 @@
+"""Unit tests for the async user repository and engine URL mapping."""
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.core.async_database import async_url  # noqa: E402
+from app.core.write_queue import WriteQueue  # noqa: E402
+from app.domain.exceptions import ConflictError  # noqa: E402
+from app.domain.persistence import Base  # noqa: E402
+from app.domain.users.models import User  # noqa: E402
+from app.domain.users.repository import AsyncUserRepository  # noqa: E402
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("sqlite:///./dev.db", "sqlite+aiosqlite:///./dev.db"),
+    ("postgresql://app:pw@db:5432/app", "postgresql+asyncpg://app:pw@db:5432/app"),
+    ("postgresql+psycopg2://app@db/app", "postgresql+asyncpg://app@db/app"),
+])
+def test_async_url_swaps_driver(url, expected):
+    assert async_url(url) == expected
+
+
+def test_async_url_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        async_url("oracle://scott@db/orcl")
+
+
+@pytest.mark.asyncio
+async def test_repository_round_trip():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with sessions() as db:
+        repo = AsyncUserRepository(db)
+        user = await repo.add(User(email="a@example.com", hashed_password="x", full_name="A"))
+        assert await repo.exists_by_email("a@example.com")
+        assert not await repo.exists_by_email("b@example.com")
+        assert (await repo.get_by_email("a@example.com")).id == user.id
+        assert (await repo.get_by_id(user.id)).email == "a@example.com"
+        assert [u.id for u in await repo.get_all(0, 10)] == [user.id]
+        assert (await repo.update(user.id, {"full_name": "B"})).full_name == "B"
+        user_id = user.id   # the conflict's rollback below expires loaded objects
+        with pytest.raises(ConflictError):
+            await repo.add(User(email="a@example.com", hashed_password="x"))
+        assert await repo.delete_by_id(user_id)
+        assert not await repo.delete_by_id(user_id)
+        assert await repo.get_by_id(user_id) is None
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_repository_writes_through_the_queued_writer(tmp_path, monkeypatch):
+    path = tmp_path / "queued.db"
+    sync_engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(sync_engine)
+    writer = WriteQueue(sessionmaker(bind=sync_engine, expire_on_commit=False))
+    monkeypatch.setattr(database, "write_queue", writer)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        repo = AsyncUserRepository(db, write=database.queued_async_writer(db))
+        user = await repo.add(User(email="a@example.com", hashed_password="x"))
+        with pytest.raises(ConflictError):
+            await repo.add(User(email="a@example.com", hashed_password="x"))
+        assert (await repo.update(user.id, {"full_name": "B"})).full_name == "B"
+        assert (await repo.get_by_id(user.id)).full_name == "B"   # committed by the writer
+        assert await repo.delete_by_id(user.id)
+    writer.close()
+    await engine.dispose()
+    sync_engine.dispose()
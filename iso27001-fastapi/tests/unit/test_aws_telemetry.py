@@ -0,0 +1,101 @@
+"""Unit tests for the CloudWatch Embedded Metric Format transport."""
+import io
+import json
+
+from app.infrastructure.aws_telemetry import CloudWatchEmitter, EmfWriter
+
+
+def _emitter(stream: io.StringIO) -> CloudWatchEmitter:
+    writer = EmfWriter("Test/API", flush_interval_s=3600, stream=stream)
+    return CloudWatchEmitter("svc", "test", transport="emf", emf_writer=writer)
+
+
+def _documents(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def _assert_valid_emf(doc: dict) -> None:
+    directive = doc["_aws"]
+    assert isinstance(directive["Timestamp"], int)
+    for block in directive["CloudWatchMetrics"]:
+        assert block["Namespace"] == "Test/API"
+        for dimension_set in block["Dimensions"]:
+            for dimension in dimension_set:
+                assert isinstance(doc[dimension], str)
+        assert 1 <= len(block["Metrics"]) <= 100
+        for metric in block["Metrics"]:
+            values = doc[metric["Name"]]
+            assert isinstance(values, list) and 1 <= len(values) <= 100
+            assert all(isinstance(v, (int, float)) for v in values)
+
+
+def test_nothing_written_until_flush():
+    stream = io.StringIO()
+    emitter = _emitter(stream)
+    emitter.emit_auth_failure()
+    assert stream.getvalue() == ""
+    emitter.flush()
+    assert len(_documents(stream)) == 1
+
+
+def test_every_emit_method_produces_valid_emf():
+    stream = io.StringIO()
+    emitter = _emitter(stream)
+    emitter.emit_request(method="GET", path="/health", status_code=503, duration_ms=12.5)
+    emitter.emit_auth_failure()
+    emitter.emit_rate_limit_hit()
+    emitter.emit_error_budget(42.0)
+    emitter.emit_quality_score(0.9)
+    emitter.flush()
+
+    docs = _documents(stream)
+    names = set()
+    for doc in docs:
+        _assert_valid_emf(doc)
+        assert doc["Service"] == "svc"
+        assert doc["Environment"] == "test"
+        for block in doc["_aws"]["CloudWatchMetrics"]:
+            names.update(m["Name"] for m in block["Metrics"])
+    assert names == {
+        "RequestCount", "RequestLatency", "ServerErrors", "AuthFailures",
+        "RateLimitHits", "ErrorBudgetConsumedPct", "QualityScore",
+    }
+
+
+def test_datapoints_are_batched_per_dimension_set():
+    stream = io.StringIO()
+    emitter = _emitter(stream)
+    for duration in (1.0, 2.0, 3.0):
+        emitter.emit_request(method="GET", path="/x", status_code=200, duration_ms=duration)
+    emitter.flush()
+
+    latency = [d for d in _documents(stream) if "RequestLatency" in d]
+    assert len(latency) == 1
+    assert latency[0]["RequestLatency"] == [1.0, 2.0, 3.0]
+    assert latency[0]["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["Service", "Environment", "Path"]]
+
+
+def test_value_arrays_are_split_at_spec_limit():
+    stream = io.StringIO()
+    emitter = _emitter(stream)
+    for _ in range(250):
+        emitter.emit_auth_failure()
+    emitter.flush()
+
+    docs = _documents(stream)
+    for doc in docs:
+        _assert_valid_emf(doc)
+    assert sum(len(d["AuthFailures"]) for d in docs) == 250
+
+
+def test_single_datapoint_and_one_value_remainder_are_arrays():
+    stream = io.StringIO()
+    emitter = _emitter(stream)
+    emitter.emit_quality_score(0.9)
+    for _ in range(101):
+        emitter.emit_auth_failure()
+    emitter.flush()
+
+    docs = _documents(stream)
+    assert [d["QualityScore"] for d in docs if "QualityScore" in d] == [[90.0]]
+    assert [len(d["AuthFailures"]) for d in docs if "AuthFailures" in d] == [100, 1]
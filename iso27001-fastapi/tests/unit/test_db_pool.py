@@ -0,0 +1,103 @@
+"""Unit tests for the settings-driven, instrumented connection pool."""
+import asyncio
+import time
+
+import anyio
+import anyio.to_thread
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core import database
+from app.core.db_pool import InstrumentedQueuePool, engine_options, instrumented_pool
+from app.core.metrics import DB_POOL_CHECKED_OUT, DB_POOL_EXHAUSTED
+from app.core.database import engine
+from app.main import app
+
+
+def test_options_come_from_settings():
+    options = engine_options("sqlite:///./pool.db", target="replica")
+    assert issubclass(options["poolclass"], InstrumentedQueuePool)
+    assert options["poolclass"].target == "replica"
+    assert {"pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"} <= options.keys()
+
+
+def test_in_memory_sqlite_keeps_default_pool():
+    options = engine_options("sqlite://")
+    assert "poolclass" not in options
+    assert options["connect_args"] == {"check_same_thread": False}
+
+
+def test_exhaustion_is_counted_and_occupancy_exported(tmp_path):
+    pool_engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=instrumented_pool("test"),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    exhausted = DB_POOL_EXHAUSTED.labels(target="test")
+    before = exhausted._value.get()
+    with pool_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert DB_POOL_CHECKED_OUT.labels(target="test")._value.get() == 1
+        with pytest.raises(exc.TimeoutError):
+            pool_engine.connect()
+    assert exhausted._value.get() == before + 1
+    assert DB_POOL_CHECKED_OUT.labels(target="test")._value.get() == 0
+    pool_engine.dispose()
+    assert isinstance(pool_engine.pool, InstrumentedQueuePool)   # recreate() keeps the class
+
+
+def test_rejected_request_never_checks_out_a_connection():
+    checkouts = []
+
+    def on_checkout(*args):
+        checkouts.append(1)
+
+    event.listen(engine, "checkout", on_checkout)
+    try:
+        with TestClient(app) as client:
+            checkouts.clear()   # app startup (lifespan) may have used the pool
+            response = client.get("/api/v1/users/me", headers={"Authorization": "Bearer not-a-jwt"})
+        assert response.status_code == 401
+        assert checkouts == []
+    finally:
+        event.remove(engine, "checkout", on_checkout)
+
+
+@pytest.mark.asyncio
+async def test_session_slots_keep_sync_requests_from_stalling_on_the_pool(tmp_path, monkeypatch):
+    small = create_engine(
+        f"sqlite:///{tmp_path / 'slots.db'}",
+        poolclass=instrumented_pool("slots"),
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=2,
+        connect_args={"check_same_thread": False},
+    )
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=small))
+    monkeypatch.setattr(database, "DB_SESSION_SLOTS", 2)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 4
+
+    def lookup(db=Depends(database.get_db)) -> int:   # holds its connection until get_db closes
+        return db.scalar(text("SELECT 1"))
+
+    probe = FastAPI()
+
+    @probe.get("/probe")
+    def handler(value: int = Depends(lookup)) -> int:   # needs a worker thread again
+        time.sleep(0.01)
+        return value
+
+    transport = httpx.ASGITransport(app=probe)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        started = time.perf_counter()
+        with anyio.fail_after(10):
+            responses = await asyncio.gather(*(client.get("/probe") for _ in range(16)))
+    assert [r.status_code for r in responses] == [200] * 16
+    assert time.perf_counter() - started < 1.5   # well under pool_timeout: nobody waited it out
+    small.dispose()
@@ -0,0 +1,161 @@
+"""Unit tests for read-replica routing, replica health and read-your-writes."""
+import asyncio
+import threading
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import create_engine, exc, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db_routing import (
+    DatabaseRouter,
+    RecentWriters,
+    ReplicaSet,
+    RoutingSession,
+    act_as,
+    enable_replica_reads,
+    replica_lookup,
+    replica_urls,
+)
+from app.config.settings import Settings
+from app.core.metrics import DB_REPLICA_HEALTHY
+from app.domain.persistence import Base
+from app.domain.users.models import User
+from tests.unit.helpers import Clock, FakeRedis
+
+
+def _database(path, email):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert().values(id="u1", email=email, hashed_password="x", role="viewer"))
+    return engine
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def sessions(tmp_path, clock):
+    primary = _database(tmp_path / "primary.db", "primary@example.com")
+    replicas = ReplicaSet(
+        [(f"replica-{i}", _database(tmp_path / f"r{i}.db", f"replica-{i}@example.com")) for i in range(2)],
+        retry_s=30,
+        clock=clock,
+    )
+    router = DatabaseRouter(primary, replicas, RecentWriters(5, clock=clock))
+    return sessionmaker(class_=RoutingSession, router=router, bind=primary, expire_on_commit=False)
+
+
+def _source(db) -> str:
+    db.expire_all()
+    return db.scalars(select(User.email)).one().split("@")[0]
+
+
+def test_replica_urls_parsing():
+    assert replica_urls(" sqlite:///a.db, ,sqlite:///b.db") == ["sqlite:///a.db", "sqlite:///b.db"]
+    assert replica_urls("") == []
+
+
+def test_reads_stay_on_primary_unless_enabled(sessions):
+    with sessions() as db:
+        assert _source(db) == "primary"
+
+
+def test_replica_reads_round_robin(sessions):
+    with sessions() as db:
+        enable_replica_reads(db)
+        assert [_source(db) for _ in range(4)] == ["replica-0", "replica-1", "replica-0", "replica-1"]
+
+
+def test_session_stays_on_primary_after_a_write(sessions):
+    with sessions() as db:
+        enable_replica_reads(db)
+        db.add(User(email="new@example.com", hashed_password="x"))
+        db.flush()
+        assert db.scalars(select(User.email).where(User.email == "new@example.com")).one()
+        assert db.execute(text("SELECT 1")).scalar() == 1   # non-SELECT constructs never go to a replica
+
+
+def test_unreachable_replica_is_skipped_until_retry(tmp_path, clock):
+    primary = _database(tmp_path / "primary.db", "primary@example.com")
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'r.db'}")
+    replicas = ReplicaSet([("replica-broken", broken)], retry_s=30, clock=clock)
+    sessions = sessionmaker(class_=RoutingSession, router=DatabaseRouter(primary, replicas, RecentWriters(5)))
+
+    with sessions() as db:
+        enable_replica_reads(db)
+        with pytest.raises(exc.OperationalError):
+            db.execute(select(User.email))
+    assert DB_REPLICA_HEALTHY.labels(target="replica-broken")._value.get() == 0
+
+    with sessions() as db:
+        enable_replica_reads(db)
+        assert _source(db) == "primary"   # no healthy replica — fall back
+
+    clock.now += 31
+    assert replicas.choose() == ("replica-broken", broken)   # back in rotation for another try
+    assert DB_REPLICA_HEALTHY.labels(target="replica-broken")._value.get() == 1
+
+
+def test_read_your_writes_window_pins_the_principal(sessions, clock):
+    with sessions() as db:
+        act_as(db, "u1")
+        db.get(User, "u1").full_name = "Renamed"
+        db.commit()
+
+    with sessions() as db:
+        act_as(db, "u1")
+        with replica_lookup(db):
+            assert _source(db) == "primary"
+
+    with sessions() as db:
+        act_as(db, "someone-else")
+        with replica_lookup(db):
+            assert _source(db).startswith("replica")
+
+    clock.now += 6
+    with sessions() as db:
+        act_as(db, "u1")
+        with replica_lookup(db):
+            assert _source(db).startswith("replica")
+        assert _source(db) == "primary"   # replica reads end with the lookup block
+
+
+def test_read_your_writes_window_is_shared_between_workers(clock):
+    redis = FakeRedis()
+    worker_a = RecentWriters(5, redis_factory=lambda: redis, clock=clock)
+    worker_b = RecentWriters(5, redis_factory=lambda: redis, clock=clock)
+    worker_a.record("u1")
+    assert worker_b.active("u1")
+    assert not worker_b.active("u2")
+    assert redis.ttls["ryw:u1"] == 5
+
+
+@pytest.mark.asyncio
+async def test_shared_record_is_written_off_the_event_loop(clock):
+    redis, loop_thread, writers = FakeRedis(), threading.get_ident(), []
+    set_ = redis.set
+    redis.set = lambda *a, **kw: writers.append(threading.get_ident()) or set_(*a, **kw)
+    RecentWriters(5, redis_factory=lambda: redis, clock=clock).record("u1")
+    for _ in range(500):   # the executor job runs soon, not at once
+        if writers:
+            break
+        await asyncio.sleep(0.01)
+    assert writers and writers[0] != loop_thread
+
+
+def test_unreachable_shared_store_keeps_reads_on_the_primary():
+    redis = FakeRedis()
+    redis.down = True
+    assert RecentWriters(5, redis_factory=lambda: redis).active("u1")
+
+
+def test_replicas_on_several_workers_require_a_shared_window():
+    replicas = "postgresql://replica/app"
+    with pytest.raises(ValidationError):
+        Settings(DATABASE_REPLICA_URLS=replicas, WEB_CONCURRENCY=4)
+    assert Settings(DATABASE_REPLICA_URLS=replicas, WEB_CONCURRENCY=4, DB_READ_YOUR_WRITES_REDIS=True)
+    assert Settings(DATABASE_REPLICA_URLS=replicas, WEB_CONCURRENCY=1)
@@ -1,6 +1,14 @@
 """Unit tests for ErrorBudgetTracker."""
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
 import pytest
-from app.infrastructure.error_budget import ErrorBudgetTracker
+from app.infrastructure.error_budget import CounterBlock, ErrorBudgetTracker
+from tests.unit.helpers import Clock
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
 
 def test_no_requests_returns_zero_consumed():
@@ -54,3 +62,137 @@ def test_invalid_sla_target_raises():
         ErrorBudgetTracker(sla_target=1.0)
     with pytest.raises(ValueError):
         ErrorBudgetTracker(sla_target=0.0)
+
+
+def test_old_failures_age_out_of_short_windows():
+    clock = Clock(1_700_000_000.0)
+    tracker = ErrorBudgetTracker(sla_target=0.999, clock=clock)
+    for _ in range(10):
+        tracker.record(500)
+    clock.now += 600   # 10 minutes later
+    for _ in range(10):
+        tracker.record(200)
+    snap = tracker.snapshot()
+    assert snap.windows["5m"].failed_requests == 0
+    assert snap.windows["1h"].failed_requests == 10
+    assert snap.failed_requests == 10          # 30d budget window still counts them
+    assert snap.total_requests == 20
+
+
+def test_budget_window_forgets_beyond_30_days():
+    clock = Clock(1_700_000_000.0)
+    tracker = ErrorBudgetTracker(sla_target=0.999, clock=clock)
+    tracker.record(500)
+    clock.now += 31 * 86400
+    tracker.record(200)
+    snap = tracker.snapshot()
+    assert snap.failed_requests == 0
+    assert snap.total_requests == 1
+
+
+def test_fast_burn_requires_long_and_short_window():
+    clock = Clock(1_700_000_000.0)
+    tracker = ErrorBudgetTracker(sla_target=0.999, clock=clock)
+    for _ in range(980):
+        tracker.record(200)
+    for _ in range(20):
+        tracker.record(503)                    # 2% errors → burn rate 20
+    snap = tracker.snapshot()
+    assert snap.windows["5m"].burn_rate == 20.0
+    assert snap.fast_burn is True
+    assert snap.slow_burn is True
+
+    clock.now += 900                           # incident over: 5m window is clean
+    tracker.record(200)
+    snap = tracker.snapshot()
+    assert snap.windows["1h"].burn_rate > 14.4
+    assert snap.fast_burn is False
+
+
+def test_per_route_budgets():
+    tracker = ErrorBudgetTracker(sla_target=0.999, clock=Clock(1_700_000_000.0))
+    tracker.record(500, route="/api/v1/users")
+    tracker.record(200, route="/api/v1/users")
+    tracker.record(200, route="/health")
+    snap = tracker.snapshot()
+    assert snap.routes["/api/v1/users"].failed_requests == 1
+    assert snap.routes["/api/v1/users"].burn_rate == 500.0
+    assert snap.routes["/health"].failed_requests == 0
+
+
+def test_counts_from_many_threads_are_merged():
+    tracker = ErrorBudgetTracker(sla_target=0.999)
+
+    def _worker() -> None:
+        for i in range(1000):
+            tracker.record(500 if i % 100 == 0 else 200)
+
+    threads = [threading.Thread(target=_worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    snap = tracker.snapshot()
+    assert snap.total_requests == 8000
+    assert snap.failed_requests == 80
+
+
+class TestSharedCounterBlock:
+    _WORKER = """
+import sys
+from app.infrastructure.error_budget import CounterBlock, ErrorBudgetTracker
+tracker = ErrorBudgetTracker(block=CounterBlock(sys.argv[1]))
+for i in range(100):
+    tracker.record(500 if i < 5 else 200, route="/api/v1/users")
+tracker.close()
+"""
+
+    def test_workers_aggregate_into_one_block(self, tmp_path):
+        path = str(tmp_path / "budget.shm")
+        for _ in range(2):
+            subprocess.run(
+                [sys.executable, "-c", self._WORKER, path], cwd=PROJECT_ROOT, check=True,
+            )
+        tracker = ErrorBudgetTracker(block=CounterBlock(path))
+        tracker.record(200)
+        snap = tracker.snapshot()
+        tracker.close()
+        assert snap.total_requests == 201
+        assert snap.failed_requests == 10
+        assert snap.routes["/api/v1/users"].total_requests == 200
+
+    def test_snapshot_survives_restart(self, tmp_path):
+        snapshot_path = str(tmp_path / "budget.snapshot")
+        clock = Clock(1_700_000_000.0)
+        tracker = ErrorBudgetTracker(clock=clock, persist_path=snapshot_path)
+        tracker.record(500)
+        tracker.record(200)
+        tracker.close()                         # final save on shutdown
+
+        restarted = ErrorBudgetTracker(clock=clock, persist_path=snapshot_path)
+        snap = restarted.snapshot()
+        restarted.close()
+        assert snap.total_requests == 2
+        assert snap.failed_requests == 1
+
+    def test_invalid_snapshot_ignored(self, tmp_path):
+        snapshot_path = tmp_path / "budget.snapshot"
+        snapshot_path.write_bytes(b"not a counter block")
+        block = CounterBlock(restore_from=str(snapshot_path))
+        assert block.restored is False
+        block.close()
+
+    def test_existing_shared_block_is_not_overwritten_by_snapshot(self, tmp_path):
+        shm, snapshot_path = str(tmp_path / "budget.shm"), str(tmp_path / "budget.snapshot")
+        first = ErrorBudgetTracker(block=CounterBlock(shm), persist_path=snapshot_path)
+        first.record(200)
+        first.save()                            # snapshot holds 1 request
+        first.record(200)
+        assert first.snapshot().total_requests == 2
+
+        late_block = CounterBlock(shm, restore_from=snapshot_path)   # a worker joining later
+        assert late_block.restored is False
+        second = ErrorBudgetTracker(block=late_block)
+        assert second.snapshot().total_requests == 2
+        second.close()
+        first.close()
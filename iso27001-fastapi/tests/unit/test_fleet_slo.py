@@ -0,0 +1,114 @@
+"""Unit tests for fleet-wide SLO aggregation through Redis."""
+import pytest
+
+from app.infrastructure.error_budget import ErrorBudgetTracker
+from app.infrastructure.fleet_slo import MAX_PENDING_MINUTES, FleetAggregator
+from app.infrastructure.latency_sketch import LatencySummary
+from tests.unit.helpers import Clock, FakeRedis
+
+
+class _FakePipeline:
+    def __init__(self, store: "_FakeRedis") -> None:
+        self._store = store
+        self._ops: list[tuple] = []
+
+    def hincrby(self, key, field, amount):
+        self._ops.append(("hincrby", key, field, amount))
+
+    def expire(self, key, ttl):
+        self._ops.append(("expire", key, ttl))
+
+    def hgetall(self, key):
+        self._ops.append(("hgetall", key))
+
+    def execute(self):
+        self._store.round_trips += 1
+        if self._store.down:
+            raise ConnectionError("redis down")
+        out = []
+        for op, key, *args in self._ops:
+            h = self._store.data.setdefault(key, {})
+            if op == "hincrby":
+                h[args[0]] = str(int(h.get(args[0], 0)) + args[1])
+                out.append(int(h[args[0]]))
+            elif op == "expire":
+                self._store.ttls[key] = args[0]
+                out.append(True)
+            else:
+                out.append(dict(h))
+        return out
+
+
+class _FakeRedis(FakeRedis):
+    """FakeRedis with the hash pipeline FleetAggregator uses."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+def _aggregator(redis, clock=None) -> FleetAggregator:
+    agg = FleetAggregator("svc", redis_factory=lambda: redis, clock=clock or Clock(1_700_000_000.0))
+    agg._thread = object()   # keep the background flusher out of unit tests
+    return agg
+
+
+def test_workers_merge_into_fleet_view():
+    redis, clock = _FakeRedis(), Clock(1_700_000_000.0)
+    task_a, task_b = _aggregator(redis, clock), _aggregator(redis, clock)
+    for _ in range(980):
+        task_a.record(200, 20.0)
+    for _ in range(20):
+        task_b.record(503, 900.0)
+    assert task_a.flush() and task_b.flush()
+    assert redis.round_trips == 2                 # one pipeline per flush
+
+    view = task_a.fleet_view()
+    assert view is not None and view.source == "fleet"
+    assert view.windows["5m"].total_requests == 1000
+    assert view.windows["30d"].failed_requests == 20
+    assert view.budget_consumed_pct == 100.0
+    assert view.budget_exhausted is True
+    assert view.fast_burn is True
+    assert view.latency.p99_ms == pytest.approx(900.0, rel=0.01)
+    assert view.latency.p50_ms == pytest.approx(20.0, rel=0.01)
+    assert redis.ttls[f"slo:svc:d:{int(clock.now // 86400)}"] == 31 * 86400
+
+
+def test_redis_down_keeps_deltas_and_retries():
+    redis = _FakeRedis()
+    agg = _aggregator(redis)
+    agg.record(200, 10.0)
+    redis.down = True
+    assert agg.flush() is False
+    redis.down = False
+    agg._retry_at = 0.0
+    agg.record(500, 10.0)
+    assert agg.flush() is True
+    view = agg.fleet_view()
+    assert view.windows["1h"].total_requests == 2
+    assert view.windows["1h"].failed_requests == 1
+
+
+def test_pending_deltas_are_bounded():
+    clock = Clock(1_700_000_000.0)
+    agg = _aggregator(None, clock)
+    for _ in range(MAX_PENDING_MINUTES + 5):
+        agg.record(200, 1.0)
+        clock.now += 60
+    assert agg.flush() is False
+    assert agg.dropped_minutes == 5
+
+
+def test_unavailable_redis_falls_back_to_local_view():
+    agg = _aggregator(None)
+    assert agg.fleet_view() is None
+    tracker = ErrorBudgetTracker()
+    tracker.record(200)
+    local = agg.local_view(tracker.snapshot(), LatencySummary(1, 5.0, 5.0, 5.0))
+    assert local.source == "local"
+    assert local.windows["5m"].total_requests == 1
+    assert local.to_dict()["latency"]["p95_ms"] == 5.0
@@ -0,0 +1,87 @@
+"""Unit tests for the streaming latency quantile sketches."""
+import random
+
+import pytest
+
+from app.infrastructure.latency_sketch import DDSketch, LatencyTracker, RollingSketch
+from app.infrastructure.quality_score import QualityScoreCalculator
+
+
+def _exact(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestDDSketch:
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(3.0, 1.0) for _ in range(20_000)]
+        sketch = DDSketch(relative_accuracy=0.01)
+        for v in values:
+            sketch.add(v)
+        for q in (0.5, 0.95, 0.99):
+            assert sketch.quantile(q) == pytest.approx(_exact(values, q), rel=0.011)
+
+    def test_merge_matches_single_sketch(self):
+        a, b, both = DDSketch(), DDSketch(), DDSketch()
+        for i in range(1, 1001):
+            (a if i % 2 else b).add(float(i))
+            both.add(float(i))
+        a.merge(b)
+        assert a.count == both.count
+        assert a.quantile(0.99) == both.quantile(0.99)
+
+    def test_memory_bounded(self):
+        sketch = DDSketch(max_bins=64)
+        for i in range(1, 100_000, 7):
+            sketch.add(float(i))
+        assert len(sketch.bins) <= 64
+        assert sketch.quantile(0.99) == pytest.approx(99_000, rel=0.02)
+
+    def test_empty_sketch_has_no_quantiles(self):
+        assert DDSketch().quantile(0.95) is None
+
+
+def test_rolling_window_forgets_old_slots():
+    now = [0.0]
+    sketch = RollingSketch(window_s=60, slots=6, clock=lambda: now[0])
+    sketch.add(1000.0)
+    now[0] = 30.0
+    sketch.add(10.0)
+    assert sketch.merged().count == 2
+    now[0] = 65.0
+    merged = sketch.merged()
+    assert merged.count == 1
+    assert merged.quantile(0.99) == pytest.approx(10.0, rel=0.01)
+
+
+class TestLatencyTracker:
+    def test_per_route_and_overall(self):
+        tracker = LatencyTracker()
+        for _ in range(100):
+            tracker.record("/fast", 5.0)
+            tracker.record("/slow", 400.0)
+        assert tracker.summary().count == 200
+        assert tracker.summary("/fast").p99_ms == pytest.approx(5.0, rel=0.01)
+        assert tracker.summary("/slow").p95_ms == pytest.approx(400.0, rel=0.01)
+        assert set(tracker.route_summaries()) == {"/fast", "/slow"}
+
+    def test_route_cardinality_capped(self):
+        tracker = LatencyTracker(max_routes=2)
+        for route in ("/a", "/b", "/c"):
+            tracker.record(route, 1.0)
+        assert set(tracker.route_summaries()) == {"/a", "/b"}
+        assert tracker.summary().count == 3
+
+    def test_live_p95_breaches_slo(self):
+        tracker = LatencyTracker()
+        for i in range(100):
+            tracker.record("/users", 450.0 if i >= 90 else 20.0)
+        latency = tracker.summary()
+        calculator = QualityScoreCalculator(
+            sla_latency_p95_ms=latency.p95_ms or 0.0,
+            sla_latency_p99_ms=latency.p99_ms or 0.0,
+        )
+        alert = calculator.slo_alert()
+        assert alert.p95_latency_breached is True
+        assert alert.p99_latency_breached is False
@@ -0,0 +1,84 @@
+"""Unit tests for the cached, off-loop /metrics exposition."""
+import asyncio
+import gzip
+import threading
+import time
+
+import pytest
+
+from app.core.metrics import ExpositionCache, _accepts_gzip, get_metrics
+
+
+class _CountingRender:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls = 0
+        self.threads: set[int] = set()
+        self._delay = delay
+
+    def __call__(self) -> bytes:
+        self.calls += 1
+        self.threads.add(threading.get_ident())
+        time.sleep(self._delay)
+        return b"# HELP up test\nup 1.0\n" * 50
+
+
+@pytest.mark.asyncio
+async def test_cached_within_ttl_and_rendered_off_loop():
+    now = [0.0]
+    render = _CountingRender()
+    cache = ExpositionCache(ttl_s=5.0, render=render, clock=lambda: now[0])
+
+    first = await cache.get()
+    second = await cache.get()
+    assert render.calls == 1
+    assert second is first
+    assert threading.get_ident() not in render.threads
+    assert gzip.decompress(first.gzipped) == first.body
+
+    now[0] = 6.0
+    await cache.get()
+    assert render.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_scrapes_share_one_render():
+    render = _CountingRender(delay=0.05)
+    cache = ExpositionCache(ttl_s=5.0, render=render)
+    results = await asyncio.gather(*(cache.get() for _ in range(5)))
+    assert render.calls == 1
+    assert all(r is results[0] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_renders_every_scrape():
+    render = _CountingRender()
+    cache = ExpositionCache(ttl_s=0.0, render=render)
+    await cache.get()
+    await cache.get()
+    assert render.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_gzip_served_only_when_accepted():
+    plain = await get_metrics("")
+    compressed = await get_metrics("gzip, deflate")
+    assert "content-encoding" not in plain.headers
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(compressed.body) == plain.body
+    assert b"metrics_cache_requests_total" in plain.body
+
+
+@pytest.mark.parametrize("header, accepted", [
+    ("gzip", True),
+    ("deflate, GZIP;q=0.5", True),
+    ("x-gzip", True),
+    ("*", True),
+    ("", False),
+    ("gzip;q=0", False),
+    ("gzip; q=0.000", False),
+    ("x-gzip-nope", False),
+    ("br, *;q=0", False),
+    ("*, gzip;q=0", False),
+])
+def test_accept_encoding_is_parsed_by_coding_and_quality(header, accepted):
+    assert _accepts_gzip(header) is accepted
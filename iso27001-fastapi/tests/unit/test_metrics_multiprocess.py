@@ -0,0 +1,48 @@
+"""Unit tests for Prometheus multiprocess aggregation across workers."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from prometheus_client import generate_latest
+
+from app.core.metrics import multiprocess_registry, reap_dead_workers
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+_WORKER = """
+from app.core.metrics import REQUEST_COUNT, THREADPOOL_TOKENS_IN_USE
+REQUEST_COUNT.labels(method="GET", endpoint="/health", status_code=200).inc()
+THREADPOOL_TOKENS_IN_USE.set(3)
+"""
+
+
+def _run_worker(multiproc_dir: Path) -> None:
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(multiproc_dir)}
+    subprocess.run([sys.executable, "-c", _WORKER], cwd=PROJECT_ROOT, env=env, check=True)
+
+
+def test_counters_aggregate_across_workers_and_dead_gauges_are_reaped(tmp_path):
+    _run_worker(tmp_path)
+    _run_worker(tmp_path)
+    assert len(list(tmp_path.glob("gauge_livesum_*.db"))) == 2
+
+    output = generate_latest(multiprocess_registry(str(tmp_path))).decode()
+
+    # Both (exited) workers' requests are counted; their live gauges are gone
+    assert 'http_requests_total{endpoint="/health",method="GET",status_code="200"} 2.0' in output
+    assert "threadpool_tokens_in_use 3.0" not in output
+    assert not list(tmp_path.glob("gauge_livesum_*.db"))
+    assert len(list(tmp_path.glob("counter_*.db"))) == 2
+
+
+def test_reused_pid_is_reaped_again(tmp_path):
+    exited = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                            capture_output=True, text=True, check=True)
+    pid = int(exited.stdout)
+    (tmp_path / f"counter_{pid}.db").touch()
+    for _ in range(2):   # second round: a new worker got the same pid and died too
+        (tmp_path / f"gauge_livesum_{pid}.db").touch()
+        assert reap_dead_workers(str(tmp_path)) == [pid]
+        assert not list(tmp_path.glob("gauge_livesum_*.db"))
+    assert reap_dead_workers(str(tmp_path)) == []   # counter files alone are not rechecked
@@ -0,0 +1,36 @@
+"""Unit tests for CorrelationIdMiddleware's per-request cleanup on failure."""
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from app.core import middleware
+from app.core.query_metrics import query_monitor
+from app.core.telemetry import AsyncLogWriter, StructuredLogger, TailSampler
+
+
+def _request() -> Request:
+    return Request({
+        "type": "http", "method": "GET", "path": "/api/v1/users/", "raw_path": b"/api/v1/users/",
+        "root_path": "", "query_string": b"", "headers": [], "scheme": "http", "server": ("test", 80),
+    })
+
+
+@pytest.mark.parametrize("failure, status", [(asyncio.CancelledError, 499), (RuntimeError, 500)])
+def test_request_state_is_released_when_the_handler_does_not_return(monkeypatch, failure, status):
+    sampler = TailSampler(sample_rate=0.0)
+    monkeypatch.setattr(middleware, "logger", StructuredLogger("test.cleanup", writer=AsyncLogWriter(), sampler=sampler))
+    ended = []
+    monkeypatch.setattr(middleware.xray, "end_segment", lambda *, status_code=None: ended.append(status_code))
+
+    async def call_next(request):
+        raise failure()
+
+    async def dispatch():
+        with pytest.raises(failure):
+            await middleware.CorrelationIdMiddleware(app=None).dispatch(_request(), call_next)
+        return query_monitor.current()
+
+    assert asyncio.run(dispatch()) is None   # query stats context reset
+    assert sampler._buffers == {}
+    assert ended == [status]
@@ -0,0 +1,118 @@
+"""Unit tests for the two-tier principal cache and cached authentication."""
+import pytest
+
+from app.api import deps
+from app.config.security import create_access_token
+from app.core.exceptions import AuthenticationError
+from app.domain.events import EventBus
+from app.domain.users.events import UserDeactivated, UserDeleted, UserUpdated
+from app.domain.users.principal import Principal
+from app.infrastructure.principal_cache import PrincipalCache
+from tests.unit.helpers import Clock, FakeRedis, create_user, statements
+
+ALICE = Principal(id="u1", role="viewer", email="alice@example.com")
+
+
+def test_l1_hit_until_ttl_expires():
+    clock = Clock()
+    cache = PrincipalCache(ttl_s=10, clock=clock)
+    cache.put(ALICE, cache.stamp())
+    assert cache.get("u1") == ALICE
+    clock.now = 11
+    assert cache.get("u1") is None
+
+
+def test_lru_evicts_least_recently_used():
+    cache = PrincipalCache(ttl_s=10, max_entries=2)
+    for user_id in ("a", "b"):
+        cache.put(Principal(id=user_id, role="viewer"), cache.stamp())
+    cache.get("a")
+    cache.put(Principal(id="c", role="viewer"), cache.stamp())
+    assert cache.get("a") is not None and cache.get("b") is None
+
+
+def test_disabled_cache_never_hits():
+    cache = PrincipalCache(ttl_s=0)
+    cache.put(ALICE, cache.stamp())
+    assert cache.get("u1") is None
+
+
+def test_load_that_raced_an_invalidation_is_not_cached():
+    cache = PrincipalCache(ttl_s=10)
+    stamp = cache.stamp()          # request starts loading the user
+    cache.invalidate("u1")         # user deactivated meanwhile
+    cache.put(ALICE, stamp)        # stale load arrives
+    assert cache.get("u1") is None
+    cache.put(ALICE, cache.stamp())
+    assert cache.get("u1") == ALICE
+
+
+@pytest.mark.parametrize("event", [
+    UserUpdated(user_id="u1", fields=("email",)), UserDeactivated(user_id="u1"), UserDeleted(user_id="u1"),
+])
+def test_user_change_events_evict(event):
+    cache = PrincipalCache(ttl_s=10)
+    bus = EventBus()
+    bus.subscribe(type(event), cache.on_user_changed)
+    cache.put(ALICE, cache.stamp())
+    bus.publish(event)
+    assert cache.get("u1") is None
+
+
+def test_l2_is_shared_between_workers():
+    redis = FakeRedis()
+    worker_a = PrincipalCache(ttl_s=10, redis_factory=lambda: redis)
+    worker_b = PrincipalCache(ttl_s=10, redis_factory=lambda: redis)
+    worker_a.put(ALICE, worker_a.stamp())
+    assert worker_b.get("u1") == ALICE
+    assert worker_b.get("u1", shared=False) == ALICE   # now in worker_b's L1 too
+
+
+def test_l2_tombstone_blocks_a_racing_load_from_another_worker():
+    redis = FakeRedis()
+    worker_a = PrincipalCache(ttl_s=10, redis_factory=lambda: redis)
+    worker_b = PrincipalCache(ttl_s=10, redis_factory=lambda: redis)
+    stamp = worker_b.stamp()
+    worker_a.invalidate("u1")
+    worker_b.put(ALICE, stamp)     # worker_b never saw the event
+    assert worker_a.get("u1") is None
+
+
+def test_redis_outage_degrades_to_l1():
+    redis = FakeRedis()
+    redis.down = True
+    cache = PrincipalCache(ttl_s=10, redis_factory=lambda: redis)
+    cache.put(ALICE, cache.stamp())
+    assert cache.get("u1") == ALICE
+    cache.invalidate("u1")
+    assert cache.get("u1") is None
+
+
+@pytest.fixture
+def auth(monkeypatch, service, bus):
+    cache = PrincipalCache(ttl_s=10)
+    monkeypatch.setattr(deps, "principal_cache", cache)
+    for changed in (UserUpdated, UserDeactivated, UserDeleted):
+        bus.subscribe(changed, cache.on_user_changed)
+    return service, create_user(service, "bob@example.com")
+
+
+def _authenticate(service, user_id):
+    return deps.get_current_user(create_access_token(user_id), service.repo)
+
+
+def test_repeat_requests_skip_the_user_lookup(auth, db):
+    service, user_id = auth
+    db.expunge_all()   # as a fresh request session would be
+    assert _authenticate(service, user_id) == Principal(id=user_id, role="viewer", email="bob@example.com")
+    statements(db)
+    _authenticate(service, user_id)
+    assert "SELECT" not in statements(db)
+
+
+def test_deactivated_user_token_stops_working_at_once(auth):
+    service, user_id = auth
+    _authenticate(service, user_id)
+    service.deactivate_user(user_id)
+    with pytest.raises(AuthenticationError):
+        _authenticate(service, user_id)
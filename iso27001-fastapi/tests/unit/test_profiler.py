@@ -0,0 +1,54 @@
+"""Unit tests for the on-demand sampling profiler."""
+import threading
+
+import pytest
+
+from app.infrastructure.profiler import ProfilerBusyError, SamplingProfiler
+
+
+def _spin(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=_spin, args=(stop,), name="busy-worker")
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+def test_collapsed_stacks_capture_busy_thread(busy_thread):
+    result = SamplingProfiler(interval_s=0.005).run(0.3)
+    assert result.samples > 0
+    busy = [line for line in result.collapsed if line.startswith("busy-worker;")]
+    assert busy
+    stack, count = busy[0].rsplit(" ", 1)
+    assert int(count) >= 1
+    assert "test_profiler:_spin" in stack
+
+
+def test_top_functions_ranked_by_self_samples(busy_thread):
+    result = SamplingProfiler(interval_s=0.005).run(0.3, top_n=3)
+    assert 1 <= len(result.top) <= 3
+    self_counts = [row["self_samples"] for row in result.top]
+    assert self_counts == sorted(self_counts, reverse=True)
+    assert all(row["total_samples"] >= row["self_samples"] for row in result.top)
+
+
+def test_loop_thread_is_labelled(busy_thread):
+    result = SamplingProfiler(interval_s=0.005).run(0.1, loop_thread_id=busy_thread.ident)
+    assert any(line.startswith("event-loop;") for line in result.collapsed)
+
+
+def test_concurrent_profile_rejected():
+    profiler = SamplingProfiler()
+    profiler._lock.acquire()
+    try:
+        with pytest.raises(ProfilerBusyError):
+            profiler.run(0.1)
+    finally:
+        profiler._lock.release()
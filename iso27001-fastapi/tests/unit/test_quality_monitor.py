@@ -0,0 +1,145 @@
+"""Unit tests for the background quality score monitor."""
+import asyncio
+import io
+import json
+
+import pytest
+
+from app.core.metrics import QUALITY_PILLAR_SCORE, SLO_ALERT_ACTIVE
+from app.infrastructure.aws_telemetry import CloudWatchEmitter, EmfWriter
+from app.infrastructure.error_budget import ErrorBudgetTracker
+from app.infrastructure.fleet_slo import FleetAggregator
+from app.infrastructure.latency_sketch import LatencyTracker
+from app.infrastructure.quality_monitor import QualityMonitor, QualitySignals
+from tests.unit.helpers import Clock
+
+
+def _monitor(signals, clock, *, emitter=None, history_size=240, budget=None, latency=None):
+    return QualityMonitor(
+        signals=signals,
+        budget=budget or ErrorBudgetTracker(sla_target=0.999, clock=clock),
+        latency=latency or LatencyTracker(clock=clock),
+        fleet=FleetAggregator("svc", enabled=False, clock=clock),
+        emitter=emitter,
+        interval_s=15.0,
+        window_s=300.0,
+        history_size=history_size,
+        clock=clock,
+    )
+
+
+def test_pillars_come_from_live_signals():
+    clock = Clock(1_000_000.0)
+    signals = QualitySignals(log_stats=lambda: (9, 10))
+    for passed in (True, True, True, False):
+        signals.auth_check(passed)
+    signals.audit_write(committed=True)
+    signals.audit_write(committed=False)
+
+    snapshot = _monitor(signals, clock).refresh()
+    assert snapshot.score.security == 0.75
+    assert snapshot.score.data_integrity == 0.5
+    assert snapshot.score.auditability == 0.9
+    assert snapshot.score.reliability == 1.0
+    assert snapshot.signals.auth_total == 4
+
+
+def test_reliability_and_alerts_use_recent_error_rate():
+    clock = Clock(1_000_000.0)
+    budget = ErrorBudgetTracker(sla_target=0.999, clock=clock)
+    for _ in range(98):
+        budget.record(200)
+    budget.record(500)
+    budget.record(404)
+
+    snapshot = _monitor(QualitySignals(log_stats=lambda: (0, 0)), clock, budget=budget).refresh()
+    assert snapshot.score.reliability == pytest.approx(0.99)
+    assert snapshot.alert.error_rate_breached
+    assert not snapshot.alert.client_error_spike
+    assert snapshot.budget.total_requests == 100
+
+
+def test_signal_ratios_cover_the_trailing_window_only():
+    clock = Clock(1_000_000.0)
+    signals = QualitySignals(log_stats=lambda: (0, 0))
+    monitor = _monitor(signals, clock)
+    signals.auth_check(False)
+    assert monitor.refresh().score.security == 0.0
+
+    clock.now += 15
+    monitor.refresh()   # becomes the baseline once it is a full window old
+    clock.now += 301
+    signals.auth_check(True)
+    snapshot = monitor.refresh()
+    assert snapshot.signals.auth_total == 1
+    assert snapshot.score.security == 1.0
+
+
+def test_history_is_bounded_and_latest_expires():
+    clock = Clock(1_000_000.0)
+    monitor = _monitor(QualitySignals(log_stats=lambda: (0, 0)), clock, history_size=3)
+    assert monitor.latest() is None
+    for _ in range(5):
+        monitor.refresh()
+        clock.now += 15
+    assert len(monitor.history()) == 3
+    assert monitor.latest() is not None
+    clock.now += 30
+    assert monitor.latest() is None   # two intervals without a refresh: stale
+
+
+def test_export_sets_gauges_and_batches_cloudwatch():
+    clock = Clock(1_000_000.0)
+    stream = io.StringIO()
+    emitter = CloudWatchEmitter(
+        "svc", "test", transport="emf", emf_writer=EmfWriter("Test/API", flush_interval_s=3600, stream=stream)
+    )
+    signals = QualitySignals(log_stats=lambda: (0, 0))
+    signals.auth_check(True)
+    signals.auth_check(False)
+    _monitor(signals, clock, emitter=emitter).refresh()
+    emitter.flush()
+
+    assert QUALITY_PILLAR_SCORE.labels(pillar="security")._value.get() == 0.5
+    assert SLO_ALERT_ACTIVE.labels(signal="any_breach")._value.get() == 0
+    names = set()
+    pillars = set()
+    for line in stream.getvalue().splitlines():
+        doc = json.loads(line)
+        for block in doc["_aws"]["CloudWatchMetrics"]:
+            names.update(m["Name"] for m in block["Metrics"])
+        if "Pillar" in doc:
+            pillars.add(doc["Pillar"])
+    assert names == {"QualityScore", "ErrorBudgetConsumedPct", "SloBreach", "QualityPillar"}
+    assert pillars == {"security", "data_integrity", "reliability", "auditability", "performance"}
+
+
+def test_compute_neither_records_nor_exports():
+    stream = io.StringIO()
+    emitter = CloudWatchEmitter(
+        "svc", "test", transport="emf", emf_writer=EmfWriter("Test/API", flush_interval_s=3600, stream=stream)
+    )
+    monitor = _monitor(QualitySignals(log_stats=lambda: (0, 0)), Clock(1_000_000.0), emitter=emitter)
+    assert monitor.compute().score is not None
+    emitter.flush()
+    assert monitor.history() == [] and stream.getvalue() == ""
+
+
+@pytest.mark.asyncio
+async def test_background_task_refreshes_periodically():
+    monitor = QualityMonitor(
+        signals=QualitySignals(log_stats=lambda: (0, 0)),
+        budget=ErrorBudgetTracker(sla_target=0.999),
+        latency=LatencyTracker(),
+        fleet=FleetAggregator("svc", enabled=False),
+        interval_s=0.01,
+    )
+    await monitor.start()
+    # A refresh scans the budget windows on a worker thread; poll rather than
+    # assume how many complete in a fixed sleep on a busy test runner
+    for _ in range(200):
+        if len(monitor.history()) >= 2:
+            break
+        await asyncio.sleep(0.01)
+    await monitor.stop()
+    assert len(monitor.history()) >= 2
@@ -0,0 +1,66 @@
+"""Unit tests for per-request SQL query accounting."""
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.query_metrics import QueryMonitor
+
+
+@pytest.fixture
+def monitor():
+    return QueryMonitor(slow_query_ms=10_000, n_plus_one_threshold=3)
+
+
+@pytest.fixture
+def engine(monitor):
+    engine = create_engine("sqlite://")
+    monitor.instrument_engine(engine)
+    return engine
+
+
+def test_statements_attributed_to_current_request(monitor, engine):
+    token = monitor.begin_request()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+    stats = monitor.end_request(token, route="/test")
+    assert stats.count == 2
+    assert stats.total_ms >= 0
+    assert monitor.current() is None
+
+
+def test_repeated_statement_flagged_as_n_plus_one(monitor, engine):
+    token = monitor.begin_request()
+    with engine.connect() as conn:
+        for i in range(3):
+            conn.execute(text("SELECT :id"), {"id": i})
+    with patch("app.core.query_metrics.logger") as log:
+        stats = monitor.end_request(token, route="/users/{user_id}")
+    assert stats.repeated(3) == {"SELECT ?": 3}
+    log.warning.assert_called_once()
+    assert log.warning.call_args.args[0] == "db.n_plus_one_suspect"
+
+
+def test_slow_query_logged_with_params_masked(engine, monitor):
+    monitor.slow_query_ms = 0
+    with patch("app.core.query_metrics.logger") as log:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT :email"), {"email": "alice@example.com"})
+    ctx = log.warning.call_args.kwargs
+    assert log.warning.call_args.args[0] == "db.slow_query"
+    assert "alice@example.com" not in repr(ctx)
+    assert ctx["params"] == ["[REDACTED]"]
+
+
+def test_assert_max_queries(monitor, engine):
+    with monitor.assert_max_queries(2) as budget:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    assert budget.count == 1
+
+    with pytest.raises(AssertionError, match="at most 1 queries, 2 executed"):
+        with monitor.assert_max_queries(1):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 1"))
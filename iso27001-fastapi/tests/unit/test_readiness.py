@@ -0,0 +1,88 @@
+"""Unit tests for concurrent, cached readiness checks."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.infrastructure.readiness import DependencyCheck, ReadinessChecker
+from tests.unit.helpers import Clock
+
+
+class _Probe:
+    def __init__(self, delay_s: float = 0.0, fail: bool = False) -> None:
+        self.delay_s = delay_s
+        self.fail = fail
+        self.calls = 0
+
+    def __call__(self) -> None:
+        self.calls += 1
+        time.sleep(self.delay_s)
+        if self.fail:
+            raise ConnectionError("refused")
+
+
+@pytest.mark.asyncio
+async def test_checks_run_concurrently():
+    db, cache = _Probe(delay_s=0.2), _Probe(delay_s=0.2)
+    checker = ReadinessChecker([DependencyCheck("db", db, 1.0), DependencyCheck("redis", cache, 1.0)])
+    started = time.perf_counter()
+    report = await checker.report()
+    assert time.perf_counter() - started < 0.35
+    assert report.status == "ok"
+    assert report.checks["db"].latency_ms >= 200
+
+
+@pytest.mark.asyncio
+async def test_critical_failure_is_down_and_non_critical_is_degraded():
+    checker = ReadinessChecker([
+        DependencyCheck("db", _Probe(), 1.0),
+        DependencyCheck("redis", _Probe(fail=True), 1.0, critical=False, fallback="in-process fallback active"),
+    ])
+    report = await checker.report()
+    assert report.status == "degraded" and report.ready
+    assert report.checks["redis"].detail == "in-process fallback active"
+
+    checker = ReadinessChecker([DependencyCheck("db", _Probe(fail=True), 1.0)])
+    report = await checker.report()
+    assert report.status == "down" and not report.ready
+    assert report.checks["db"].status == "error"
+    assert report.checks["db"].detail is None   # exception text is logged, never returned
+
+
+@pytest.mark.asyncio
+async def test_timeout_bounds_each_check_and_hung_probe_is_not_restarted():
+    release = threading.Event()
+    calls = []
+
+    def hung() -> None:
+        calls.append(1)
+        release.wait(5)
+
+    clock = Clock()
+    checker = ReadinessChecker([DependencyCheck("db", hung, 0.05)], ttl_s=1.0, clock=clock)
+    report = await checker.report()
+    assert report.checks["db"].status == "error"
+    assert report.checks["db"].detail == "timeout"
+
+    clock.now += 2
+    report = await checker.report()
+    assert report.checks["db"].consecutive_failures == 2
+    assert len(calls) == 1   # second round waited on the same probe
+    release.set()
+
+
+@pytest.mark.asyncio
+async def test_results_are_cached_and_concurrent_probes_coalesce():
+    clock = Clock()
+    probe = _Probe(delay_s=0.05)
+    checker = ReadinessChecker([DependencyCheck("db", probe, 1.0)], ttl_s=2.0, clock=clock)
+
+    await asyncio.gather(*(checker.report() for _ in range(20)))
+    await checker.report()
+    assert probe.calls == 1
+
+    clock.now += 3
+    report = await checker.report()
+    assert probe.calls == 2
+    assert len(report.checks["db"].recent_latency_ms) == 2
@@ -0,0 +1,52 @@
+"""Unit tests for the structured-log redaction engine."""
+from app.core.redaction import REDACTED, Redactor
+from app.core.telemetry import StructuredLogger
+
+redactor = Redactor(StructuredLogger.REDACTED_FIELDS)
+
+
+def test_top_level_key_redacted_case_insensitively():
+    out = redactor.redact_dict({"Password": "p", "user_id": "u1"})
+    assert out == {"Password": REDACTED, "user_id": "u1"}
+
+
+def test_nested_dict_redacted():
+    out = redactor.redact_dict({"request": {"headers": {"Authorization": "Bearer x"}}})
+    assert out["request"]["headers"]["Authorization"] == REDACTED
+
+
+def test_secrets_inside_lists_and_tuples_redacted():
+    data = {
+        "attempts": [{"email": "a@b.c", "password": "p1"}, {"email": "d@e.f", "password": "p2"}],
+        "pairs": ({"token": "t"}, "plain"),
+    }
+    out = redactor.redact_dict(data)
+    assert [a["password"] for a in out["attempts"]] == [REDACTED, REDACTED]
+    assert out["pairs"] == ({"token": REDACTED}, "plain")
+    assert isinstance(out["pairs"], tuple)
+
+
+def test_clean_context_returned_without_copy():
+    data = {"method": "GET", "path": "/users", "tags": ["a", "b"], "nested": {"status_code": 200}}
+    assert redactor.redact_dict(data) is data
+
+
+def test_input_never_mutated():
+    inner = {"secret": "s", "keep": 1}
+    data = {"inner": inner, "untouched": {"x": 1}}
+    out = redactor.redact_dict(data)
+    assert inner["secret"] == "s"
+    assert out["inner"] is not inner
+    assert out["untouched"] is data["untouched"]   # clean branches are shared, not copied
+
+
+def test_snapshot_copies_nested_mutable_containers():
+    data = {"method": "GET", "tags": ["a"], "nested": {"ids": [1]}, "pair": ("x", 1)}
+    snapshots = Redactor(StructuredLogger.REDACTED_FIELDS, snapshot=True)
+    out = snapshots.redact_dict(data)
+    assert out == data
+    assert out["tags"] is not data["tags"]
+    assert out["nested"] is not data["nested"] and out["nested"]["ids"] is not data["nested"]["ids"]
+    assert out["pair"] is data["pair"]   # immutable and clean: shared
+    flat = {"method": "GET", "status_code": 200}
+    assert snapshots.redact_dict(flat) is flat
@@ -0,0 +1,30 @@
+"""Unit tests for the route label used by the per-route request metrics."""
+from fastapi.testclient import TestClient
+
+from app.core.middleware import UNMATCHED_ROUTE, CorrelationIdMiddleware
+from app.main import app
+
+
+def _labels(monkeypatch, paths):
+    labels = []
+    route = CorrelationIdMiddleware._route
+
+    def spy(request):
+        labels.append(route(request))
+        return labels[-1]
+
+    monkeypatch.setattr(CorrelationIdMiddleware, "_route", staticmethod(spy))
+    with TestClient(app) as client:
+        for path in paths:
+            client.get(path)
+    return labels
+
+
+def test_label_is_the_full_route_template(monkeypatch):
+    assert _labels(monkeypatch, ["/api/v1/users/abc", "/api/v1/users/", "/health", "/metrics"]) == [
+        "/api/v1/users/{user_id}", "/api/v1/users/", "/health", "/metrics",
+    ]
+
+
+def test_unmatched_paths_share_one_label(monkeypatch):
+    assert set(_labels(monkeypatch, ["/nope/123", "/nope/456", "/wp-login.php"])) == {UNMATCHED_ROUTE}
@@ -0,0 +1,47 @@
+"""Unit tests for the event-loop lag and threadpool saturation monitor."""
+import asyncio
+import threading
+import time
+
+import anyio.to_thread
+import pytest
+
+from app.infrastructure.runtime_monitor import RuntimeMonitor
+
+
+@pytest.mark.asyncio
+async def test_blocked_loop_shows_lag():
+    monitor = RuntimeMonitor(interval_s=0.01)
+    await monitor.start()
+    try:
+        await asyncio.sleep(0.03)
+        time.sleep(0.1)                 # stall the loop like a sync Redis call would
+        await asyncio.sleep(0.03)
+        snapshot = monitor.snapshot()
+    finally:
+        await monitor.stop()
+    assert snapshot.running is True
+    assert snapshot.loop_lag_max_ms >= 50
+    assert monitor.snapshot().running is False
+
+
+@pytest.mark.asyncio
+async def test_threadpool_tokens_in_use_and_waiting():
+    release = threading.Event()
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    original = limiter.total_tokens
+    limiter.total_tokens = 1
+    monitor = RuntimeMonitor(interval_s=3600)
+    try:
+        workers = [asyncio.ensure_future(anyio.to_thread.run_sync(release.wait, 5)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        monitor.sample(lag_s=0.0)
+        snapshot = monitor.snapshot()
+        release.set()
+        await asyncio.gather(*workers)
+    finally:
+        limiter.total_tokens = original
+    assert snapshot.threadpool_tokens == 1
+    assert snapshot.threadpool_tokens_in_use == 1
+    assert snapshot.threadpool_tasks_waiting == 2
+    assert snapshot.to_dict()["threadpool"]["tasks_waiting_max"] == 2
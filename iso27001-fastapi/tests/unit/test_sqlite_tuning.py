@@ -0,0 +1,166 @@
+"""Unit tests for tuned SQLite pragmas and the single-writer queue."""
+import threading
+
+import pytest
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core import database
+from app.core.db_routing import WROTE, act_as
+from app.core.sqlite_tuning import is_file_sqlite, sqlite_pragmas, tune_sqlite
+from app.core.write_queue import WriteQueue
+from app.domain.events import EventBus
+from app.domain.exceptions import ConflictError
+from app.domain.persistence import Base
+from app.domain.users.repository import UserRepository
+from app.domain.users.schemas import CreateUserRequest, UpdateUserRequest
+from app.domain.users.service import UserService
+from app.infrastructure import audit
+from app.infrastructure.audit import AuditLog
+from tests.unit.helpers import PASSWORD
+
+
+@pytest.fixture
+def tuned_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tuned.db'}", connect_args={"check_same_thread": False})
+    tune_sqlite(engine, sqlite_pragmas(busy_timeout_ms=2000, cache_size_kib=4096, mmap_size=1 << 20))
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _entry(i: int) -> AuditLog:
+    return AuditLog(action="test", resource_type="t", resource_id=str(i), correlation_id="c")
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("sqlite:///./dev.db", True),
+    ("sqlite://", False),
+    ("sqlite:///:memory:", False),
+    ("postgresql://db/app", False),
+])
+def test_only_file_sqlite_is_tuned(url, expected):
+    assert is_file_sqlite(url) is expected
+
+
+def test_pragmas_applied_on_connect(tuned_engine):
+    with tuned_engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1   # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 2000
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -4096
+
+
+def test_concurrent_writes_are_batched_while_reads_continue(tuned_engine):
+    writer = WriteQueue(sessionmaker(bind=tuned_engine), batch_size=16)
+    sessions = sessionmaker(bind=tuned_engine)
+    batches = []
+    real_execute = writer._execute
+    writer._execute = lambda jobs: (batches.append(len(jobs)), real_execute(jobs))
+
+    def produce(offset: int) -> None:
+        for i in range(25):
+            writer.submit(lambda db, i=i: db.add(_entry(offset + i)))
+            with sessions() as db:   # WAL: readers never wait on the writer
+                db.scalar(select(func.count()).select_from(AuditLog))
+
+    threads = [threading.Thread(target=produce, args=(n * 100,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    writer.close()
+
+    with sessions() as db:
+        assert db.scalar(select(func.count()).select_from(AuditLog)) == 200
+    assert sum(batches) == 200
+
+
+def test_failing_job_is_isolated_from_its_batch(tuned_engine):
+    writer = WriteQueue(sessionmaker(bind=tuned_engine))
+
+    def boom(db):
+        raise RuntimeError("bad job")
+
+    futures = [writer.submit(lambda db, i=i: db.add(_entry(i))) for i in range(3)]
+    failed = writer.submit(boom)
+    futures += [writer.submit(lambda db, i=i: db.add(_entry(i))) for i in range(3, 6)]
+    writer.flush()
+
+    assert isinstance(failed.exception(), RuntimeError)
+    assert all(f.exception() is None for f in futures)
+    with sessionmaker(bind=tuned_engine)() as db:
+        assert db.scalar(select(func.count()).select_from(AuditLog)) == 6
+    writer.close()
+
+
+def test_audit_record_returns_after_its_row_is_committed(tuned_engine, monkeypatch):
+    writer = WriteQueue(sessionmaker(bind=tuned_engine))
+    monkeypatch.setattr(audit, "write_queue", writer)
+    audit.AuditService().record("user.created", "user", "u1")
+    with sessionmaker(bind=tuned_engine)() as db:   # no flush(): record() already waited
+        assert db.scalar(select(func.count()).select_from(AuditLog)) == 1
+    writer.close()
+
+
+def _blocked(writer: WriteQueue) -> threading.Event:
+    """Occupy the writer thread until the returned event is set."""
+    started, release = threading.Event(), threading.Event()
+    writer.submit(lambda db: (started.set(), release.wait(5)))
+    started.wait(5)
+    return release
+
+
+def test_call_timeout_cancels_a_queued_job(tuned_engine):
+    writer = WriteQueue(sessionmaker(bind=tuned_engine))
+    release = _blocked(writer)
+    with pytest.raises(TimeoutError):
+        writer.call(lambda db: db.add(_entry(1)), timeout=0.05)
+    release.set()
+    writer.flush()
+    with sessionmaker(bind=tuned_engine)() as db:   # the abandoned job never ran
+        assert db.scalar(select(func.count()).select_from(AuditLog)) == 0
+    writer.close()
+
+
+def test_audit_write_timeout_counts_as_failed(tuned_engine, monkeypatch):
+    writer = WriteQueue(sessionmaker(bind=tuned_engine))
+    monkeypatch.setattr(audit, "write_queue", writer)
+    monkeypatch.setattr(audit, "WRITE_TIMEOUT_S", 0.05)
+    outcomes = []
+    monkeypatch.setattr(audit.quality_signals, "audit_write", lambda committed: outcomes.append(committed))
+    release = _blocked(writer)
+    audit.AuditService().record("user.created", "user", "u1")
+    release.set()
+    writer.close()
+    assert outcomes == [False]
+
+
+def test_user_writes_commit_on_the_injected_writer(tuned_engine):
+    writer = WriteQueue(sessionmaker(bind=tuned_engine, expire_on_commit=False))
+    jobs = []
+    real_execute = writer._execute
+    writer._execute = lambda batch: (jobs.extend(batch), real_execute(batch))
+    with sessionmaker(bind=tuned_engine)() as request_db:
+        repo = UserRepository(request_db, write=lambda job: writer.call(job, timeout=5))
+        service = UserService(repo, bus=EventBus(), password_hasher=lambda p: "hashed")
+
+        user = service.create_user(CreateUserRequest(email="a@example.com", password=PASSWORD))
+        with pytest.raises(ConflictError):
+            service.create_user(CreateUserRequest(email="a@example.com", password=PASSWORD))
+        assert service.update_user(user.id, UpdateUserRequest(full_name="Renamed")).full_name == "Renamed"
+        assert service.delete_user(user.id) is True
+        assert not request_db.in_transaction()   # the request session never wrote
+    writer.close()
+    assert len(jobs) == 4
+
+
+def test_queued_writer_counts_as_the_requests_write(tuned_engine, monkeypatch):
+    writer = WriteQueue(sessionmaker(bind=tuned_engine))
+    monkeypatch.setattr(database, "write_queue", writer)
+    with database.SessionLocal() as request_db:
+        act_as(request_db, "u-queued")
+        database.queued_writer(request_db)(lambda db: db.add(_entry(1)))
+        assert request_db.info[WROTE] is True
+    assert database.recent_writers.active("u-queued")
+    writer.close()
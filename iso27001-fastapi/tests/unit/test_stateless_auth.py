@@ -0,0 +1,111 @@
+"""Unit tests for stateless claims authentication and user-wide token revocation."""
+import pytest
+from pydantic import ValidationError
+
+from app.api import deps
+from app.config.security import create_access_token
+from app.config.settings import Settings, settings
+from app.core.exceptions import AuthenticationError
+from app.domain.users.events import UserDeactivated, UserDeleted
+from app.domain.users.principal import Principal
+from app.infrastructure.principal_cache import PrincipalCache
+from app.infrastructure.token_revocation import TokenRevocations
+from tests.unit.helpers import Clock, FakeRedis, create_user, statements
+
+NOW = 1_700_000_000.0
+
+
+def test_revocation_rejects_only_tokens_issued_before_it():
+    clock = Clock(NOW)
+    revocations = TokenRevocations(window_s=1800, clock=clock)
+    revocations.revoke_user("u1")
+    assert revocations.is_revoked("u1", issued_at=clock.now - 60)
+    assert not revocations.is_revoked("u1", issued_at=clock.now + 1)
+    assert not revocations.is_revoked("u2", issued_at=clock.now - 60)
+
+
+def test_revocation_lapses_once_covered_tokens_have_expired():
+    clock = Clock(NOW)
+    revocations = TokenRevocations(window_s=1800, clock=clock)
+    revocations.revoke_user("u1")
+    issued = clock.now - 60
+    clock.now += 1801
+    assert not revocations.is_revoked("u1", issued_at=issued)
+
+
+def test_revocation_is_shared_through_redis():
+    redis, clock = FakeRedis(), Clock(NOW)
+    worker_a = TokenRevocations(window_s=1800, redis_factory=lambda: redis, clock=clock)
+    worker_b = TokenRevocations(window_s=1800, redis_factory=lambda: redis, clock=clock)
+    worker_a.revoke_user("u1")
+    assert worker_b.is_revoked("u1", issued_at=clock.now - 60)
+
+
+def test_unreachable_redis_makes_the_answer_unknown():
+    redis = FakeRedis()
+    redis.down = True
+    revocations = TokenRevocations(window_s=1800, redis_factory=lambda: redis)
+    assert revocations.is_revoked("u1", issued_at=0) is None
+
+
+def test_claims_mode_on_several_workers_requires_shared_revocations():
+    with pytest.raises(ValidationError):
+        Settings(AUTH_STATELESS_CLAIMS=True, AUTH_REVOCATION_REDIS=False, WEB_CONCURRENCY=4)
+    assert Settings(AUTH_STATELESS_CLAIMS=True, AUTH_REVOCATION_REDIS=True, WEB_CONCURRENCY=4)
+    assert Settings(AUTH_STATELESS_CLAIMS=True, AUTH_REVOCATION_REDIS=False, WEB_CONCURRENCY=1)
+
+
+def test_principal_access_rules():
+    viewer = Principal(id="u1", role="viewer")
+    assert viewer.may_access("u1") and not viewer.may_access("u2")
+    assert Principal(id="a", role="admin").may_access("u2")
+
+
+@pytest.fixture
+def stateless(monkeypatch, service, bus, db):
+    monkeypatch.setattr(settings, "AUTH_STATELESS_CLAIMS", True)
+    revocations = TokenRevocations(window_s=1800)
+    monkeypatch.setattr(deps, "token_revocations", revocations)
+    monkeypatch.setattr(deps, "principal_cache", PrincipalCache(ttl_s=0))
+    for revoking in (UserDeactivated, UserDeleted):
+        bus.subscribe(revoking, revocations.on_user_revoked)
+    user_id = create_user(service, "carol@example.com")
+    statements(db)
+    return service, user_id
+
+
+def test_claims_are_trusted_without_a_query(stateless, db):
+    service, user_id = stateless
+    token = create_access_token(user_id, role="viewer", jti="jti-1")
+    assert deps.get_current_user(token, service.repo) == Principal(id=user_id, role="viewer", jti="jti-1")
+    assert statements(db) == []
+
+
+def test_token_without_role_claim_falls_back_to_lookup(stateless, db):
+    service, user_id = stateless
+    db.expunge_all()
+    principal = deps.get_current_user(create_access_token(user_id), service.repo)
+    assert principal.email == "carol@example.com"
+    assert statements(db)
+
+
+def test_deactivation_revokes_outstanding_tokens(stateless):
+    service, user_id = stateless
+    token = create_access_token(user_id, role="viewer")
+    service.deactivate_user(user_id)
+    with pytest.raises(AuthenticationError):
+        deps.get_current_user(token, service.repo)
+
+
+def test_unreachable_revocation_store_falls_back_to_the_user_lookup(stateless, db, monkeypatch):
+    service, user_id = stateless
+    redis = FakeRedis()
+    redis.down = True
+    monkeypatch.setattr(deps, "token_revocations", TokenRevocations(window_s=1800, redis_factory=lambda: redis))
+    token = create_access_token(user_id, role="viewer")
+    service.repo.update(user_id, {"is_active": False})   # revoked on another worker, say
+    db.expunge_all()
+    statements(db)
+    with pytest.raises(AuthenticationError):
+        deps.get_current_user(token, service.repo)
+    assert "SELECT" in statements(db)
@@ -0,0 +1,220 @@
+"""Unit tests for the structured logger and its asynchronous writer."""
+import contextvars
+import io
+import json
+import logging
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.core.metrics import LOG_ENTRIES_DROPPED
+from app.core.telemetry import AsyncLogWriter, StructuredLogger, TailSampler, request_id_ctx
+
+
+class _BlockingStream(io.StringIO):
+    """Stream whose first write blocks until released — simulates a stalled stdout."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, s: str) -> int:
+        self.entered.set()
+        self.release.wait(timeout=5)
+        return super().write(s)
+
+
+def _lines(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+class TestAsyncLogWriter:
+    def test_entries_written_by_background_thread(self):
+        stream = io.StringIO()
+        log = StructuredLogger("test.async.write", writer=AsyncLogWriter(stream))
+        log.info("hello", user_id="u1")
+        log.audit("user.created", user_id="u1")
+        log.flush()
+
+        entries = _lines(stream)
+        assert [e["message"] for e in entries] == ["hello", "audit.user.created"]
+        assert entries[1]["level"] == "AUDIT"
+
+    def test_redaction_still_applied(self):
+        stream = io.StringIO()
+        log = StructuredLogger("test.async.redact", writer=AsyncLogWriter(stream))
+        log.warning("auth.failed", password="hunter2")
+        log.flush()
+        assert _lines(stream)[0]["context"]["password"] == "[REDACTED]"
+
+    def test_drop_debug_first_keeps_warnings(self):
+        stream = _BlockingStream()
+        writer = AsyncLogWriter(stream, maxsize=5, overflow="drop-debug-first")
+        debug_before = LOG_ENTRIES_DROPPED.labels(level="DEBUG")._value.get()
+        writer.submit(logging.INFO, {"n": "stall"})
+        assert stream.entered.wait(timeout=5)   # writer thread is now stuck in write()
+
+        for i in range(5):                                   # queue now at capacity
+            writer.submit(logging.INFO, {"n": f"info-{i}"})
+        writer.submit(logging.DEBUG, {"n": "debug"})        # above high-water → dropped
+        writer.submit(logging.INFO, {"n": "info-overflow"})  # queue full → dropped
+        assert writer.dropped == 2
+        assert LOG_ENTRIES_DROPPED.labels(level="DEBUG")._value.get() == debug_before + 1
+
+        done = threading.Event()
+
+        def _essential() -> None:
+            writer.submit(logging.WARNING, {"n": "warning"})  # blocks until space frees up
+            done.set()
+
+        threading.Thread(target=_essential).start()
+        stream.release.set()
+        assert done.wait(timeout=5)
+        writer.flush()
+        written = [e["n"] for e in _lines(stream)]
+        assert "warning" in written
+        assert "debug" not in written and "info-overflow" not in written
+
+    def test_block_policy_never_drops(self):
+        stream = io.StringIO()
+        writer = AsyncLogWriter(stream, maxsize=2, overflow="block")
+        for i in range(50):
+            writer.submit(logging.DEBUG, {"n": i})
+        writer.flush()
+        assert writer.dropped == 0
+        assert len(_lines(stream)) == 50
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError):
+            AsyncLogWriter(overflow="drop-everything")
+
+
+def test_entry_not_built_when_level_disabled():
+    log = StructuredLogger("test.level.gate", writer=AsyncLogWriter(io.StringIO()))
+    log._logger.setLevel(logging.INFO)
+    with patch.object(log, "_entry") as entry:
+        log.debug("noisy", detail="x")
+    entry.assert_not_called()
+
+
+class TestTailSampling:
+    def _logger(self, stream: io.StringIO, rate: float = 0.0) -> StructuredLogger:
+        sampler = TailSampler(sample_rate=rate, slow_ms=200.0, rng=lambda: 0.5)
+        return StructuredLogger("test.sampling", writer=AsyncLogWriter(stream), sampler=sampler)
+
+    def _request(self, log: StructuredLogger, status_code: int, duration_ms: float = 5.0, *, warn: bool = False) -> None:
+        token = request_id_ctx.set("req-1")
+        try:
+            log.begin_request(method="GET", path="/api/v1/users")
+            log.info("request.started")
+            if warn:
+                log.warning("auth.failed")
+            log.info("request.completed")
+            log.end_request(status_code=status_code, duration_ms=duration_ms)
+        finally:
+            request_id_ctx.reset(token)
+        log.flush()
+
+    def test_healthy_request_collapses_to_summary(self):
+        stream = io.StringIO()
+        self._request(self._logger(stream), 200)
+        entries = _lines(stream)
+        assert [e["message"] for e in entries] == ["request.summary"]
+        assert entries[0]["context"]["sampled_out_lines"] == 2
+        assert entries[0]["request_id"] == "req-1"
+
+    def test_server_error_keeps_all_lines(self):
+        stream = io.StringIO()
+        self._request(self._logger(stream), 503)
+        assert [e["message"] for e in _lines(stream)] == ["request.started", "request.completed"]
+
+    def test_slow_request_keeps_all_lines(self):
+        stream = io.StringIO()
+        self._request(self._logger(stream), 200, duration_ms=450.0)
+        assert len(_lines(stream)) == 2
+
+    def test_warning_releases_buffer_immediately(self):
+        stream = io.StringIO()
+        self._request(self._logger(stream), 401, warn=True)
+        assert [e["message"] for e in _lines(stream)] == ["request.started", "auth.failed", "request.completed"]
+
+    def test_random_sample_keeps_all_lines(self):
+        stream = io.StringIO()
+        self._request(self._logger(stream, rate=0.9), 200)
+        assert len(_lines(stream)) == 2
+
+    def test_audit_bypasses_sampling(self):
+        stream = io.StringIO()
+        log = self._logger(stream)
+        token = request_id_ctx.set("req-2")
+        try:
+            log.begin_request(method="POST", path="/api/v1/auth/token")
+            log.audit("auth.login", user_id="u1")
+            log.flush()
+            assert [e["message"] for e in _lines(stream)] == ["audit.auth.login"]
+            log.end_request(status_code=200, duration_ms=5.0)
+        finally:
+            request_id_ctx.reset(token)
+
+
+def test_requests_sharing_a_client_correlation_id_keep_separate_buffers():
+    stream = io.StringIO()
+    sampler = TailSampler(sample_rate=0.0, slow_ms=200.0, rng=lambda: 0.5)
+    log = StructuredLogger("test.sampling.dup", writer=AsyncLogWriter(stream), sampler=sampler)
+
+    def begin():
+        request_id_ctx.set("same-client-id")
+        log.begin_request(method="GET", path="/api/v1/users")
+        log.info("request.started")
+
+    first, second = contextvars.copy_context(), contextvars.copy_context()
+    first.run(begin)
+    second.run(begin)
+    first.run(log.end_request, status_code=503, duration_ms=5.0)   # kept in full
+    second.run(log.end_request, status_code=200, duration_ms=5.0)  # collapses to a summary
+    log.flush()
+    assert [e["message"] for e in _lines(stream)] == ["request.started", "request.summary"]
+    assert sampler._buffers == {}
+
+
+def test_correlation_stats_sum_every_thread():
+    log = StructuredLogger("test.stats", writer=AsyncLogWriter(io.StringIO()))
+
+    def _log(n: int) -> None:
+        token = request_id_ctx.set(f"req-{n}")
+        for _ in range(100):
+            log.info("tick")
+        request_id_ctx.reset(token)
+
+    threads = [threading.Thread(target=_log, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    log.info("uncorrelated")   # main thread, no request in context
+    assert log.correlation_stats() == (400, 401)
+
+
+def test_exited_threads_stats_are_folded_not_kept():
+    log = StructuredLogger("test.stats.retired", writer=AsyncLogWriter(io.StringIO()))
+    for _ in range(50):   # as AnyIO retires idle workers and starts new ones
+        thread = threading.Thread(target=log.info, args=("tick",))
+        thread.start()
+        thread.join()
+    assert log.correlation_stats() == (0, 50)
+    assert log._stats_cells == []
+
+
+def test_context_mutated_after_the_call_is_logged_as_it_was():
+    stream = _BlockingStream()
+    log = StructuredLogger("test.async.snapshot", writer=AsyncLogWriter(stream))
+    log.info("stall")
+    assert stream.entered.wait(timeout=5)   # later entries wait in the queue
+    ids = [1]
+    log.info("batch", ids=ids, filters={"role": "viewer"})
+    ids.append(2)
+    stream.release.set()
+    log.flush()
+    assert _lines(stream)[-1]["context"] == {"ids": [1], "filters": {"role": "viewer"}}
@@ -0,0 +1,85 @@
+"""Unit tests for the verified-JWT decode cache."""
+from datetime import timedelta
+
+import jwt
+import pytest
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.config.security import ACCESS_TOKEN_TYP, REFRESH_TOKEN_TYP, create_access_token, decode_token
+from app.config.settings import settings
+from app.core.exceptions import AuthenticationError
+from app.core.token_cache import VerifiedTokenCache
+from app.domain.users.repository import UserRepository
+from app.infrastructure.token_revocation import TokenRevocations
+from tests.unit.helpers import Clock
+
+
+class _CountingDecode:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, token):
+        self.calls += 1
+        return decode_token(token)
+
+
+def test_repeat_decodes_skip_verification():
+    decode = _CountingDecode()
+    cache = VerifiedTokenCache(decode=decode)
+    token = create_access_token("u1", role="viewer")
+    first = cache.decode(token, expected_typ=ACCESS_TOKEN_TYP)
+    assert cache.decode(token, expected_typ=ACCESS_TOKEN_TYP) is first
+    assert decode.calls == 1
+
+
+def test_entry_is_dropped_at_exp():
+    token = create_access_token("u1", expires_delta=timedelta(seconds=60))
+    exp = decode_token(token).exp
+    decode, clock = _CountingDecode(), Clock(exp - 30)
+    cache = VerifiedTokenCache(decode=decode, clock=clock)
+    cache.decode(token)
+    cache.decode(token)
+    clock.now = exp   # from here decode_token would raise ExpiredSignatureError
+    cache.decode(token)
+    assert decode.calls == 2
+
+
+def test_typ_is_checked_on_a_hit():
+    cache = VerifiedTokenCache()
+    token = create_access_token("u1", typ=REFRESH_TOKEN_TYP)
+    cache.decode(token)
+    with pytest.raises(jwt.InvalidTokenError):
+        cache.decode(token, expected_typ=ACCESS_TOKEN_TYP)
+
+
+def test_invalid_tokens_are_not_cached():
+    decode = _CountingDecode()
+    cache = VerifiedTokenCache(decode=decode)
+    for _ in range(2):
+        with pytest.raises(jwt.PyJWTError):
+            cache.decode("not-a-jwt")
+    assert decode.calls == 2
+
+
+def test_cache_is_bounded():
+    decode = _CountingDecode()
+    cache = VerifiedTokenCache(max_entries=2, decode=decode)
+    tokens = [create_access_token(f"u{i}") for i in range(3)]
+    for token in tokens:
+        cache.decode(token)
+    cache.decode(tokens[0])   # evicted by the third token
+    assert decode.calls == 4
+
+
+def test_cached_token_of_a_revoked_user_is_refused(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_STATELESS_CLAIMS", True)
+    monkeypatch.setattr(deps, "token_cache", VerifiedTokenCache())
+    revocations = TokenRevocations(window_s=1800)
+    monkeypatch.setattr(deps, "token_revocations", revocations)
+    repo = UserRepository(Session())
+    token = create_access_token("u1", role="viewer")
+    assert deps.get_current_user(token, repo).id == "u1"
+    revocations.revoke_user("u1")
+    with pytest.raises(AuthenticationError):
+        deps.get_current_user(token, repo)
@@ -0,0 +1,51 @@
+"""Unit tests for the single-round-trip user write paths."""
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.domain.exceptions import ConflictError
+from app.domain.users.models import User
+from app.domain.users.schemas import CreateUserRequest, UpdateUserRequest
+from tests.unit.helpers import PASSWORD, statements
+
+
+def test_registration_is_a_single_insert(service, db):
+    user = service.create_user(CreateUserRequest(email="a@example.com", password=PASSWORD))
+    assert statements(db) == ["INSERT"]
+    assert user.id and user.created_at and user.role == "viewer"   # readable after commit, no refresh
+
+
+def test_duplicate_email_maps_to_conflict(service, db):
+    service.create_user(CreateUserRequest(email="a@example.com", password=PASSWORD))
+    with pytest.raises(ConflictError):
+        service.create_user(CreateUserRequest(email="a@example.com", password=PASSWORD))
+    other = service.create_user(CreateUserRequest(email="b@example.com", password=PASSWORD))
+    statements(db)
+    with pytest.raises(ConflictError):
+        service.update_user(other.id, UpdateUserRequest(email="a@example.com"))
+    assert statements(db) == ["UPDATE"]   # no existence SELECT first
+
+
+@pytest.mark.parametrize("values", [{"email": None}, {"hashed_password": None}])
+def test_other_integrity_errors_are_not_reported_as_duplicates(service, db, values):
+    user = service.create_user(CreateUserRequest(email="a@example.com", password=PASSWORD))
+    with pytest.raises(IntegrityError):
+        service.repo.update(user.id, values)
+    with pytest.raises(IntegrityError):
+        service.repo.add(User(**{"email": "b@example.com", "hashed_password": "x", **values}))
+
+
+def test_update_is_a_single_update_returning(service, db):
+    user = service.create_user(CreateUserRequest(email="a@example.com", password=PASSWORD))
+    statements(db)
+    updated = service.update_user(user.id, UpdateUserRequest(full_name="Renamed"))
+    assert statements(db) == ["UPDATE"]
+    assert updated is user and user.full_name == "Renamed"   # identity-mapped copy overwritten
+    assert service.update_user("missing", UpdateUserRequest(full_name="x")) is None
+
+
+def test_delete_by_id_without_loading(service, db):
+    user = service.create_user(CreateUserRequest(email="a@example.com", password=PASSWORD))
+    statements(db)
+    assert service.delete_user(user.id)
+    assert statements(db) == ["DELETE"]
+    assert not service.delete_user(user.id)
@@ -0,0 +1,112 @@
+"""Unit tests for X-Ray head sampling, spans and UDP batch export."""
+import json
+import socket
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.infrastructure.aws_telemetry import HeadSampler, UdpSpanExporter, XRayTracer
+
+
+@pytest.fixture
+def daemon():
+    """Local UDP listener standing in for the X-Ray daemon."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(2)
+    yield sock
+    sock.close()
+
+
+def _tracer(daemon: socket.socket, sampler: HeadSampler | None = None) -> XRayTracer:
+    host, port = daemon.getsockname()
+    exporter = UdpSpanExporter(f"{host}:{port}", flush_interval_s=3600)
+    return XRayTracer(enabled=True, sampler=sampler or HeadSampler(reservoir_per_s=100), exporter=exporter)
+
+
+def _receive(daemon: socket.socket) -> dict:
+    header, _, body = daemon.recv(65535).partition(b"\n")
+    assert json.loads(header) == {"format": "json", "version": 1}
+    return json.loads(body)
+
+
+class TestHeadSampler:
+    def test_upstream_decision_is_honoured(self):
+        sampler = HeadSampler(reservoir_per_s=0, rate=0.0)
+        assert sampler.should_sample(True) is True
+        assert HeadSampler(reservoir_per_s=10, rate=1.0).should_sample(False) is False
+
+    def test_reservoir_then_fixed_rate(self):
+        sampler = HeadSampler(reservoir_per_s=2, rate=0.0, clock=lambda: 100.0)
+        assert [sampler.should_sample() for _ in range(4)] == [True, True, False, False]
+
+    def test_reservoir_refills_each_second(self):
+        now = [100.0]
+        sampler = HeadSampler(reservoir_per_s=1, rate=0.0, clock=lambda: now[0])
+        assert sampler.should_sample() is True
+        assert sampler.should_sample() is False
+        now[0] = 101.0
+        assert sampler.should_sample() is True
+
+
+class TestTracer:
+    def test_sampled_segment_exported_with_subsegments(self, daemon):
+        tracer = _tracer(daemon)
+        segment = tracer.begin_segment("api", "1-5f000000-0123456789abcdef01234567", parent_id="abcdef0123456789")
+        assert segment is not None
+        with tracer.subsegment("bcrypt.verify"):
+            with tracer.subsegment("redis", namespace="remote"):
+                pass
+        tracer.end_segment(status_code=200)
+        tracer._exporter.flush()
+
+        doc = _receive(daemon)
+        assert doc["name"] == "api"
+        assert doc["trace_id"] == "1-5f000000-0123456789abcdef01234567"
+        assert doc["parent_id"] == "abcdef0123456789"
+        assert doc["end_time"] >= doc["start_time"]
+        (bcrypt,) = doc["subsegments"]
+        assert bcrypt["name"] == "bcrypt.verify"
+        assert bcrypt["subsegments"][0]["namespace"] == "remote"
+
+    def test_unsampled_request_creates_no_spans(self, daemon):
+        tracer = _tracer(daemon)
+        assert tracer.begin_segment("api", sampled=False) is None
+        with tracer.subsegment("redis") as span:
+            assert span is None
+        assert tracer.start_subsegment("db") is None
+        tracer.end_segment(status_code=200)
+        tracer._exporter.flush()
+        daemon.settimeout(0.2)
+        with pytest.raises(socket.timeout):
+            daemon.recv(65535)
+
+    def test_disabled_tracer_never_samples(self):
+        tracer = XRayTracer()
+        assert tracer.begin_segment("api", sampled=True) is None
+
+    def test_server_error_marks_fault(self, daemon):
+        tracer = _tracer(daemon)
+        tracer.begin_segment("api")
+        tracer.end_segment(status_code=503)
+        tracer._exporter.flush()
+        assert _receive(daemon)["fault"] is True
+
+    def test_sql_statements_become_subsegments(self, daemon):
+        tracer = _tracer(daemon)
+        engine = create_engine("sqlite://")
+        tracer.instrument_engine(engine)
+
+        tracer.begin_segment("api")
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        tracer.end_segment(status_code=200)
+        tracer._exporter.flush()
+
+        sql = [s for s in _receive(daemon)["subsegments"] if s["name"] == "sqlite"]
+        assert sql and sql[0]["sql"]["sanitized_query"] == "SELECT 1"
+
+
+def test_parse_header():
+    fields = XRayTracer.parse_header("Root=1-abc-def;Parent=1234;Sampled=1")
+    assert fields == {"Root": "1-abc-def", "Parent": "1234", "Sampled": "1"}